@@ -15,6 +15,7 @@ from blueprints.topology.topology import topology_bp
 from blueprints.view import view_bp
 from blueprints.pathfinder import pathfinder_bp
 from blueprints.configuration_push import configuration_push_bp
+from services.rib import close_connection
 import socket
 from flask import request, jsonify
 from ncclient import manager
@@ -38,6 +39,9 @@ app.register_blueprint(topology_bp)
 app.register_blueprint(pathfinder_bp)
 app.register_blueprint(configuration_push_bp)
 
+# Release the request thread's RIB database connection when its app context ends
+app.teardown_appcontext(close_connection)
+
 def find_free_port(start_port=5001, max_port=5100):
     """
     Find a free TCP port in the given range.
@@ -50,7 +50,7 @@ def services_physical_home():
                 try:
                     if vendor.lower() == 'cisco':
                         phy = cisco_phy(m)
-                        router_result['physical'] = str(phy) if phy else 'No data.'
+                        router_result['physical'] = phy if phy else 'No data.'
                     elif vendor.lower() == 'juniper':
                         # Physical Inventory: call the test script as a subprocess
                         try:
@@ -83,7 +83,7 @@ def services_physical_home():
                                 timeout=60  # Increased timeout
                             ) as m:
                                 phy = arista_phy(m)
-                                router_result['physical'] = str(phy) if phy else 'No data.'
+                                router_result['physical'] = phy if phy else 'No data.'
                         except Exception as e:
                             elapsed = time.time() - start_time
                             print(f"[DEBUG] Arista NETCONF connection failed after {elapsed:.2f} seconds: {e}")
@@ -1,6 +1,7 @@
 import sqlite3
 import os
 from services.vendor_host import get_device_info
+from services.netconf_pool import netconf_pool
 
 RIB_DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'rib_db.sqlite3'))
 INIP_DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'inip.db'))
@@ -31,7 +32,7 @@ def find_ip_info(ip):
     # 3. Get vendor using NETCONF (use router IP from rib_db)
     # Use the first router IP found in rib_db for this IP
     router_ip = rib_rows[0][0]
-    hostname, version, vendor, status = get_device_info(router_ip, NETCONF_PORT, NETCONF_USERNAME, NETCONF_PASSWORD)
+    hostname, version, vendor, status = get_device_info(router_ip, NETCONF_PORT, NETCONF_USERNAME, NETCONF_PASSWORD, pool=netconf_pool)
     return {
         "found": True,
         "ip": ip,
@@ -24,6 +24,9 @@ class RibDBManager:
                     UNIQUE(router, loopback_ip, protocol, destination, interface, next_hop)
                 )
             ''')
+            # The topology builders filter on protocol and group routes by loopback
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_rib_proto ON rib (protocol, destination, interface)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_rib_lb ON rib (loopback_ip)')
 
     def _create_history_table(self):
         with self.conn:
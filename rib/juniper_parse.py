@@ -1,3 +1,4 @@
+import io
 from lxml import etree
 from rib.db_utils import rib_db_manage
 import sys
@@ -53,33 +54,34 @@ def parse_juniper_routing(xml_data, hostname='Juniper-Router'):
         print(f"Error parsing XML: {str(e)}", file=sys.stderr)
         return []
 
-def parse_juniper_rpc_xml(xml_data, hostname):
-    root = etree.fromstring(xml_data.encode())
+def _rt_route(rt):
+    """Return (protocol, destination, interface, next_hop) for one <rt>, or None if it has no entry"""
+    destination = rt.findtext('rt-destination')
+    entry = rt.find('rt-entry')
+    if entry is None or destination is None:
+        return None
+    protocol = entry.findtext('protocol-name', default='N/A')
+    nh = entry.find('nh')
+    if nh is not None:
+        next_hop = nh.findtext('to') or nh.findtext('nh-local-interface') or 'N/A'
+        interface = nh.findtext('via') or nh.findtext('nh-local-interface') or 'N/A'
+    else:
+        next_hop = 'N/A'
+        interface = 'N/A'
+    if protocol and protocol.lower() == 'local':
+        next_hop = 'Local'
+    elif protocol and protocol.lower() == 'direct':
+        next_hop = 'Direct'
+    # A RIB repeats a handful of protocol, interface and next-hop names across every route;
+    # interning keeps one copy of each instead of one per row
+    return sys.intern(protocol), destination, sys.intern(interface), sys.intern(next_hop)
+
+def _is_loopback_destination(dest):
+    return dest and dest.endswith('/32') and (dest.startswith('192.168.') or dest.startswith('10.'))
+
+def _store_routes(route_rows, hostname, loopback_ip):
     routes = []
-    # Find loopback IP (first /32 in private range)
-    loopback_ip = None
-    for rt in root.xpath('.//rt'):
-        dest = rt.findtext('rt-destination')
-        if dest and dest.endswith('/32') and (dest.startswith('192.168.') or dest.startswith('10.')):
-            loopback_ip = dest.split('/')[0]
-            break
-    for rt in root.xpath('.//rt'):
-        destination = rt.findtext('rt-destination')
-        entry = rt.find('rt-entry')
-        if entry is None or destination is None:
-            continue
-        protocol = entry.findtext('protocol-name', default='N/A')
-        nh = entry.find('nh')
-        if nh is not None:
-            next_hop = nh.findtext('to') or nh.findtext('nh-local-interface') or 'N/A'
-            interface = nh.findtext('via') or nh.findtext('nh-local-interface') or 'N/A'
-        else:
-            next_hop = 'N/A'
-            interface = 'N/A'
-        if protocol and protocol.lower() == 'local':
-            next_hop = 'Local'
-        elif protocol and protocol.lower() == 'direct':
-            next_hop = 'Direct'
+    for protocol, destination, interface, next_hop in route_rows:
         route = {
             'Router': hostname,
             'Loopback IP': loopback_ip,
@@ -92,9 +94,44 @@ def parse_juniper_rpc_xml(xml_data, hostname):
         rib_db_manage.add_entry(hostname, loopback_ip, protocol, destination, interface, next_hop)
     return routes
 
+def parse_juniper_rpc_xml(xml_data, hostname):
+    # str is encoded; bytes or a buffer such as an mmap of the capture is parsed in place
+    root = etree.fromstring(xml_data.encode() if isinstance(xml_data, str) else xml_data)
+    # Find loopback IP (first /32 in private range)
+    loopback_ip = None
+    for rt in root.xpath('.//rt'):
+        dest = rt.findtext('rt-destination')
+        if _is_loopback_destination(dest):
+            loopback_ip = dest.split('/')[0]
+            break
+    route_rows = [row for row in map(_rt_route, root.xpath('.//rt')) if row is not None]
+    return _store_routes(route_rows, hostname, loopback_ip)
+
+def parse_juniper_rpc_stream(source, hostname):
+    """
+    Streaming variant of parse_juniper_rpc_xml for large route dumps.
+    source is a file path, a binary file object, or XML bytes. Each <rt> is freed once read,
+    so memory holds the extracted routes rather than the whole document tree.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    loopback_ip = None
+    route_rows = []
+    for _, rt in etree.iterparse(source, events=("end",), tag="rt", huge_tree=True, recover=True):
+        if loopback_ip is None:
+            dest = rt.findtext('rt-destination')
+            if _is_loopback_destination(dest):
+                loopback_ip = dest.split('/')[0]
+        row = _rt_route(rt)
+        if row is not None:
+            route_rows.append(row)
+        rt.clear(keep_tail=False)
+        while rt.getprevious() is not None:
+            del rt.getparent()[0]
+    # The loopback is only known once the first private /32 has gone past, so rows are stored last
+    return _store_routes(route_rows, hostname, loopback_ip)
+
 if __name__ == "__main__":
-    with open("juniper_rpc.xml") as f:
-        xml_data = f.read()
-    routes = parse_juniper_rpc_xml(xml_data, hostname="Juniper-Router")
+    routes = parse_juniper_rpc_stream("juniper_rpc.xml", hostname="Juniper-Router")
     from tabulate import tabulate
     print(tabulate(routes, headers="keys", tablefmt="grid"))
@@ -0,0 +1,72 @@
+"""
+rib/table_format.py
+-------------------
+Plain-text grid rendering and JSON snapshots for parsed RIB entries.
+fast_grid measures every column in one pass and builds each line with str.join, which keeps
+tables of thousands of routes cheap; tabulate is only loaded when a prettier table is asked for.
+"""
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+def _cell(value):
+    """Text for one cell; None renders empty, as tabulate does."""
+    return "" if value is None else str(value)
+
+def fast_grid(rows, headers=None):
+    """
+    Render a list of dicts as a '+---+' bordered grid, one row per dict.
+    Args:
+        rows (list): Route dicts.
+        headers (list): Column keys; defaults to every key seen in rows, in first-seen order.
+    Returns:
+        str: The rendered table.
+    """
+    if headers is None:
+        headers = list(dict.fromkeys(key for row in rows for key in row))
+    if not headers:
+        return ""
+    cells = [[_cell(row.get(h)) for h in headers] for row in rows]
+    widths = [len(str(h)) for h in headers]
+    for line in cells:
+        for i, value in enumerate(line):
+            if len(value) > widths[i]:
+                widths[i] = len(value)
+    fmt = "| " + " | ".join("{:<%d}" % w for w in widths) + " |"
+    sep = "+-" + "-+-".join("-" * w for w in widths) + "-+"
+    out = [sep, fmt.format(*headers), sep]
+    out.extend(fmt.format(*line) for line in cells)
+    out.append(sep)
+    return "\n".join(out)
+
+def format_routes(routes, pretty=False):
+    """
+    Render parsed routes as a grid table.
+    Args:
+        routes (list): Route dicts.
+        pretty (bool): Use tabulate's grid layout instead of fast_grid (slower on large RIBs).
+    Returns:
+        str: The rendered table.
+    """
+    if pretty:
+        from tabulate import tabulate
+        return tabulate(routes, headers="keys", tablefmt="grid")
+    return fast_grid(routes)
+
+def save_snapshot(routes, path):
+    """
+    Write parsed routes to path as indented JSON, for diffing RIB snapshots between runs.
+    Uses orjson when it is installed and the standard json module otherwise.
+    Args:
+        routes (list): Route dicts.
+        path (str): File to write.
+    """
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(routes, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(routes, f, indent=2)
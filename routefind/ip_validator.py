@@ -6,6 +6,35 @@ Provides functions to validate IP addresses and check if an IP belongs to a give
 """
 
 import ipaddress
+from functools import lru_cache
+
+@lru_cache(maxsize=8192)
+def parse_ip(ip):
+    """
+    Parse an IP address string, reusing the result for strings seen before.
+
+    Args:
+        ip (str): IP address.
+    Returns:
+        IPv4Address or IPv6Address: Parsed address.
+    Raises:
+        ValueError: If ip is not a valid IP address.
+    """
+    return ipaddress.ip_address(ip)
+
+@lru_cache(maxsize=8192)
+def parse_network(subnet):
+    """
+    Parse a subnet string (host bits allowed), reusing the result for strings seen before.
+
+    Args:
+        subnet (str): Subnet in CIDR notation.
+    Returns:
+        IPv4Network or IPv6Network: Parsed network.
+    Raises:
+        ValueError: If subnet is not a valid network.
+    """
+    return ipaddress.ip_network(subnet, strict=False)
 
 def is_valid_ip(ip):
     """
@@ -17,7 +46,7 @@ def is_valid_ip(ip):
         bool: True if valid IP, False otherwise.
     """
     try:
-        ipaddress.ip_address(ip)
+        parse_ip(ip)
         return True
     except ValueError:
         return False
@@ -33,8 +62,8 @@ def validate_ip_with_subnet(ip, subnet):
         tuple: (bool, str) - (is_valid, message).
     """
     try:
-        network = ipaddress.ip_network(subnet, strict=False)
-        ip_obj = ipaddress.ip_address(ip)
+        network = parse_network(subnet)
+        ip_obj = parse_ip(ip)
         if ip_obj in network:
             if ip_obj != network.network_address and ip_obj != network.broadcast_address:
                 return True, "Valid IP for the given subnet"
@@ -5,9 +5,9 @@ Path finding algorithms and network topology analysis for network automation web
 Provides functions to build network links, convert to graph representation, and find primary/alternate paths between routers.
 """
 
-import ipaddress
 import heapq
 from collections import defaultdict
+from .ip_validator import parse_network
 
 def build_links(routers):
     """
@@ -26,7 +26,7 @@ def build_links(routers):
             ip1 = data1['ip']
             if not subnet1 or not ip1:
                 continue
-            net1 = ipaddress.ip_network(subnet1, strict=False)
+            net1 = parse_network(subnet1)
             for j, r2 in enumerate(router_list):
                 if r1['loopback'] == r2['loopback']:
                     continue
@@ -35,7 +35,7 @@ def build_links(routers):
                     ip2 = data2['ip']
                     if not subnet2 or not ip2:
                         continue
-                    net2 = ipaddress.ip_network(subnet2, strict=False)
+                    net2 = parse_network(subnet2)
                     if net1 == net2:
                         link_key = (r1['name'], iface1, ip1, r2['name'], iface2, ip2, str(net1))
                         if link_key not in links:
@@ -7,6 +7,7 @@ Provides functions to locate routers/interfaces for given IPs and to retrieve de
 
 from services.rib import get_rib_entries
 from services.vendor_host import get_device_info
+from services.netconf_pool import netconf_pool
 from .router_lookup import find_router_for_ip
 from ..pathfinder.valid import validate_ip_and_subnet
 
@@ -45,7 +46,7 @@ def get_router_info(router_ip, port=NETCONF_PORT, username=NETCONF_USERNAME, pas
     Returns:
         dict: Router information including interfaces and routes, or None if not found.
     """
-    router_info = get_device_info(router_ip, port, username, password)
+    router_info = get_device_info(router_ip, port, username, password, pool=netconf_pool)
     if not router_info or router_info[0] == "Unknown":
         return None
     hostname, version, vendor, status = router_info
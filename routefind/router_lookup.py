@@ -6,10 +6,10 @@ Provides functions to find the router/interface for a given IP using RIB and inv
 """
 
 import sqlite3
-import ipaddress
 from rib.db_utils import rib_db_manage
 from services.db import router_db
 from services.vendor_detect import detect_vendor_via_netconf
+from .ip_validator import parse_ip, parse_network
 
 def is_valid_host_in_subnet(ip, subnet):
     """
@@ -22,30 +22,52 @@ def is_valid_host_in_subnet(ip, subnet):
         bool: True if IP is a valid host in the subnet, False otherwise.
     """
     try:
-        net = ipaddress.ip_network(subnet, strict=False)
-        ip_obj = ipaddress.ip_address(ip)
+        net = parse_network(subnet)
+        ip_obj = parse_ip(ip)
         return ip_obj in net and ip_obj != net.network_address and ip_obj != net.broadcast_address
     except Exception:
         return False
 
-def find_router_for_ip(ip):
+def _router_result(row, interface):
     """
-    Find the router and interface for a given IP address using RIB and inventory data.
+    Build a lookup result from an inventory row, detecting the vendor over NETCONF if it is unknown.
 
     Args:
-        ip (str): IP address to search for.
+        row (tuple): Inventory row (hostname, software_version, ip, vendor, username, password).
+        interface (str): Interface the IP was found on.
     Returns:
-        dict or None: Router info dict with keys 'router', 'vendor', 'router_ip', 'interface', or None if not found.
+        dict: Router info dict with keys 'router', 'vendor', 'router_ip', 'interface'.
     """
-    entries = rib_db_manage.get_entries()
-    routers = router_db.get_routers()
-    search_prefixes = [f"{ip}/32", f"{ip}/30", f"{ip}/24"]
-    candidates = []
-    # Collect all direct matches
-    for prefix in search_prefixes:
-        for router, loopback_ip, protocol, destination, interface, next_hop in entries:
-            if destination == prefix and protocol.lower() in ['connected', 'local'] and next_hop.lower() in ['direct', 'directly connected', 'local']:
-                candidates.append({
+    hostname, software_version, router_ip, vendor, username, password = row
+    if vendor == 'Unknown' or not vendor:
+        vendor = detect_vendor_via_netconf(router_ip, username, password)
+    return {
+        'router': hostname,
+        'vendor': vendor,
+        'router_ip': router_ip,
+        'interface': interface
+    }
+
+class RouterLookupIndex:
+    """
+    RIB and inventory data indexed once for any number of find_router_for_ip lookups.
+    Connected routes are bucketed by (version, prefix length) and network number, so the
+    subnet check for an IP costs one dict probe per prefix length present in the RIB.
+    """
+
+    def __init__(self, entries, routers):
+        """
+        Args:
+            entries (list): RIB rows (router, loopback_ip, protocol, destination, interface, next_hop).
+            routers (list): Inventory rows (hostname, software_version, ip, vendor, username, password).
+        """
+        self.direct_by_dest = {}  # destination -> directly connected candidates, in RIB order
+        self.connected = {}       # (version, prefixlen) -> {network int: [(position, loopback_ip, interface)]}
+        for position, (router, loopback_ip, protocol, destination, interface, next_hop) in enumerate(entries):
+            protocol_lower = (protocol or '').lower()
+            next_hop_lower = (next_hop or '').lower()
+            if protocol_lower in ['connected', 'local'] and next_hop_lower in ['direct', 'directly connected', 'local']:
+                self.direct_by_dest.setdefault(destination, []).append({
                     'rib_router': router,
                     'loopback_ip': loopback_ip,
                     'protocol': protocol,
@@ -53,57 +75,112 @@ def find_router_for_ip(ip):
                     'interface': interface,
                     'next_hop': next_hop
                 })
-    # 1. Prefer exact loopback match (and always get vendor/name from inventory)
-    for c in candidates:
-        for hostname, software_version, router_ip, vendor, username, password in routers:
-            if c['loopback_ip'] == router_ip:
-                # Fallback to NETCONF vendor detection if vendor is unknown
-                if vendor == 'Unknown' or not vendor:
-                    vendor = detect_vendor_via_netconf(router_ip, username, password)
-                return {
-                    'router': hostname,
-                    'vendor': vendor,
-                    'router_ip': router_ip,
-                    'interface': c['interface']
-                }
-    # 2. Prefer vendor match (e.g., Arista for 10.0.x.x) with subnet check
-    for router, loopback_ip, protocol, destination, interface, next_hop in entries:
-        if protocol.lower() == 'connected' and next_hop.lower() == 'direct':
-            try:
-                net = ipaddress.ip_network(destination, strict=False)
-                ip_obj = ipaddress.ip_address(ip)
-                if ip_obj in net:
-                    for hostname, software_version, router_ip, vendor, username, password in routers:
-                        if vendor.lower() == 'arista' and router_ip == loopback_ip:
-                            if vendor == 'Unknown' or not vendor:
-                                vendor = detect_vendor_via_netconf(router_ip, username, password)
-                            return {
-                                'router': hostname,
-                                'vendor': vendor,
-                                'router_ip': router_ip,
-                                'interface': interface
-                            }
-            except Exception:
-                continue
-    # 3. Fallback: first candidate, but get vendor/name from inventory if possible
-    if candidates:
-        c = candidates[0]
-        for hostname, software_version, router_ip, vendor, username, password in routers:
-            if c['loopback_ip'] == router_ip:
-                if vendor == 'Unknown' or not vendor:
-                    vendor = detect_vendor_via_netconf(router_ip, username, password)
-                return {
-                    'router': hostname,
-                    'vendor': vendor,
-                    'router_ip': router_ip,
-                    'interface': c['interface']
-                }
-        # If not found in inventory, fallback to RIB info and try NETCONF on loopback_ip
-        vendor = detect_vendor_via_netconf(c['loopback_ip'])
-        return {
-            'router': c['rib_router'],
-            'vendor': vendor,
-            'router_ip': c['loopback_ip'],
-            'interface': c['interface']
-        }
-    return None 
\ No newline at end of file
+            if protocol_lower == 'connected' and next_hop_lower == 'direct':
+                try:
+                    net = parse_network(destination)
+                except Exception:
+                    continue
+                bucket = self.connected.setdefault((net.version, net.prefixlen), {})
+                bucket.setdefault(int(net.network_address), []).append((position, loopback_ip, interface))
+        # First inventory row per router IP, as the inventory scans matched them
+        self.routers_by_ip = {}
+        self.arista_by_ip = {}
+        for row in routers:
+            self.routers_by_ip.setdefault(row[2], row)
+            if (row[3] or '').lower() == 'arista':
+                self.arista_by_ip.setdefault(row[2], row)
+
+    def connected_covering(self, ip):
+        """
+        Get the connected/direct routes whose subnet contains ip.
+
+        Args:
+            ip (str): IP address.
+        Returns:
+            list: (loopback_ip, interface) of each covering route, in RIB order.
+        """
+        try:
+            ip_obj = parse_ip(ip)
+        except ValueError:
+            return []
+        ip_int = int(ip_obj)
+        bits = ip_obj.max_prefixlen
+        matches = []
+        for (version, prefixlen), bucket in self.connected.items():
+            if version == ip_obj.version:
+                matches.extend(bucket.get(ip_int >> (bits - prefixlen) << (bits - prefixlen), ()))
+        matches.sort()
+        return [(loopback_ip, interface) for _, loopback_ip, interface in matches]
+
+    def find(self, ip):
+        """
+        Find the router and interface for an IP address.
+
+        Args:
+            ip (str): IP address to search for.
+        Returns:
+            dict or None: Router info dict with keys 'router', 'vendor', 'router_ip', 'interface', or None if not found.
+        """
+        # Collect all direct matches
+        candidates = [c for prefix in (f"{ip}/32", f"{ip}/30", f"{ip}/24") for c in self.direct_by_dest.get(prefix, ())]
+        # 1. Prefer exact loopback match (and always get vendor/name from inventory)
+        for c in candidates:
+            row = self.routers_by_ip.get(c['loopback_ip'])
+            if row is not None:
+                return _router_result(row, c['interface'])
+        # 2. Prefer vendor match (e.g., Arista for 10.0.x.x) with subnet check
+        for loopback_ip, interface in self.connected_covering(ip):
+            row = self.arista_by_ip.get(loopback_ip)
+            if row is not None:
+                return _router_result(row, interface)
+        # 3. Fallback: first candidate, but get vendor/name from inventory if possible
+        if candidates:
+            c = candidates[0]
+            row = self.routers_by_ip.get(c['loopback_ip'])
+            if row is not None:
+                return _router_result(row, c['interface'])
+            # If not found in inventory, fallback to RIB info and try NETCONF on loopback_ip
+            vendor = detect_vendor_via_netconf(c['loopback_ip'])
+            return {
+                'router': c['rib_router'],
+                'vendor': vendor,
+                'router_ip': c['loopback_ip'],
+                'interface': c['interface']
+            }
+        return None
+
+    @classmethod
+    def build(cls):
+        """
+        Read the current RIB and inventory once and index them for repeated lookups.
+
+        Returns:
+            RouterLookupIndex: Index to pass to find_router_for_ip(..., index=...).
+        """
+        return cls(rib_db_manage.get_entries(), router_db.get_routers())
+
+def find_router_for_ip(ip, *, index=None):
+    """
+    Find the router and interface for a given IP address using RIB and inventory data.
+
+    Args:
+        ip (str): IP address to search for.
+        index (RouterLookupIndex): Prebuilt index to search; built from the current RIB and inventory if None.
+    Returns:
+        dict or None: Router info dict with keys 'router', 'vendor', 'router_ip', 'interface', or None if not found.
+    """
+    if index is None:
+        index = RouterLookupIndex.build()
+    return index.find(ip)
+
+def batch_find_routers(ips):
+    """
+    Find the router and interface for several IP addresses, reading and indexing the RIB and inventory once.
+
+    Args:
+        ips (iterable): IP addresses to search for.
+    Returns:
+        dict: IP address -> router info dict (as from find_router_for_ip) or None if not found.
+    """
+    index = RouterLookupIndex.build()
+    return {ip: index.find(ip) for ip in ips}
@@ -5,12 +5,19 @@ Services package initialization for network automation web app.
 This package contains modules for interacting with network devices and managing persistent data.
 """
 
-from .rib import get_rib_entries, add_rib_entry, clear_rib_entries
+from .rib import get_rib_entries, add_rib_entry, add_rib_entries, clear_rib_entries, close_connection
 from .vendor_host import get_device_info
+from .netconf_session import ConnectParams
+from .netconf_pool import NetconfPool, netconf_pool
 
 __all__ = [
     'get_rib_entries',
     'add_rib_entry',
+    'add_rib_entries',
     'clear_rib_entries',
-    'get_device_info'
+    'close_connection',
+    'get_device_info',
+    'ConnectParams',
+    'NetconfPool',
+    'netconf_pool'
 ] 
\ No newline at end of file
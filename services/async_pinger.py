@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Async Pinger Module
+
+This module pings whole address ranges from a single asyncio event loop using
+one ICMP socket: echo requests are sent at a controlled rate while replies are
+read as the socket becomes readable, so no thread or subprocess is used per IP.
+
+Needs an unprivileged ICMP datagram socket (Linux ping_group_range, macOS) or
+root for a raw socket; callers should fall back to IPPinger on PermissionError.
+
+Author: IP Scanner Automation System
+"""
+
+import asyncio
+import os
+import socket
+import struct
+import time
+from typing import Dict, Iterable, Optional, Union
+
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+# Echo requests sent per burst before yielding to the event loop
+_SEND_BURST = 256
+
+_PACK_IPV4 = struct.Struct(">I").pack
+_ICMP_HEADER = struct.Struct("!BBHHH")
+
+
+def _checksum(data: bytes) -> int:
+    """
+    Computes the Internet checksum (RFC 1071) of an ICMP message.
+
+    Args:
+        data (bytes): ICMP header and payload
+
+    Returns:
+        int: 16-bit one's complement checksum
+    """
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _echo_request(ident: int, seq: int) -> bytes:
+    """
+    Builds an ICMP echo request packet.
+
+    Args:
+        ident (int): Echo identifier
+        seq (int): Echo sequence number
+
+    Returns:
+        bytes: Packet ready to send
+    """
+    payload = b"ipscan"
+    header = _ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = _checksum(header + payload)
+    return _ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + payload
+
+
+def _open_icmp_socket() -> socket.socket:
+    """
+    Opens a non-blocking ICMP socket, preferring the unprivileged datagram kind.
+
+    Returns:
+        socket.socket: ICMP socket (SOCK_DGRAM or SOCK_RAW)
+
+    Raises:
+        PermissionError: If neither socket type may be opened
+    """
+    last_error = None
+    for sock_type in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+        try:
+            sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+        except OSError as e:
+            last_error = e
+            continue
+        sock.setblocking(False)
+        return sock
+    raise PermissionError(f"Cannot open an ICMP socket: {last_error}")
+
+
+def _result(ip: str, alive: bool, response_time: Optional[float]) -> Dict:
+    """
+    Builds a ping result in the same shape as IPPinger.ping_ip.
+
+    Args:
+        ip (str): IP address
+        alive (bool): Whether an echo reply was received
+        response_time (Optional[float]): Round-trip time in milliseconds
+
+    Returns:
+        Dict: Ping result
+    """
+    return {
+        'ip': ip,
+        'alive': alive,
+        'response_time': response_time,
+        'return_code': 0 if alive else 1,
+        'stdout': '',
+        'stderr': '',
+        'error': None if alive else 'Timeout'
+    }
+
+
+async def ping_all(ips: Iterable[Union[int, str]], timeout: float = 1.5,
+                   rate: int = 5000) -> Dict[str, Dict]:
+    """
+    Pings every address once from the running event loop.
+
+    Args:
+        ips (Iterable[Union[int, str]]): Addresses as integers (e.g. a host range) or strings
+        timeout (float): Seconds to wait for replies after the last request is sent
+        rate (int): Maximum echo requests sent per second
+
+    Returns:
+        Dict[str, Dict]: Dictionary mapping IP to ping results (IPPinger format)
+
+    Raises:
+        PermissionError: If no ICMP socket is available
+    """
+    loop = asyncio.get_running_loop()
+    sock = _open_icmp_socket()
+    is_raw = sock.type == socket.SOCK_RAW
+    ident = os.getpid() & 0xFFFF
+
+    targets = [socket.inet_ntoa(_PACK_IPV4(ip)) if isinstance(ip, int) else ip for ip in ips]
+    sent_at: Dict[str, float] = {}
+    rtts: Dict[str, float] = {}
+    all_replied = asyncio.Event()
+
+    def on_readable():
+        while True:
+            try:
+                packet, (src, _) = sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            # Raw sockets deliver the IP header too; datagram sockets start at ICMP
+            offset = (packet[0] & 0x0F) * 4 if is_raw else 0
+            if len(packet) < offset + _ICMP_HEADER.size:
+                continue
+            icmp_type, _, _, reply_ident, _ = _ICMP_HEADER.unpack_from(packet, offset)
+            # The kernel rewrites the identifier on datagram sockets and filters replies itself
+            if icmp_type != ICMP_ECHO_REPLY or (is_raw and reply_ident != ident):
+                continue
+            started = sent_at.get(src)
+            if started is not None and src not in rtts:
+                rtts[src] = (time.perf_counter() - started) * 1000
+                if len(rtts) == len(targets):
+                    all_replied.set()
+
+    loop.add_reader(sock.fileno(), on_readable)
+    try:
+        interval = _SEND_BURST / rate
+        for start in range(0, len(targets), _SEND_BURST):
+            for seq, ip in enumerate(targets[start:start + _SEND_BURST], start):
+                packet = _echo_request(ident, seq & 0xFFFF)
+                while True:
+                    try:
+                        sock.sendto(packet, (ip, 0))
+                        sent_at[ip] = time.perf_counter()
+                        break
+                    except (BlockingIOError, InterruptedError):
+                        await asyncio.sleep(0.001)
+                    except OSError:
+                        # Unroutable address; leave it unanswered
+                        break
+            await asyncio.sleep(interval)
+        if targets and len(rtts) < len(targets):
+            try:
+                await asyncio.wait_for(all_replied.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        loop.remove_reader(sock.fileno())
+        sock.close()
+
+    return {ip: _result(ip, ip in rtts, rtts.get(ip)) for ip in targets}
+
+
+def ping_range(ips: Iterable[Union[int, str]], timeout: float = 1.5,
+               rate: int = 5000) -> Dict[str, Dict]:
+    """
+    Synchronous wrapper around ping_all for callers without an event loop.
+
+    Args:
+        ips (Iterable[Union[int, str]]): Addresses as integers (e.g. a host range) or strings
+        timeout (float): Seconds to wait for replies after the last request is sent
+        rate (int): Maximum echo requests sent per second
+
+    Returns:
+        Dict[str, Dict]: Dictionary mapping IP to ping results (IPPinger format)
+
+    Raises:
+        PermissionError: If no ICMP socket is available
+    """
+    return asyncio.run(ping_all(ips, timeout=timeout, rate=rate))
+
+
+def main():
+    """Test function for the async pinger module."""
+    import ipaddress
+    network = ipaddress.IPv4Network("127.0.0.0/29")
+    host_ints = range(int(network.network_address) + 1, int(network.broadcast_address))
+
+    started = time.perf_counter()
+    results = ping_range(host_ints, timeout=1.0)
+    elapsed = time.perf_counter() - started
+
+    for ip, result in results.items():
+        status = "✓ Alive" if result['alive'] else "✗ Dead"
+        response = f" ({result['response_time']:.2f}ms)" if result['response_time'] else ""
+        print(f"{ip}: {status}{response}")
+    print(f"\nPinged {len(results)} IPs in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
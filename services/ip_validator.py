@@ -29,69 +29,168 @@ class IPValidator:
         Returns:
             Dict: Validation results with status and details
         """
-        try:
-            # Parse the IP and subnet
-            ip_obj = ipaddress.IPv4Address(ip)
-            network = ipaddress.IPv4Network(subnet, strict=False)
-            
-            # Check if IP is in the network
-            is_in_network = ip_obj in network
+        return self.validate_many([ip], subnet)[0]
+    
+    def validate_many(self, ips: List[str], subnet: str) -> List[Dict]:
+        """
+        Validates several IP addresses against the same subnet.
+        
+        The subnet is parsed once and its edge addresses are kept as integers,
+        so each IP only costs one parse and a few integer comparisons.
+        
+        Args:
+            ips (List[str]): IP addresses to validate
+            subnet (str): Subnet in CIDR notation (e.g., "192.168.1.0/24")
             
-            # Determine the role of the IP
-            role = self._determine_ip_role(ip_obj, network)
+        Returns:
+            List[Dict]: Validation results in the same order as ips
+        """
+        try:
+            network, net_int, _, bcast_int = self._parse_subnet(subnet)
             
             # Get network information
             network_info = {
                 'network_address': str(network.network_address),
                 'broadcast_address': str(network.broadcast_address),
-                'first_usable_host': str(network.network_address + 1),
-                'last_usable_host': str(network.broadcast_address - 1),
+                'first_usable_host': str(ipaddress.IPv4Address(net_int + 1)),
+                'last_usable_host': str(ipaddress.IPv4Address(bcast_int - 1)),
                 'total_hosts': network.num_addresses - 2,  # Exclude network and broadcast
                 'subnet_mask': str(network.netmask),
                 'prefix_length': network.prefixlen
             }
+        except ValueError as e:
+            return [self._invalid_result(ip, subnet, e) for ip in ips]
+        
+        results = []
+        for ip in ips:
+            try:
+                ip_int = int(ipaddress.IPv4Address(ip))
+            except ValueError as e:
+                results.append(self._invalid_result(ip, subnet, e))
+                continue
             
-            return {
+            results.append({
                 'ip': ip,
                 'subnet': subnet,
-                'is_valid': is_in_network,
-                'role': role,
-                'network_info': network_info,
+                'is_valid': net_int <= ip_int <= bcast_int,
+                'role': self._determine_ip_role(ip_int, net_int, bcast_int),
+                'network_info': dict(network_info),
                 'error': None
-            }
+            })
+        
+        return results
+    
+    def validate_batch(self, ips: List[str], subnets: List[str]) -> List[Dict]:
+        """
+        Classifies many IP addresses against a handful of subnets.
+        
+        Subnets are parsed once into (network, mask, broadcast) integers and
+        tried most-specific first; each IP is then matched with integer
+        masking only, without building IPv4Network objects per pair.
+        
+        Args:
+            ips (List[str]): IP addresses to classify
+            subnets (List[str]): Candidate subnets in CIDR notation
             
-        except ValueError as e:
-            return {
-                'ip': ip,
-                'subnet': subnet,
-                'is_valid': False,
-                'role': 'invalid',
-                'network_info': None,
-                'error': str(e)
-            }
+        Returns:
+            List[Dict]: One entry per IP with the matching subnet and role
+                        (subnet None and role 'invalid' or 'Not In Any Subnet' otherwise)
+        """
+        parsed = []
+        for subnet in subnets:
+            try:
+                network, net_int, mask_int, bcast_int = self._parse_subnet(subnet)
+            except ValueError:
+                continue
+            parsed.append((network.prefixlen, net_int, mask_int, bcast_int, subnet))
+        parsed.sort(key=lambda entry: entry[0], reverse=True)
+        
+        results = []
+        for ip in ips:
+            try:
+                ip_int = int(ipaddress.IPv4Address(ip))
+            except ValueError:
+                results.append({'ip': ip, 'subnet': None, 'role': 'invalid'})
+                continue
+            
+            match = {'ip': ip, 'subnet': None, 'role': 'Not In Any Subnet'}
+            for _, net_int, mask_int, bcast_int, subnet in parsed:
+                if ip_int & mask_int == net_int:
+                    match = {'ip': ip, 'subnet': subnet,
+                             'role': self._determine_ip_role(ip_int, net_int, bcast_int)}
+                    break
+            results.append(match)
+        
+        return results
     
-    def _determine_ip_role(self, ip_obj: ipaddress.IPv4Address, network: ipaddress.IPv4Network) -> str:
+    def _parse_subnet(self, subnet: str) -> Tuple[ipaddress.IPv4Network, int, int, int]:
+        """
+        Parses a subnet once for the bulk validators.
+        
+        Args:
+            subnet (str): Subnet in CIDR notation (e.g., "192.168.1.0/24")
+            
+        Returns:
+            Tuple: (network, network address, netmask, broadcast address), the last three as integers
+            
+        Raises:
+            ValueError: If the subnet is not a valid IPv4 network
+        """
+        network = ipaddress.IPv4Network(subnet, strict=False)
+        return network, int(network.network_address), int(network.netmask), int(network.broadcast_address)
+    
+    def _invalid_result(self, ip: str, subnet: str, error: ValueError) -> Dict:
+        """Builds the validation result for an unparsable IP or subnet."""
+        return {
+            'ip': ip,
+            'subnet': subnet,
+            'is_valid': False,
+            'role': 'invalid',
+            'network_info': None,
+            'error': str(error)
+        }
+    
+    def _determine_ip_role(self, ip_int: int, net_int: int, bcast_int: int) -> str:
         """
         Determines the role of an IP address within a network.
         
         Args:
-            ip_obj: IPv4Address object
-            network: IPv4Network object
+            ip_int: IP address as an integer
+            net_int: Network address as an integer
+            bcast_int: Broadcast address as an integer
             
         Returns:
             str: Role description
         """
-        if ip_obj == network.network_address:
+        if ip_int == net_int:
             return "Network Address"
-        elif ip_obj == network.broadcast_address:
+        elif ip_int == bcast_int:
             return "Broadcast Address"
-        elif ip_obj == network.network_address + 1:
+        elif ip_int == net_int + 1:
             return "First Usable Host"
-        elif ip_obj == network.broadcast_address - 1:
+        elif ip_int == bcast_int - 1:
             return "Last Usable Host"
         else:
             return "Usable Host"
     
+    def _parse_cidr(self, subnet: str) -> Tuple[int, int]:
+        """
+        Parses a subnet into its network address and netmask as integers.
+        
+        Args:
+            subnet (str): Subnet in CIDR notation (e.g., "192.168.1.0/24")
+            
+        Returns:
+            Tuple[int, int]: (network address, netmask)
+        """
+        address, _, prefix = subnet.partition('/')
+        if prefix.isdigit() and int(prefix) <= 32:
+            mask = (0xFFFFFFFF << (32 - int(prefix))) & 0xFFFFFFFF
+            return int(ipaddress.IPv4Address(address)) & mask, mask
+        # Netmask/hostmask or bare-address forms
+        network = ipaddress.IPv4Network(subnet, strict=False)
+        return int(network.network_address), int(network.netmask)
+    
     def validate_source_destination(self, source_ip: str, source_subnet: str, 
                                   destination_ip: str, destination_subnet: str) -> Dict:
         """
@@ -120,12 +219,14 @@ class IPValidator:
         
         # Check if source and destination are in the same subnet
         try:
-            source_network = ipaddress.IPv4Network(source_subnet, strict=False)
-            dest_network = ipaddress.IPv4Network(destination_subnet, strict=False)
+            a_net, a_mask = self._parse_cidr(source_subnet)
+            b_net, b_mask = self._parse_cidr(destination_subnet)
             
-            if source_network == dest_network:
+            # CIDR blocks overlap iff they agree under the shorter (smaller) mask
+            min_mask = a_mask & b_mask
+            if a_net == b_net and a_mask == b_mask:
                 warnings.append("Source and destination are in the same subnet")
-            elif source_network.overlaps(dest_network):
+            elif (a_net & min_mask) == (b_net & min_mask):
                 warnings.append("Source and destination subnets overlap")
                 
         except ValueError:
@@ -147,6 +248,28 @@ class IPValidator:
         """
         return ['/30', '/29', '/28', '/27', '/26', '/25', '/24', '/23', '/22', '/21', '/20', '/16', '/8']
     
+    def _format_endpoint(self, label: str, result: Dict) -> List[str]:
+        """
+        Formats the lines for one side (source or destination) of a validation result.
+        
+        Args:
+            label (str): "Source" or "Destination"
+            result (Dict): Validation result from validate_ip_in_subnet
+            
+        Returns:
+            List[str]: Output lines
+        """
+        lines = [
+            f"{label} IP: {result['ip']}",
+            f"{label} Subnet: {result['subnet']}",
+            f"Status: {'✓ Valid' if result['is_valid'] else '✗ Invalid'}",
+        ]
+        if result['is_valid']:
+            lines.append(f"Role: {result['role']}")
+        if result['error']:
+            lines.append(f"Error: {result['error']}")
+        return lines
+    
     def format_validation_output(self, validation_result: Dict) -> str:
         """
         Formats validation results into a user-friendly string.
@@ -157,41 +280,22 @@ class IPValidator:
         Returns:
             str: Formatted output string
         """
-        output = []
-        
-        # Source validation
         source = validation_result['source']
-        output.append(f"Source IP: {source['ip']}")
-        output.append(f"Source Subnet: {source['subnet']}")
-        output.append(f"Status: {'✓ Valid' if source['is_valid'] else '✗ Invalid'}")
-        if source['is_valid']:
-            output.append(f"Role: {source['role']}")
-        if source['error']:
-            output.append(f"Error: {source['error']}")
+        dest = validation_result['destination']
+        warnings = validation_result['warnings']
+        overall_status = "✓ All validations passed" if validation_result['overall_valid'] else "✗ Validation failed"
         
+        output = self._format_endpoint("Source", source)
         output.append("")
-        
-        # Destination validation
-        dest = validation_result['destination']
-        output.append(f"Destination IP: {dest['ip']}")
-        output.append(f"Destination Subnet: {dest['subnet']}")
-        output.append(f"Status: {'✓ Valid' if dest['is_valid'] else '✗ Invalid'}")
-        if dest['is_valid']:
-            output.append(f"Role: {dest['role']}")
-        if dest['error']:
-            output.append(f"Error: {dest['error']}")
+        output += self._format_endpoint("Destination", dest)
         
         # Warnings
-        if validation_result['warnings']:
-            output.append("")
-            output.append("⚠️  Warnings:")
-            for warning in validation_result['warnings']:
-                output.append(f"  - {warning}")
+        if warnings:
+            output += ["", "⚠️  Warnings:"]
+            output += [f"  - {warning}" for warning in warnings]
         
         # Overall status
-        output.append("")
-        overall_status = "✓ All validations passed" if validation_result['overall_valid'] else "✗ Validation failed"
-        output.append(f"Overall Status: {overall_status}")
+        output += ["", f"Overall Status: {overall_status}"]
         
         return "\n".join(output)
 
@@ -8,27 +8,128 @@ It also provides fallback methods when ping is blocked or unreliable.
 Author: IP Scanner Automation System
 """
 
+import errno
+import ipaddress
+import logging
+import os
+import selectors
 import socket
 import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 import subprocess
 import platform
 
 
+logger = logging.getLogger(__name__)
+
+_IS_LINUX = platform.system().lower() == "linux"
+# Create scan sockets non-blocking in one syscall where the platform supports it
+_SOCK_TYPE = socket.SOCK_STREAM | getattr(socket, "SOCK_NONBLOCK", 0)
+_TCP_USER_TIMEOUT = getattr(socket, "TCP_USER_TIMEOUT", 18)
+
+
+def tcp_connect_batch(ips: List[str], ports: List[int], timeout: float, results: Dict[str, bool]) -> None:
+    """
+    Issues non-blocking connects for every IP:port pair and waits on a single selector.
+    An IP is marked live as soon as any of its ports accepts; shared by LiveIPDetector and
+    vendor_host.probe_ports.
+    
+    Args:
+        ips (List[str]): IP addresses in this batch
+        ports (List[int]): Ports to try for each IP
+        timeout (float): Seconds to wait for the whole batch
+        results (Dict[str, bool]): Result map updated in place; every IP gets an entry
+    """
+    sel = selectors.DefaultSelector()
+    pending = {}  # ip -> sockets still connecting
+    user_timeout_ms = int(timeout * 1000)
+    
+    def close_ip(ip: str):
+        """Cancels the remaining connects for an IP."""
+        for sock in pending.pop(ip, ()):
+            sel.unregister(sock)
+            sock.close()
+    
+    try:
+        # A repeated IP would replace its own pending sockets and leak them
+        for ip in dict.fromkeys(ips):
+            results.setdefault(ip, False)
+            pending[ip] = set()
+            for port in ports:
+                try:
+                    sock = socket.socket(socket.AF_INET, _SOCK_TYPE)
+                except OSError:
+                    continue
+                if _IS_LINUX:
+                    try:
+                        # Kernel-enforced deadline for hosts that drop SYNs; the select deadline still applies without it
+                        sock.setsockopt(socket.IPPROTO_TCP, _TCP_USER_TIMEOUT, user_timeout_ms)
+                    except OSError:
+                        pass
+                try:
+                    if _SOCK_TYPE == socket.SOCK_STREAM:
+                        sock.setblocking(False)
+                    err = sock.connect_ex((ip, port))
+                except OSError:
+                    sock.close()
+                    continue
+                if err == 0:
+                    # Connected immediately (e.g. loopback)
+                    sock.close()
+                    results[ip] = True
+                    break
+                if err not in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY):
+                    # Refused or unreachable straight away
+                    sock.close()
+                    continue
+                sel.register(sock, selectors.EVENT_WRITE, ip)
+                pending[ip].add(sock)
+            if results[ip] or not pending[ip]:
+                close_ip(ip)
+        
+        deadline = time.monotonic() + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in sel.select(timeout=remaining):
+                sock, ip = key.fileobj, key.data
+                if sock not in pending.get(ip, ()):
+                    continue  # Already cancelled by an earlier event in this round
+                if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    results[ip] = True
+                    close_ip(ip)
+                    continue
+                pending[ip].discard(sock)
+                sel.unregister(sock)
+                sock.close()
+                if not pending[ip]:
+                    del pending[ip]
+    finally:
+        for ip in list(pending):
+            close_ip(ip)
+        sel.close()
+
+
 class LiveIPDetector:
     """Detects and confirms live IP addresses using multiple methods."""
     
-    def __init__(self, timeout: float = 2.0, max_threads: int = 50):
+    def __init__(self, timeout: float = 2.0, max_threads: int = 50, resolve_private: bool = False):
         """
         Initialize the live IP detector.
         
         Args:
             timeout (float): Timeout for connection attempts
             max_threads (int): Maximum number of concurrent threads
+            resolve_private (bool): Reverse-resolve private addresses too (set when a local resolver serves them)
         """
         self.timeout = timeout
         self.max_threads = max_threads
+        self.resolve_private = resolve_private
+        self.max_inflight = 512
         self.detection_methods = ['ping', 'tcp_connect', 'arp']
     
     def filter_ping_results(self, ping_results: Dict[str, Dict]) -> List[str]:
@@ -41,15 +142,11 @@ class LiveIPDetector:
         Returns:
             List[str]: List of confirmed live IP addresses
         """
-        live_ips = []
-        
-        for ip, result in ping_results.items():
-            if result['alive']:
-                # Additional validation: check if response time is reasonable
-                if result['response_time'] is None or result['response_time'] < 10000:  # 10 seconds max
-                    live_ips.append(ip)
-        
-        return live_ips
+        # Alive, with a reasonable response time (10 seconds max) when one was measured
+        return [
+            ip for ip, result in ping_results.items()
+            if result['alive'] and (result['response_time'] is None or result['response_time'] < 10000)
+        ]
     
     def tcp_connect_scan(self, ips: List[str], ports: List[int] = None) -> Dict[str, bool]:
         """
@@ -65,27 +162,15 @@ class LiveIPDetector:
         if ports is None:
             ports = [22, 23, 80, 443, 8080, 8443]  # Common ports
         
-        results = {}
-        
-        def scan_ip_port(ip: str, port: int) -> bool:
-            """Attempts TCP connection to IP:port."""
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(self.timeout)
-                result = sock.connect_ex((ip, port))
-                sock.close()
-                return result == 0
-            except Exception:
-                return False
+        results = {ip: False for ip in ips}
+        if not ports:
+            return results
         
-        for ip in ips:
-            # Try multiple ports for each IP
-            is_live = False
-            for port in ports:
-                if scan_ip_port(ip, port):
-                    is_live = True
-                    break
-            results[ip] = is_live
+        # Bound the number of sockets in flight so large subnets stay under the FD limit
+        batch_size = max(1, self.max_inflight // len(ports))
+        unique_ips = list(results)
+        for start in range(0, len(unique_ips), batch_size):
+            tcp_connect_batch(unique_ips[start:start + batch_size], ports, self.timeout, results)
         
         return results
     
@@ -93,6 +178,9 @@ class LiveIPDetector:
         """
         Performs ARP scan to detect live hosts (Linux/Unix only).
         
+        Sends one scapy ARP sweep when scapy is installed and the process may
+        open raw sockets; otherwise falls back to one arping per IP.
+        
         Args:
             ips (List[str]): List of IP addresses to scan
             
@@ -107,15 +195,26 @@ class LiveIPDetector:
                 results[ip] = False
             return results
         
+        if ips and os.geteuid() == 0:
+            try:
+                return self._scapy_arp_sweep(ips)
+            except (ImportError, PermissionError, OSError) as e:
+                # scapy missing or raw socket refused; other scapy failures propagate
+                logger.info("scapy ARP sweep unavailable (%s); falling back to arping", e)
+        
+        def arping(ip: str) -> bool:
+            """Sends a single ARP request to an IP."""
+            try:
+                cmd = ["arping", "-c", "1", "-w", str(int(self.timeout)), ip]
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout + 1)
+                return result.returncode == 0
+            except (subprocess.TimeoutExpired, FileNotFoundError):
+                return False
+        
         try:
-            # Use arping if available
-            for ip in ips:
-                try:
-                    cmd = ["arping", "-c", "1", "-w", str(int(self.timeout)), ip]
-                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout + 1)
-                    results[ip] = result.returncode == 0
-                except (subprocess.TimeoutExpired, FileNotFoundError):
-                    results[ip] = False
+            # Run arping processes concurrently; each one just waits on the wire
+            with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
+                results = dict(zip(ips, executor.map(arping, ips)))
         except Exception:
             # Fallback: mark all as not detected
             for ip in ips:
@@ -123,6 +222,22 @@ class LiveIPDetector:
         
         return results
     
+    def _scapy_arp_sweep(self, ips: List[str]) -> Dict[str, bool]:
+        """
+        Broadcasts ARP requests for all IPs at once and collects the replies.
+        
+        Args:
+            ips (List[str]): List of IP addresses to scan
+            
+        Returns:
+            Dict[str, bool]: Dictionary mapping IP to ARP response status
+        """
+        from scapy.all import ARP, Ether, srp  # Optional dependency, needs CAP_NET_RAW
+        
+        answered, _ = srp(Ether(dst="ff:ff:ff:ff:ff:ff") / ARP(pdst=ips), timeout=self.timeout, verbose=False)
+        replied = {reply.psrc for _, reply in answered}
+        return {ip: ip in replied for ip in ips}
+    
     def dns_lookup(self, ips: List[str]) -> Dict[str, bool]:
         """
         Performs reverse DNS lookup to detect hosts with DNS records.
@@ -133,20 +248,19 @@ class LiveIPDetector:
         Returns:
             Dict[str, bool]: Dictionary mapping IP to DNS record status
         """
-        results = {}
-        
-        def lookup_ip(ip: str) -> bool:
-            """Performs reverse DNS lookup for an IP."""
-            try:
-                hostname = socket.gethostbyaddr(ip)[0]
-                return hostname != ip  # Has a proper hostname
-            except (socket.herror, socket.gaierror):
-                return False
-        
-        for ip in ips:
-            results[ip] = lookup_ip(ip)
-        
-        return results
+        if len(ips) <= 1:
+            # Not worth a thread pool: resolve inline
+            return {ip: self._lookup_one(ip) for ip in ips}
+        with ThreadPoolExecutor(max_workers=min(self.max_threads, len(ips))) as executor:
+            return dict(zip(ips, executor.map(self._lookup_one, ips)))
+    
+    def _lookup_one(self, ip: str) -> bool:
+        """Performs reverse DNS lookup for an IP."""
+        try:
+            hostname = socket.gethostbyaddr(ip)[0]
+            return hostname != ip  # Has a proper hostname
+        except (socket.herror, socket.gaierror):
+            return False
     
     def confirm_live_ips(self, ping_results: Dict[str, Dict], 
                         ips: List[str] = None) -> Dict[str, Dict]:
@@ -188,27 +302,48 @@ class LiveIPDetector:
                 arp_live = [ip for ip, alive in arp_results.items() if alive]
                 confirmed_ips = arp_live
         
+        # DNS is informational only: resolve live, resolvable IPs up front, in parallel
+        confirmed_set = set(confirmed_ips)
+        dns_map = self.dns_lookup([ip for ip in ips if ip in confirmed_set and self._should_resolve(ip)])
+        
         # Build comprehensive results
         results = {}
         for ip in ips:
             ping_alive = ip in ping_live
-            tcp_alive = ip in confirmed_ips
-            
-            # Try DNS lookup for additional info
-            dns_results = self.dns_lookup([ip])
-            has_dns = dns_results.get(ip, False)
+            tcp_alive = ip in confirmed_set
+            has_dns = dns_map.get(ip, False)
             
             results[ip] = {
                 'ip': ip,
                 'ping_alive': ping_alive,
                 'tcp_alive': tcp_alive,
-                'confirmed_live': ip in confirmed_ips,
+                'confirmed_live': ip in confirmed_set,
                 'has_dns_record': has_dns,
                 'detection_method': self._determine_detection_method(ip, ping_alive, tcp_alive)
             }
         
         return results
     
+    def _should_resolve(self, ip: str) -> bool:
+        """
+        Checks whether a reverse DNS lookup is worth attempting for an IP.
+        
+        Private ranges almost never have PTR records on public resolvers, so each
+        lookup would only wait out a timeout.
+        
+        Args:
+            ip (str): IP address
+            
+        Returns:
+            bool: True if the IP should be resolved
+        """
+        if self.resolve_private:
+            return True
+        try:
+            return not ipaddress.IPv4Address(ip).is_private
+        except ValueError:
+            return False
+    
     def _determine_detection_method(self, ip: str, ping_alive: bool, tcp_alive: bool) -> str:
         """
         Determines which method successfully detected the IP.
@@ -239,16 +374,16 @@ class LiveIPDetector:
             str: Formatted summary string
         """
         total_ips = len(detection_results)
-        confirmed_live = len([r for r in detection_results.values() if r['confirmed_live']])
-        ping_detected = len([r for r in detection_results.values() if r['ping_alive']])
-        tcp_detected = len([r for r in detection_results.values() if r['tcp_alive']])
-        dns_records = len([r for r in detection_results.values() if r['has_dns_record']])
+        confirmed_live = ping_detected = tcp_detected = dns_records = 0
+        methods = Counter()
         
-        # Count detection methods
-        methods = {}
+        # Single pass over the results for every counter
         for result in detection_results.values():
-            method = result['detection_method']
-            methods[method] = methods.get(method, 0) + 1
+            confirmed_live += result['confirmed_live']
+            ping_detected += result['ping_alive']
+            tcp_detected += result['tcp_alive']
+            dns_records += result['has_dns_record']
+            methods[result['detection_method']] += 1
         
         return (
             f"Live IP Detection Summary:\n"
@@ -257,7 +392,7 @@ class LiveIPDetector:
             f"Ping Detected: {ping_detected}\n"
             f"TCP Detected: {tcp_detected}\n"
             f"DNS Records: {dns_records}\n"
-            f"Detection Methods: {methods}"
+            f"Detection Methods: {dict(methods)}"
         )
     
     def get_confirmed_live_ips(self, detection_results: Dict[str, Dict]) -> List[str]:
@@ -0,0 +1,172 @@
+"""
+services/netconf_pool.py
+-----------------------
+NETCONF session pool for network automation web app.
+Keeps idle sessions keyed by ConnectParams so repeated polls of the same device
+skip the SSH handshake and NETCONF hello exchange.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from services.netconf_session import ConnectParams, connect
+
+class NetconfPool:
+    """
+    Pool of reusable ncclient sessions.
+    A session is handed to one caller at a time and goes back to the pool only if its block exits cleanly;
+    idle sessions are reused newest-first, evicted least-recently-used when the pool is full, and closed
+    by a background sweeper once idle too long.
+    """
+
+    def __init__(self, max_size=32, idle_timeout=300, sweep_interval=60):
+        """
+        Args:
+            max_size (int): Maximum number of idle sessions kept across all devices.
+            idle_timeout (float): Seconds an idle session is kept before it is closed.
+            sweep_interval (float): Seconds between sweeps for expired sessions.
+        """
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self._idle = OrderedDict()  # ConnectParams -> [(manager, last_used), ...]
+        self._size = 0
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self._stopped = threading.Event()
+
+    @contextmanager
+    def acquire(self, host, port, username, password, timeout=10, connect_timeout=None):
+        """
+        Borrow a connected session for the duration of the block, opening one if none is idle.
+        Args:
+            host (str): Device IP address.
+            port (int): NETCONF port.
+            username (str): NETCONF username.
+            password (str): NETCONF password.
+            timeout (int): Session timeout in seconds when a new session is opened.
+            connect_timeout (float): Connect/handshake timeout in seconds when a new session is opened.
+        Yields:
+            ncclient.manager.Manager: Connected session.
+        """
+        key = ConnectParams(host, port, username, password, timeout=timeout, connect_timeout=connect_timeout)
+        m = self._take(key)
+        if m is None:
+            m = connect(key.host, key.port, key.username, key.password,
+                        timeout=key.timeout, connect_timeout=key.connect_timeout)
+        else:
+            m.timeout = timeout
+        try:
+            yield m
+        except BaseException:
+            # A failed block (RPC timeout, half-read pipeline) leaves the session in an unknown state
+            self._close(m)
+            raise
+        self._release(key, m)
+
+    def close_all(self):
+        """
+        Close every idle session and stop the sweeper.
+        """
+        self._stopped.set()
+        with self._lock:
+            sessions = [m for stack in self._idle.values() for m, _ in stack]
+            self._idle.clear()
+            self._size = 0
+        for m in sessions:
+            self._close(m)
+
+    def _take(self, key):
+        """
+        Pop the most recently used live session for key, discarding dead ones.
+        Args:
+            key (ConnectParams): Device the session is connected to.
+        Returns:
+            ncclient.manager.Manager or None: Idle session, or None if there is none.
+        """
+        dead = []
+        m = None
+        with self._lock:
+            stack = self._idle.get(key)
+            while stack:
+                candidate, _ = stack.pop()
+                self._size -= 1
+                if candidate.connected:
+                    m = candidate
+                    break
+                dead.append(candidate)
+            if stack is not None and not stack:
+                del self._idle[key]
+        for candidate in dead:
+            self._close(candidate)
+        return m
+
+    def _release(self, key, m):
+        """
+        Return a session to the pool, evicting the least recently used one if the pool is full.
+        Args:
+            key (ConnectParams): Device the session is connected to.
+            m (ncclient.manager.Manager): Session being returned.
+        """
+        if not m.connected:
+            return
+        evicted = []
+        with self._lock:
+            self._idle.setdefault(key, []).append((m, time.monotonic()))
+            self._idle.move_to_end(key)
+            self._size += 1
+            while self._size > self.max_size:
+                oldest_key = next(iter(self._idle))
+                stack = self._idle[oldest_key]
+                evicted.append(stack.pop(0)[0])
+                self._size -= 1
+                if not stack:
+                    del self._idle[oldest_key]
+            self._start_sweeper()
+        for old in evicted:
+            self._close(old)
+
+    def _start_sweeper(self):
+        """
+        Start the background sweeper thread if it is not running (called with the lock held).
+        """
+        if self._sweeper is None or not self._sweeper.is_alive():
+            self._stopped.clear()
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="netconf-pool-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _sweep_loop(self):
+        """
+        Close sessions idle for longer than idle_timeout until the pool is closed.
+        """
+        while not self._stopped.wait(self.sweep_interval):
+            cutoff = time.monotonic() - self.idle_timeout
+            expired = []
+            with self._lock:
+                for key in list(self._idle):
+                    stack = self._idle[key]
+                    keep = [(m, used) for m, used in stack if used >= cutoff]
+                    expired.extend(m for m, used in stack if used < cutoff)
+                    self._size -= len(stack) - len(keep)
+                    if keep:
+                        self._idle[key] = keep
+                    else:
+                        del self._idle[key]
+            for m in expired:
+                self._close(m)
+
+    @staticmethod
+    def _close(m):
+        """
+        Close a session, ignoring errors from sessions the device already dropped.
+        Args:
+            m (ncclient.manager.Manager): Session to close.
+        """
+        try:
+            m.close_session()
+        except Exception:
+            pass
+
+# Shared pool for callers that poll the same devices repeatedly
+netconf_pool = NetconfPool()
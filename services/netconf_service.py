@@ -2,142 +2,83 @@
 services/netconf_service.py
 --------------------------
 Network automation backend module for NETCONF-based interface and protocol discovery.
-Provides functions to fetch interface details and enabled protocols from routers using NETCONF.
+Provides functions to fetch device, interface and protocol details from routers using NETCONF.
 Designed for use in a modular Flask-based network automation web app.
 """
 
-from services.vendor_host import get_device_info
-from ncclient import manager
-import xml.etree.ElementTree as ET
-from services.ports_protocols import get_ports_and_protocols
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from services.netconf_session import connect
+from services.vendor_host import get_device_info, read_device_info
+# Interface/protocol parsing lives in ports_protocols; re-exported here for existing callers
+from services.ports_protocols import (
+    extract_interface_details,
+    extract_enabled_protocols,
+    get_ports_and_protocols,
+    read_ports_and_protocols,
+)
 
-# TODO: Replace print statements with logging for production/IEEE quality
-
-def extract_interface_details(xml_data, ns):
-    """
-    Parse XML data to extract interface names and status.
+# Upper bound on concurrent NETCONF sessions opened by check_netconf_for_ips
+MAX_NETCONF_WORKERS = 32
 
-    Args:
-        xml_data (str): NETCONF XML response as string.
-        ns (dict): Namespace mapping for XML parsing.
-    Returns:
-        list: List of interface names with status (e.g., ['GigabitEthernet1 (Up)'])
-    """
-    ports = []
-    try:
-        root = ET.fromstring(xml_data)
-        for iface in root.findall(".//if:interface", ns):
-            name = iface.find("if:name", ns)
-            enabled = iface.find("if:enabled", ns)
-            if name is not None:
-                status = "Up" if (enabled is not None and enabled.text == 'true') else "Down"
-                ports.append(f"{name.text} ({status})")
-    except Exception:
-        pass
-    return ports if ports else ["Unknown"]
-
-def extract_enabled_protocols(capabilities):
-    """
-    Parse NETCONF server capabilities to detect enabled protocols.
-
-    Args:
-        capabilities (iterable): NETCONF server capabilities.
-    Returns:
-        list: List of detected protocol names (e.g., ['NETCONF', 'BGP'])
-    """
-    protocols = set()
-    for cap in capabilities:
-        lcap = cap.lower()
-        if "netconf" in lcap:
-            protocols.add("NETCONF")
-        if "openconfig" in lcap:
-            protocols.add("OpenConfig")
-        if "bgp" in lcap:
-            protocols.add("BGP")
-        if "ospf" in lcap:
-            protocols.add("OSPF")
-        if "lldp" in lcap:
-            protocols.add("LLDP")
-        if "routing" in lcap:
-            protocols.add("Routing")
-        if "yang" in lcap:
-            protocols.add("YANG")
-    return list(protocols) if protocols else ["Unknown"]
+# TODO: Replace print statements with logging for production/IEEE quality
 
-def get_ports_and_protocols(host, port, username, password):
+def _probe_one(entry, connect_timeout=None, rpc_timeout=10):
     """
-    Connect to a router via NETCONF and fetch interface and protocol information.
+    Check NETCONF connectivity for a single device and fetch its device/interface/protocol info.
 
     Args:
-        host (str): Router IP address.
-        port (int): NETCONF port (default: 830).
-        username (str): NETCONF username.
-        password (str): NETCONF password.
+        entry (dict): Dict with 'ip', 'username', 'password'.
+        connect_timeout (float): Seconds allowed to reach the device and finish the handshake.
+        rpc_timeout (int): Seconds to wait for each RPC reply.
     Returns:
-        tuple: (list of interfaces, list of protocols)
+        dict: Device and protocol/interface info.
     """
+    ip = entry['ip']
+    username = entry['username']
+    password = entry['password']
+    ports, protocols = [], []
+    # No separate port probe: connect() fails fast when nothing answers on the NETCONF port
     try:
-        with manager.connect(
-            host=host,
-            port=port,
-            username=username,
-            password=password,
-            hostkey_verify=False,
-            allow_agent=False,
-            look_for_keys=False,
-            timeout=10
-        ) as m:
-            # First try standard IETF interfaces
-            ports = []
-            iface_filter = """
-            <filter>
-              <interfaces xmlns="urn:ietf:params:xml:ns:yang:ietf-interfaces">
-                <interface/>
-              </interfaces>
-            </filter>
-            """
-            try:
-                iface_reply = m.get(iface_filter).data_xml
-                ports = extract_interface_details(
-                    iface_reply, {"if": "urn:ietf:params:xml:ns:yang:ietf-interfaces"}
-                )
-            except Exception:
-                ports = ["Unknown"]
-
-            # Detect protocols from capabilities
-            protocols = extract_enabled_protocols(m.server_capabilities)
-
-            return ports, protocols
-
+        # One SSH session serves both the device-info and the interface/protocol queries
+        with connect(ip, 830, username, password, timeout=rpc_timeout, connect_timeout=connect_timeout) as m:
+            hostname, software_version, vendor, netconf_status = read_device_info(m, ip)
+            if netconf_status.startswith('Enabled'):
+                ports, protocols = read_ports_and_protocols(m)
+    except OSError:
+        hostname, software_version, vendor, netconf_status = "Unknown", "Unknown", "Unknown", "Not Enabled (No NETCONF)"
     except Exception as e:
-        print(f"❌ NETCONF Error on {host}: {e}")
-        return ["Unknown"], ["Unknown"]
+        print(f"Error connecting to {ip}: {str(e)}")
+        hostname, software_version, vendor, netconf_status = "Unknown", "Unknown", "Unknown", f"Error: {str(e)}"
+    return {
+        'hostname': hostname or 'Unknown',
+        'software_version': software_version or 'Unknown',
+        'ip': ip,
+        'vendor': vendor or 'Unknown',
+        'username': username,
+        'password': password,
+        'netconf_status': netconf_status,
+        'protocols': ', '.join(protocols) if protocols else 'Unknown',
+        'ports': ', '.join(ports) if ports else 'Unknown'
+    }
 
-def check_netconf_for_ips(ip_cred_list):
+def check_netconf_for_ips(ip_cred_list, max_workers=MAX_NETCONF_WORKERS, connect_timeout=None, rpc_timeout=10):
     """
     For a list of IPs and credentials, check NETCONF connectivity and fetch device/interface/protocol info.
+    Devices are probed concurrently; results keep the order of the input list.
 
     Args:
         ip_cred_list (list): List of dicts with 'ip', 'username', 'password'.
+        max_workers (int): Maximum number of devices probed at the same time.
+        connect_timeout (float): Seconds allowed to reach each device and finish the handshake
+            (lower it so unreachable devices give their worker back sooner).
+        rpc_timeout (int): Seconds to wait for each RPC reply.
     Returns:
         list: List of dicts with device and protocol/interface info.
     """
-    results = []
-    for entry in ip_cred_list:
-        ip = entry['ip']
-        username = entry['username']
-        password = entry['password']
-        hostname, software_version, vendor, netconf_status = get_device_info(ip, 830, username, password)
-        ports, protocols = get_ports_and_protocols(ip, 830, username, password) if netconf_status.startswith('Enabled') else ([], [])
-        results.append({
-            'hostname': hostname or 'Unknown',
-            'software_version': software_version or 'Unknown',
-            'ip': ip,
-            'vendor': vendor or 'Unknown',
-            'username': username,
-            'password': password,
-            'netconf_status': netconf_status,
-            'protocols': ', '.join(protocols) if protocols else 'Unknown',
-            'ports': ', '.join(ports) if ports else 'Unknown'
-        })
-    return results 
\ No newline at end of file
+    if not ip_cred_list:
+        return []
+    workers = max(1, min(max_workers, len(ip_cred_list)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        probe = partial(_probe_one, connect_timeout=connect_timeout, rpc_timeout=rpc_timeout)
+        return list(executor.map(probe, ip_cred_list))
@@ -0,0 +1,221 @@
+"""
+services/netconf_session.py
+--------------------------
+Shared NETCONF session helpers for network automation web app.
+Lets several discovery helpers (vendor detection, device info, interfaces/protocols)
+run over one SSH/NETCONF session instead of each paying for its own handshake.
+"""
+
+import socket
+import weakref
+from dataclasses import dataclass, field
+from functools import lru_cache
+from lxml import etree
+from ncclient import manager
+from ncclient.operations.errors import TimeoutExpiredError
+from ncclient.operations.rpc import RaiseMode, RPCError
+from ncclient.xml_ import NCElement, to_ele
+
+# Seconds allowed for the TCP connect alone; unreachable devices fail here instead of
+# waiting out the full session timeout
+CONNECT_TIMEOUT = 3
+
+@dataclass(frozen=True)
+class ConnectParams:
+    """
+    Connection settings for one device, in one place.
+    Hashable, so it can key session pools; the timeouts are left out of equality so a device
+    maps to the same key whatever timeouts a caller asks for.
+    """
+    host: str
+    port: int = 830
+    username: str = ''
+    password: str = field(default='', repr=False)
+    device: str = 'default'
+    timeout: int = field(default=10, compare=False)
+    connect_timeout: float = field(default=None, compare=False)
+
+@lru_cache(maxsize=None)
+def _device_handler_class(name):
+    """
+    Resolve ncclient's device handler class for a platform once, instead of on every connect.
+    Each session still gets its own handler instance.
+    Args:
+        name (str): ncclient device name (e.g. 'default', 'junos', 'csr').
+    Returns:
+        type: Device handler class.
+    """
+    return type(manager.make_device_handler({'name': name}))
+
+def connect(host, port, username, password, timeout=10, device='default', connect_timeout=None):
+    """
+    Open a NETCONF session with the settings used across the app.
+    The returned manager can be shared by several fetch helpers before it is closed.
+    Args:
+        host (str): Device IP address.
+        port (int): NETCONF port.
+        username (str): NETCONF username.
+        password (str): NETCONF password.
+        timeout (int): Timeout in seconds for each RPC (and for the handshake unless connect_timeout is set).
+        device (str): ncclient device handler name.
+        connect_timeout (float): Seconds allowed to reach the device and finish the SSH/NETCONF handshake.
+            Defaults to CONNECT_TIMEOUT for the TCP connect and timeout for the handshake.
+    Returns:
+        ncclient.manager.Manager: Connected session (usable as a context manager).
+    """
+    if connect_timeout is None:
+        tcp_timeout, handshake_timeout = min(CONNECT_TIMEOUT, timeout), timeout
+    else:
+        tcp_timeout = handshake_timeout = connect_timeout
+    sock = socket.create_connection((host, port), timeout=tcp_timeout)
+    try:
+        # Wait for the SSH banner without consuming it, bounded by the handshake timeout
+        # (paramiko's own banner wait is a fixed 15 seconds)
+        sock.settimeout(handshake_timeout)
+        if not sock.recv(1, socket.MSG_PEEK):
+            raise ConnectionError(f"{host}:{port} closed the connection before sending an SSH banner")
+        m = manager.connect(
+            host=host,
+            port=port,
+            username=username,
+            password=password,
+            hostkey_verify=False,
+            allow_agent=False,
+            look_for_keys=False,
+            timeout=handshake_timeout,
+            device_params={'name': device, 'handler': _device_handler_class(device)},
+            sock=sock
+        )
+    except Exception:
+        sock.close()
+        raise
+    m.timeout = timeout
+    return m
+
+class SessionCapabilities:
+    """
+    A session's server capabilities, read once and indexed for repeated checks.
+    Attributes:
+        uris (tuple): Capability URIs as advertised in the server hello.
+        text (str): URIs joined by newlines, for substring and regex scans.
+        lower (str): Lowercased text, for case-insensitive substring checks.
+        bases (frozenset): URIs without their ?query part, for exact membership tests.
+    """
+    __slots__ = ('uris', 'text', 'lower', 'bases')
+
+    def __init__(self, capabilities):
+        self.uris = tuple(capabilities)
+        self.text = "\n".join(self.uris)
+        self.lower = self.text.lower()
+        self.bases = frozenset(uri.partition('?')[0] for uri in self.uris)
+
+# Capabilities never change after the hello, so each session is indexed once
+_SESSION_CAPABILITIES = weakref.WeakKeyDictionary()
+
+def session_capabilities(m):
+    """
+    Return the indexed server capabilities of a session, building them on first use.
+    Args:
+        m (ncclient.manager.Manager): Connected NETCONF session.
+    Returns:
+        SessionCapabilities: Capabilities shared by every check on this session.
+    """
+    caps = _SESSION_CAPABILITIES.get(m)
+    if caps is None:
+        caps = _SESSION_CAPABILITIES[m] = SessionCapabilities(m.server_capabilities)
+    return caps
+
+def reply_root(reply):
+    """
+    Return the element tree a NETCONF reply already holds, parsing its raw XML only as a last resort.
+    Args:
+        reply: ncclient reply (GetReply, RPCReply, or the NCElement Junos sessions return).
+    Returns:
+        lxml.etree._Element: The data element if there is one, otherwise the reply's root element.
+    """
+    data = getattr(reply, 'data_ele', None)
+    if data is not None:
+        return data
+    if hasattr(reply, 'xpath'):
+        # NCElement: the namespace-stripped document is already built
+        return reply.xpath('/*')[0]
+    if hasattr(reply, 'parse'):
+        # RPCReply: parse() is a no-op once ncclient has checked the reply for errors
+        reply.parse()
+        return reply._root
+    return etree.fromstring(reply.xml.encode())
+
+def _collect_reply(rpc, handler, timeout, huge_tree):
+    """
+    Wait for an RPC sent in async mode and return its reply as the same RPC returns in sync mode.
+    Mirrors ncclient's RPC._request: the device handler's exempt rpc-errors and the RPC's
+    raise_mode decide whether an rpc-error raises, and the reply gets the handler's transform.
+    Args:
+        rpc (ncclient.operations.RPC): Request issued in async mode.
+        handler: The session's ncclient device handler.
+        timeout (float): Seconds to wait for the reply.
+        huge_tree (bool): Parse the reply with lxml's huge_tree option.
+    Returns:
+        RPCReply or NCElement: The reply.
+    Raises:
+        TimeoutExpiredError: If the reply does not arrive within timeout.
+        RPCError: If the device answers with an rpc-error that raise_mode says to raise.
+    """
+    if not rpc.event.wait(timeout):
+        raise TimeoutExpiredError('ncclient timed out while waiting for an rpc reply.')
+    if rpc.error is not None:
+        # Error that prevented reply delivery
+        raise rpc.error
+    reply = rpc.reply
+    reply.parse()
+    error = reply.error
+    if error is not None and not handler.is_rpc_error_exempt(error.message):
+        if rpc.raise_mode == RaiseMode.ALL or (rpc.raise_mode == RaiseMode.ERRORS and error.severity == "error"):
+            if len(reply.errors) > 1:
+                raise RPCError(to_ele(reply._raw), errs=reply.errors)
+            raise error
+    transform = handler.transform_reply()
+    return NCElement(reply, transform, huge_tree=huge_tree) if transform else reply
+
+def pipeline_rpcs(m, *requests, return_exceptions=False):
+    """
+    Send several RPCs back to back on one session, then collect their replies.
+    The device works through the queued requests while earlier replies are still in flight,
+    so N requests cost about one round trip instead of N.
+    Args:
+        m (ncclient.manager.Manager): Connected NETCONF session.
+        *requests (callable): Zero-argument callables issuing one RPC each (e.g. lambda: m.get(...)).
+        return_exceptions (bool): Put a failed request's exception in its slot instead of raising.
+    Returns:
+        list: RPC replies (or exceptions), in the order of requests, shaped as the same RPCs
+        return in sync mode.
+    Raises:
+        TimeoutExpiredError: If a reply does not arrive within the session timeout.
+        ncclient.operations.RPCError: If the device answers with an rpc-error, as m.raise_mode decides.
+    """
+    # ncclient has no public accessor for the handler that vets and transforms sync replies
+    handler = m._device_handler
+    previous_mode = m.async_mode
+    m.async_mode = True
+    try:
+        rpcs = []
+        for request in requests:
+            try:
+                rpcs.append(request())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                rpcs.append(e)
+    finally:
+        m.async_mode = previous_mode
+    replies = []
+    for rpc in rpcs:
+        try:
+            if isinstance(rpc, Exception):
+                raise rpc
+            replies.append(_collect_reply(rpc, handler, m.timeout, m.huge_tree))
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            replies.append(e)
+    return replies
@@ -5,8 +5,98 @@ Module for discovering router interfaces and enabled protocols via NETCONF.
 Supports multi-vendor interface parsing and protocol detection for network automation web apps.
 """
 
-from ncclient import manager
-import xml.etree.ElementTree as ET
+import io
+from functools import lru_cache
+from services.netconf_session import connect, session_capabilities
+from lxml import etree
+import re
+
+# Capability keyword -> protocol name, matched anywhere in the capability URIs
+_PROTOCOL_KEYWORDS = {
+    "netconf": "NETCONF",
+    "openconfig": "OpenConfig",
+    "bgp": "BGP",
+    "ospf": "OSPF",
+    "lldp": "LLDP",
+    "routing": "Routing",
+    "yang": "YANG",
+}
+# One case-insensitive substring scan; no keyword overlaps another, so findall sees every occurrence
+_PROTOCOL_PATTERN = re.compile("|".join(_PROTOCOL_KEYWORDS), re.IGNORECASE)
+
+_IETF_IF_TAG = "{urn:ietf:params:xml:ns:yang:ietf-interfaces}"
+_CISCO_IF_TAG = "{http://cisco.com/ns/yang/Cisco-IOS-XE-interfaces-oper}"
+_JUNOS_IF_TAG = "{http://xml.juniper.net/junos/18.4R1/junos-interface}"
+
+# Interface element and <get> subtree per model, in the order the models are preferred
+_INTERFACE_MODELS = (
+    (_IETF_IF_TAG, f"{_IETF_IF_TAG}interface", """
+  <interfaces xmlns="urn:ietf:params:xml:ns:yang:ietf-interfaces">
+    <interface/>
+  </interfaces>"""),
+    (_CISCO_IF_TAG, f"{_CISCO_IF_TAG}interface", """
+  <interfaces xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-interfaces-oper">
+    <interface/>
+  </interfaces>"""),
+    (_JUNOS_IF_TAG, f"{_JUNOS_IF_TAG}physical-interface", """
+  <interface-information xmlns="http://xml.juniper.net/junos/18.4R1/junos-interface">
+    <physical-interface/>
+  </interface-information>"""),
+)
+_INTERFACE_TAGS = tuple((ns_tag, tag) for ns_tag, tag, _ in _INTERFACE_MODELS)
+
+# Juniper physical-interface lookups, compiled once rather than per element
+_JUNOS_NS = {"j": _JUNOS_IF_TAG.strip("{}")}
+_JUNOS_NAME = etree.XPath("j:name/text()", namespaces=_JUNOS_NS)
+_JUNOS_ADMIN = etree.XPath("j:admin-status/text()", namespaces=_JUNOS_NS)
+
+# One <get> covering all three interface models; devices return only the subtrees they implement
+_INTERFACE_FILTER = "<filter>" + "".join(subtree for _, _, subtree in _INTERFACE_MODELS) + "\n</filter>"
+
+def _to_bytes(xml_data):
+    """
+    Encode a NETCONF reply for lxml, which rejects str input carrying an encoding declaration.
+
+    Args:
+        xml_data (str or bytes): NETCONF XML response.
+    Returns:
+        bytes: UTF-8 encoded XML.
+    """
+    return xml_data.encode() if isinstance(xml_data, str) else xml_data
+
+def _iter_elements(xml_data, tag):
+    """
+    Stream a NETCONF reply and yield each element with the given tag.
+    Each element is cleared, and its already-read siblings dropped, once the caller moves on,
+    so memory stays bounded by a single element rather than the whole document.
+
+    Args:
+        xml_data (str or bytes): NETCONF XML response.
+        tag (str or list): Clark-notation tag(s) to match (e.g., '{ns}interface').
+    Yields:
+        lxml.etree._Element: Each matching element.
+    """
+    for _, elem in etree.iterparse(io.BytesIO(_to_bytes(xml_data)), tag=tag):
+        yield elem
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+@lru_cache(maxsize=None)
+def _interface_xpaths(ns_tag):
+    """
+    Compile the interface name/enabled lookups for a namespace tag once.
+
+    Args:
+        ns_tag (str): Namespace tag (e.g., '{urn:ietf:params:xml:ns:yang:ietf-interfaces}').
+    Returns:
+        tuple: (name XPath, enabled XPath), each returning a list of text values.
+    """
+    ns = {"if": ns_tag.strip("{}")}
+    return (
+        etree.XPath("if:name/text()", namespaces=ns),
+        etree.XPath("if:enabled/text()", namespaces=ns),
+    )
 
 def extract_interface_details(xml_data, ns_tag):
     """
@@ -18,46 +108,92 @@ def extract_interface_details(xml_data, ns_tag):
     Returns:
         list: List of interface names with status (e.g., ['GigabitEthernet1 (Up)'])
     """
+    return _extract_interfaces(xml_data, ns_tag, f"{ns_tag}interface")
+
+def _extract_interfaces(xml_data, ns_tag, tag):
+    """
+    Parse XML data to extract interface names and status for one interface model.
+
+    Args:
+        xml_data (str): NETCONF XML response as string.
+        ns_tag (str): Namespace tag of the model.
+        tag (str): Clark-notation tag of the interface element.
+    Returns:
+        list: List of interface names with status, or ['Unknown'].
+    """
     ports = []
     try:
-        root = ET.fromstring(xml_data)
-        for iface in root.findall(f".//{ns_tag}interface"):
-            name = iface.find(f"{ns_tag}name")
-            enabled = iface.find(f"{ns_tag}enabled")
-            if name is not None:
-                status = "Up" if (enabled is not None and enabled.text == 'true') else "Down"
-                ports.append(f"{name.text} ({status})")
+        for iface in _iter_elements(xml_data, tag):
+            entry = _format_interface(iface, ns_tag)
+            if entry:
+                ports.append(entry)
     except Exception:
         pass
     return ports if ports else ["Unknown"]
 
+def extract_any_interface_details(xml_data):
+    """
+    Parse a reply to the combined interface filter in a single streaming pass.
+    Interfaces are collected per model and the first model (IETF, Cisco, Juniper) that returned any wins.
+
+    Args:
+        xml_data (str): NETCONF XML response as string.
+    Returns:
+        list: List of interface names with status (e.g., ['GigabitEthernet1 (Up)'])
+    """
+    found = {ns_tag: [] for ns_tag, _ in _INTERFACE_TAGS}
+    try:
+        for iface in _iter_elements(xml_data, [tag for _, tag in _INTERFACE_TAGS]):
+            ns_tag = iface.tag[:iface.tag.index("}") + 1]
+            entry = _format_interface(iface, ns_tag)
+            if entry:
+                found[ns_tag].append(entry)
+    except Exception:
+        pass
+    for ns_tag, _ in _INTERFACE_TAGS:
+        if found[ns_tag]:
+            return found[ns_tag]
+    return ["Unknown"]
+
+def _format_interface(iface, ns_tag):
+    """
+    Format one interface element as 'name (Up|Down)'.
+
+    Args:
+        iface (lxml.etree._Element): Interface element.
+        ns_tag (str): Namespace tag of the element.
+    Returns:
+        str or None: Formatted entry, or None if the interface has no name.
+    """
+    if ns_tag == _JUNOS_IF_TAG:
+        names = _JUNOS_NAME(iface)
+        if not names:
+            return None
+        admin_status = _JUNOS_ADMIN(iface)
+        status = "Up" if admin_status and admin_status[0].lower() == "up" else "Down"
+        return f"{names[0]} ({status})"
+    name_xpath, enabled_xpath = _interface_xpaths(ns_tag)
+    names = name_xpath(iface)
+    if not names:
+        return None
+    status = "Up" if enabled_xpath(iface) == ['true'] else "Down"
+    return f"{names[0]} ({status})"
+
 def extract_enabled_protocols(capabilities):
     """
     Parse NETCONF server capabilities to detect enabled protocols.
 
     Args:
-        capabilities (iterable): NETCONF server capabilities.
+        capabilities (iterable or str): NETCONF server capabilities, or them joined by newlines.
     Returns:
         list: List of detected protocol names (e.g., ['NETCONF', 'BGP'])
     """
-    protocols = set()
-    for cap in capabilities:
-        lcap = cap.lower()
-        if "netconf" in lcap:
-            protocols.add("NETCONF")
-        if "openconfig" in lcap:
-            protocols.add("OpenConfig")
-        if "bgp" in lcap:
-            protocols.add("BGP")
-        if "ospf" in lcap:
-            protocols.add("OSPF")
-        if "lldp" in lcap:
-            protocols.add("LLDP")
-        if "routing" in lcap:
-            protocols.add("Routing")
-        if "yang" in lcap:
-            protocols.add("YANG")
-    return list(protocols) if protocols else ["Unknown"]
+    if not isinstance(capabilities, str):
+        capabilities = "\n".join(capabilities)
+    # One scan over all capabilities joined together
+    found = frozenset(keyword.lower() for keyword in _PROTOCOL_PATTERN.findall(capabilities))
+    protocols = [_PROTOCOL_KEYWORDS[keyword] for keyword in found]
+    return protocols if protocols else ["Unknown"]
 
 def get_ports_and_protocols(host, port, username, password):
     """
@@ -73,76 +209,51 @@ def get_ports_and_protocols(host, port, username, password):
         tuple: (list of interfaces, list of protocols)
     """
     try:
-        with manager.connect(
-            host=host,
-            port=port,
-            username=username,
-            password=password,
-            hostkey_verify=False,
-            allow_agent=False,
-            look_for_keys=False,
-            timeout=10
-        ) as m:
-
-            # Try standard IETF interfaces first
-            ports = []
-            try:
-                ietf_filter = """
-                <filter>
-                  <interfaces xmlns="urn:ietf:params:xml:ns:yang:ietf-interfaces">
-                    <interface/>
-                  </interfaces>
-                </filter>
-                """
-                iface_reply = m.get(ietf_filter).data_xml
-                ports = extract_interface_details(iface_reply, "{urn:ietf:params:xml:ns:yang:ietf-interfaces}")
-            except:
-                ports = []
-
-            # Try Cisco fallback if needed
-            if not ports or ports == ["Unknown"]:
-                try:
-                    cisco_filter = """
-                    <filter>
-                      <interfaces xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-interfaces-oper">
-                        <interface/>
-                      </interfaces>
-                    </filter>
-                    """
-                    iface_reply = m.get(cisco_filter).data_xml
-                    ports = extract_interface_details(iface_reply, "{http://cisco.com/ns/yang/Cisco-IOS-XE-interfaces-oper}")
-                except:
-                    pass
-
-            # Try Juniper fallback if needed
-            if not ports or ports == ["Unknown"]:
-                try:
-                    juniper_filter = """
-                    <filter>
-                      <interface-information xmlns="http://xml.juniper.net/junos/18.4R1/junos-interface">
-                        <physical-interface/>
-                      </interface-information>
-                    </filter>
-                    """
-                    iface_reply = m.get(juniper_filter).data_xml
-                    root = ET.fromstring(iface_reply)
-                    ports = []
-                    for pi in root.findall(".//{http://xml.juniper.net/junos/18.4R1/junos-interface}physical-interface"):
-                        name_elem = pi.find("{http://xml.juniper.net/junos/18.4R1/junos-interface}name")
-                        admin_status = pi.find("{http://xml.juniper.net/junos/18.4R1/junos-interface}admin-status")
-                        if name_elem is not None:
-                            status = "Up" if admin_status is not None and admin_status.text.lower() == "up" else "Down"
-                            ports.append(f"{name_elem.text} ({status})")
-                    if not ports:
-                        ports = ["Unknown"]
-                except:
-                    ports = ["Unknown"]
-
-            # Get protocols
-            protocols = extract_enabled_protocols(m.server_capabilities)
-
-            return ports, protocols
+        with connect(host, port, username, password) as m:
+            return read_ports_and_protocols(m)
 
     except Exception as e:
         print(f"❌ NETCONF Error on {host}: {e}")
-        return ["Unknown"], ["Unknown"] 
\ No newline at end of file
+        return ["Unknown"], ["Unknown"] 
+
+def read_ports_and_protocols(m):
+    """
+    Fetch interface and protocol information over an open NETCONF session.
+    Tries standard IETF, Cisco, and Juniper YANG models for interface discovery.
+
+    Args:
+        m (ncclient.manager.Manager): Connected NETCONF session.
+    Returns:
+        tuple: (list of interfaces, list of protocols)
+    """
+    # One round trip for all interface models
+    try:
+        ports = extract_any_interface_details(m.get(_INTERFACE_FILTER).data_xml)
+    except Exception:
+        # Some devices reject filters naming schemas they do not implement
+        ports = _read_interfaces_per_model(m)
+
+    # Get protocols
+    protocols = extract_enabled_protocols(session_capabilities(m).text)
+
+    return ports, protocols
+
+def _read_interfaces_per_model(m):
+    """
+    Fetch interfaces with one <get> per model (IETF, then Cisco, then Juniper).
+    Used when a device rejects the combined interface filter.
+
+    Args:
+        m (ncclient.manager.Manager): Connected NETCONF session.
+    Returns:
+        list: List of interface names with status.
+    """
+    for ns_tag, tag, subtree in _INTERFACE_MODELS:
+        try:
+            iface_reply = m.get(f"<filter>{subtree}\n</filter>").data_xml
+        except Exception:
+            continue
+        ports = _extract_interfaces(iface_reply, ns_tag, tag)
+        if ports != ["Unknown"]:
+            return ports
+    return ["Unknown"]
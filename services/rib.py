@@ -6,8 +6,114 @@ Provides functions to access, add, and clear RIB entries in the rib_db.sqlite3 d
 Designed for use in multi-vendor, live-updating network environments.
 """
 
+import ipaddress
+import os
 import sqlite3
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional
+
+DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'rib_db.sqlite3'))
+
+# One connection per thread, kept open so SQLite's schema and statement caches survive across calls
+_local = threading.local()
+# The schema is brought up to date once, by whichever thread opens the first connection
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+def _conn() -> sqlite3.Connection:
+    """
+    Get this thread's persistent connection to the RIB database, opening it on first use.
+    The first connection opened in the process also creates or migrates the schema.
+
+    Returns:
+        sqlite3.Connection: Open connection.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA temp_store=MEMORY")
+        _local.conn = conn
+        global _schema_ready
+        if not _schema_ready:
+            with _schema_lock:
+                if not _schema_ready:
+                    _init_schema(conn)
+                    _schema_ready = True
+    return conn
+
+def close_connection(exc: Optional[BaseException] = None) -> None:
+    """
+    Close this thread's RIB database connection, if it has one.
+    Long-lived worker threads call this when done with the RIB; the Flask app calls it on
+    app-context teardown. The next call on the thread opens a fresh connection.
+
+    Args:
+        exc (BaseException): Ignored; accepted so this can be registered as a teardown handler.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        _local.conn = None
+        conn.close()
+
+def _ip_to_int(router_ip: str) -> Optional[int]:
+    """
+    Convert a router IP to the integer form stored in router_ip_int.
+
+    Args:
+        router_ip (str): Router's IP address.
+    Returns:
+        int or None: IPv4 address as an integer, or None if it is not a valid IPv4 address.
+    """
+    try:
+        return int(ipaddress.IPv4Address(router_ip))
+    except (ipaddress.AddressValueError, ValueError, TypeError):
+        return None
+
+def init_db() -> None:
+    """
+    Create the rib_entries table and its lookup index if they do not exist.
+    Runs automatically on the first connection; call it to set up the database explicitly.
+    """
+    _init_schema(_conn())
+
+def _init_schema(conn: sqlite3.Connection) -> None:
+    """
+    Create or migrate the rib_entries schema on conn.
+    Lookups go through router_ip_int, the router IP as a fixed-width integer; the index on it
+    covers every column get_rib_entries reads, so lookups never touch the table itself.
+    Tables created before router_ip_int existed get the column added and backfilled.
+
+    Args:
+        conn (sqlite3.Connection): Open connection to the RIB database.
+    """
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rib_entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                router_ip TEXT,
+                destination TEXT,
+                next_hop TEXT,
+                interface TEXT,
+                protocol TEXT,
+                metric INTEGER,
+                router_ip_int INTEGER
+            )
+        """)
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(rib_entries)")}
+        if 'router_ip_int' not in columns:
+            conn.execute("ALTER TABLE rib_entries ADD COLUMN router_ip_int INTEGER")
+            rows = conn.execute("SELECT id, router_ip FROM rib_entries").fetchall()
+            conn.executemany(
+                "UPDATE rib_entries SET router_ip_int = ? WHERE id = ?",
+                [(_ip_to_int(row['router_ip']), row['id']) for row in rows]
+            )
+        # Superseded by the integer index below
+        conn.execute("DROP INDEX IF EXISTS idx_rib_router")
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_rib_router_int
+            ON rib_entries (router_ip_int, destination, next_hop, interface, protocol, metric)
+        """)
 
 def get_rib_entries(router_ip: str) -> List[Dict[str, Any]]:
     """
@@ -19,24 +125,63 @@ def get_rib_entries(router_ip: str) -> List[Dict[str, Any]]:
         list: List of RIB entries with their details (destination, next_hop, interface, protocol, metric).
     """
     try:
-        conn = sqlite3.connect('rib_db.sqlite3')
+        conn = _conn()
         cursor = conn.cursor()
-        cursor.execute("""
+        router_ip_int = _ip_to_int(router_ip)
+        if router_ip_int is not None:
+            cursor.execute("""
+                SELECT destination, next_hop, interface, protocol, metric
+                FROM rib_entries
+                WHERE router_ip_int = ?
+            """, (router_ip_int,))
+        else:
+            cursor.execute("""
+                SELECT destination, next_hop, interface, protocol, metric
+                FROM rib_entries
+                WHERE router_ip = ?
+            """, (router_ip,))
+        return [dict(row) for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return []
+    except Exception as e:
+        print(f"Error: {e}")
+        return []
+
+def get_rib_entries_filtered(router_ip: str, dest_substr: Optional[str] = None,
+                             protocols: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Get a router's RIB entries matching a destination substring and/or protocol list.
+    The filtering runs in SQLite over the router_ip_int index, so only matching rows reach Python.
+
+    Args:
+        router_ip (str): Router's IP address.
+        dest_substr (str): Only entries whose destination contains this text (any, if None).
+        protocols (list): Only entries whose protocol is one of these, compared case-insensitively (any, if None).
+    Returns:
+        list: Matching RIB entries (destination, next_hop, interface, protocol, metric).
+    """
+    try:
+        router_ip_int = _ip_to_int(router_ip)
+        if router_ip_int is not None:
+            clauses, params = ["router_ip_int = ?"], [router_ip_int]
+        else:
+            clauses, params = ["router_ip = ?"], [router_ip]
+        if dest_substr is not None:
+            # instr() is a literal, case-sensitive substring test, like Python's `in`
+            clauses.append("instr(destination, ?) > 0")
+            params.append(dest_substr)
+        if protocols is not None:
+            if not protocols:
+                return []
+            clauses.append(f"lower(protocol) IN ({', '.join('?' * len(protocols))})")
+            params.extend(protocol.lower() for protocol in protocols)
+        cursor = _conn().execute(f"""
             SELECT destination, next_hop, interface, protocol, metric
             FROM rib_entries
-            WHERE router_ip = ?
-        """, (router_ip,))
-        entries = []
-        for row in cursor.fetchall():
-            entries.append({
-                'destination': row[0],
-                'next_hop': row[1],
-                'interface': row[2],
-                'protocol': row[3],
-                'metric': row[4]
-            })
-        conn.close()
-        return entries
+            WHERE {' AND '.join(clauses)}
+        """, params)
+        return [dict(row) for row in cursor.fetchall()]
     except sqlite3.Error as e:
         print(f"Database error: {e}")
         return []
@@ -47,6 +192,7 @@ def get_rib_entries(router_ip: str) -> List[Dict[str, Any]]:
 def add_rib_entry(router_ip: str, entry: Dict[str, Any]) -> bool:
     """
     Add a new RIB entry for a router.
+    Callers inserting many entries should use add_rib_entries, which commits once for the whole batch.
 
     Args:
         router_ip (str): Router's IP address.
@@ -54,23 +200,39 @@ def add_rib_entry(router_ip: str, entry: Dict[str, Any]) -> bool:
     Returns:
         bool: True if successful, False otherwise.
     """
+    return add_rib_entries(router_ip, [entry])
+
+def add_rib_entries(router_ip: str, entries: List[Dict[str, Any]]) -> bool:
+    """
+    Add several RIB entries for a router in a single transaction.
+
+    Args:
+        router_ip (str): Router's IP address.
+        entries (list): RIB entry dicts (destination, next_hop, interface, protocol, metric).
+    Returns:
+        bool: True if successful (all entries written), False otherwise (none written).
+    """
     try:
-        conn = sqlite3.connect('rib_db.sqlite3')
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO rib_entries (
-                router_ip, destination, next_hop, interface, protocol, metric
-            ) VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            router_ip,
-            entry.get('destination'),
-            entry.get('next_hop'),
-            entry.get('interface'),
-            entry.get('protocol'),
-            entry.get('metric')
-        ))
-        conn.commit()
-        conn.close()
+        conn = _conn()
+        router_ip_int = _ip_to_int(router_ip)
+        # Commits on success, rolls back on error so the shared connection is never left mid-transaction
+        with conn:
+            conn.executemany("""
+                INSERT INTO rib_entries (
+                    router_ip, router_ip_int, destination, next_hop, interface, protocol, metric
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    router_ip,
+                    router_ip_int,
+                    entry.get('destination'),
+                    entry.get('next_hop'),
+                    entry.get('interface'),
+                    entry.get('protocol'),
+                    entry.get('metric')
+                )
+                for entry in entries
+            ])
         return True
     except sqlite3.Error as e:
         print(f"Database error: {e}")
@@ -89,15 +251,18 @@ def clear_rib_entries(router_ip: str) -> bool:
         bool: True if successful, False otherwise.
     """
     try:
-        conn = sqlite3.connect('rib_db.sqlite3')
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM rib_entries WHERE router_ip = ?", (router_ip,))
-        conn.commit()
-        conn.close()
+        conn = _conn()
+        with conn:
+            router_ip_int = _ip_to_int(router_ip)
+            if router_ip_int is not None:
+                conn.execute("DELETE FROM rib_entries WHERE router_ip_int = ?", (router_ip_int,))
+            else:
+                conn.execute("DELETE FROM rib_entries WHERE router_ip = ?", (router_ip,))
         return True
     except sqlite3.Error as e:
         print(f"Database error: {e}")
         return False
     except Exception as e:
         print(f"Error: {e}")
-        return False 
\ No newline at end of file
+        return False
+
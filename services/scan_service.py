@@ -10,6 +10,7 @@ import os
 #sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../day17/modules')))
 from subnet_parser import SubnetParser
 from iipinger import IPPinger
+from async_pinger import ping_range
 from live_ip_detector import LiveIPDetector
 
 def get_alive_ips(ip, cidr):
@@ -27,10 +28,13 @@ def get_alive_ips(ip, cidr):
     subnet_result = parser.parse_subnet(cidr)
     if not subnet_result['is_valid']:
         return []
-    host_ips = subnet_result['host_ips']
-    # Ping all IPs in subnet
-    pinger = IPPinger(timeout=1.5)
-    ping_results = pinger.ping_subnet(host_ips)
+    # Ping all IPs in subnet from one event loop; the subprocess pinger is the fallback
+    # when this process may not open an ICMP socket
+    try:
+        ping_results = ping_range(subnet_result['host_ips_int'], timeout=1.5)
+    except PermissionError:
+        pinger = IPPinger(timeout=1.5)
+        ping_results = pinger.ping_subnet(subnet_result['host_ips'].materialize())
     # Confirm live IPs
     detector = LiveIPDetector(timeout=2.0)
     detection_results = detector.confirm_live_ips(ping_results)
@@ -9,7 +9,124 @@ Author: IP Scanner Automation System
 """
 
 import ipaddress
-from typing import List, Dict, Optional
+from collections.abc import Sequence
+from itertools import chain
+from socket import inet_ntoa
+from struct import Struct
+from typing import Iterator, List, Dict, Optional
+
+
+# Decimal strings for every octet value, reused when formatting host IPs
+_OCTETS = tuple(str(i) for i in range(256))
+
+# Packs an integer address into the 4 network-order bytes inet_ntoa expects
+_PACK_IPV4 = Struct(">I").pack
+
+
+def _host_range(network: ipaddress.IPv4Network) -> range:
+    """
+    Returns the usable host addresses of a network as a range of integers.
+    
+    Matches IPv4Network.hosts(): /31 and /32 networks have no separate
+    network/broadcast address, so every address is a host.
+    
+    Args:
+        network (IPv4Network): Parsed network
+        
+    Returns:
+        range: Host addresses as integers
+    """
+    first = int(network.network_address)
+    last = int(network.broadcast_address)
+    if network.prefixlen >= 31:
+        return range(first, last + 1)
+    return range(first + 1, last)
+
+
+def _iter_host_blocks(host_ints: range) -> Iterator[List[str]]:
+    """
+    Converts a contiguous range of integer addresses to dotted-quad strings,
+    one /24 block at a time.
+    
+    The first three octets are formatted once per block and the last octet
+    comes from a precomputed table, so no IPv4Address objects are created.
+    
+    Args:
+        host_ints (range): Contiguous integer addresses
+        
+    Yields:
+        List[str]: Host IP addresses of one /24 block
+    """
+    start, stop = host_ints.start, host_ints.stop
+    while start < stop:
+        block_end = min((start | 0xFF) + 1, stop)
+        prefix = f"{start >> 24}.{(start >> 16) & 0xFF}.{(start >> 8) & 0xFF}."
+        yield [prefix + _OCTETS[i & 0xFF] for i in range(start, block_end)]
+        start = block_end
+
+
+def _format_host_ips(host_ints: range) -> List[str]:
+    """
+    Converts a contiguous range of integer addresses to dotted-quad strings.
+    
+    Args:
+        host_ints (range): Contiguous integer addresses
+        
+    Returns:
+        List[str]: Host IP addresses as strings
+    """
+    host_ips = []
+    for block in _iter_host_blocks(host_ints):
+        host_ips.extend(block)
+    return host_ips
+
+
+class _HostIPs(Sequence):
+    """
+    Lazy, read-only list of host IP strings backed by an integer range.
+    
+    Length and indexing come straight from the range; strings are only
+    formatted when iterated, and the full list is built (and kept) only
+    when materialize() is called.
+    """
+    
+    __slots__ = ('ints', '_ips')
+    
+    def __init__(self, host_ints: range):
+        self.ints = host_ints
+        self._ips = None
+    
+    def __len__(self) -> int:
+        return len(self.ints)
+    
+    def __iter__(self) -> Iterator[str]:
+        if self._ips is not None:
+            return iter(self._ips)
+        return chain.from_iterable(_iter_host_blocks(self.ints))
+    
+    def __getitem__(self, index):
+        if self._ips is not None:
+            return self._ips[index]
+        if isinstance(index, slice):
+            ints = self.ints[index]
+            if ints.step == 1:
+                return _format_host_ips(ints)
+            return [inet_ntoa(_PACK_IPV4(i)) for i in ints]
+        return inet_ntoa(_PACK_IPV4(self.ints[index]))
+    
+    def __repr__(self) -> str:
+        return f"_HostIPs({len(self)} hosts)"
+    
+    def materialize(self) -> List[str]:
+        """
+        Returns the host IPs as a list, formatting them on first use.
+        
+        Returns:
+            List[str]: Host IP addresses as strings
+        """
+        if self._ips is None:
+            self._ips = _format_host_ips(self.ints)
+        return self._ips
 
 
 class SubnetParser:
@@ -32,10 +149,15 @@ class SubnetParser:
             # Parse the network
             network = ipaddress.IPv4Network(subnet, strict=False)
             
-            # Generate list of host IPs (excluding network and broadcast)
-            host_ips = []
-            for ip in network.hosts():
-                host_ips.append(str(ip))
+            # Reuse an earlier expansion of the same network, however it was spelled
+            key = network.with_prefixlen
+            cached = self.parsed_subnets.get(key)
+            if cached is not None:
+                return cached if cached['subnet'] == subnet else {**cached, 'subnet': subnet}
+            
+            # Host IPs (excluding network and broadcast), formatted only when iterated
+            host_ips_int = _host_range(network)
+            host_ips = _HostIPs(host_ips_int)
             
             # Calculate network information
             network_info = {
@@ -52,13 +174,14 @@ class SubnetParser:
             result = {
                 'subnet': subnet,
                 'host_ips': host_ips,
+                'host_ips_int': host_ips_int,
                 'network_info': network_info,
                 'is_valid': True,
                 'error': None
             }
             
-            # Store for caching
-            self.parsed_subnets[subnet] = result
+            # Store for caching, keyed by the canonical network
+            self.parsed_subnets[key] = result
             
             return result
             
@@ -66,6 +189,7 @@ class SubnetParser:
             return {
                 'subnet': subnet,
                 'host_ips': [],
+                'host_ips_int': range(0),
                 'network_info': None,
                 'is_valid': False,
                 'error': str(e)
@@ -82,7 +206,7 @@ class SubnetParser:
             List[str]: List of host IP addresses
         """
         result = self.parse_subnet(subnet)
-        return result['host_ips'] if result['is_valid'] else []
+        return result['host_ips'].materialize() if result['is_valid'] else []
     
     def parse_multiple_subnets(self, subnets: List[str]) -> Dict[str, Dict]:
         """
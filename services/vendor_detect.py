@@ -1,30 +1,23 @@
-from ncclient import manager
+from services.netconf_session import connect, session_capabilities
+
+# Checked in order; the first keyword found in the capabilities decides
+_VENDOR_KEYS = (
+    ('cisco', 'Cisco'),
+    ('arista', 'Arista'),
+    ('juniper', 'Juniper'),
+    ('huawei', 'Huawei'),
+    ('nokia', 'Nokia'),
+)
 
 def detect_vendor_via_netconf(ip, username='admin', password='admin', port=830):
     try:
-        with manager.connect(
-            host=ip,
-            port=port,
-            username=username,
-            password=password,
-            hostkey_verify=False,
-            allow_agent=False,
-            look_for_keys=False,
-            timeout=5
-        ) as m:
-            caps = "\n".join(m.server_capabilities)
-            if 'cisco' in caps.lower():
-                return 'Cisco'
-            elif 'arista' in caps.lower():
-                return 'Arista'
-            elif 'juniper' in caps.lower():
-                return 'Juniper'
-            elif 'huawei' in caps.lower():
-                return 'Huawei'
-            elif 'nokia' in caps.lower():
-                return 'Nokia'
-            else:
-                return 'Unknown'
+        with connect(ip, port, username, password, timeout=5) as m:
+            # Lowercased capabilities are shared with other checks on this session
+            caps = session_capabilities(m).lower
+            for key, name in _VENDOR_KEYS:
+                if key in caps:
+                    return name
+            return 'Unknown'
     except Exception as e:
         print(f"NETCONF vendor detection failed for {ip}: {e}")
         return 'Unknown' 
\ No newline at end of file
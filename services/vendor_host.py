@@ -6,12 +6,58 @@ Provides functions to detect vendor, fetch hostname, software version, and statu
 Supports Cisco, Juniper, Arista, and can be extended for other vendors.
 """
 
+import asyncio
+import logging
+import re
 import socket
-from ncclient import manager
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from services.live_ip_detector import tcp_connect_batch
+from services.netconf_session import connect, pipeline_rpcs, session_capabilities
 from ncclient.xml_ import to_ele
+from lxml import etree
 from xml.dom.minidom import parseString
 import xml.etree.ElementTree as ET
 
+logger = logging.getLogger(__name__)
+
+# Capability/namespace keyword -> vendor
+_VENDOR_NAMES = {
+    "cisco": "Cisco",
+    "juniper": "Juniper",
+    "nokia": "Nokia",
+    "alcatel": "Nokia",
+    "huawei": "Huawei",
+    "arista": "Arista",
+}
+# One case-insensitive scan per string instead of lower() plus a substring check per vendor
+_VENDOR_RE = re.compile("|".join(_VENDOR_NAMES), re.IGNORECASE)
+# Vendors read_device_info has queries for
+_SESSION_VENDOR_RE = re.compile("cisco|juniper|arista", re.IGNORECASE)
+
+# (host, port) -> (capabilities hash, vendor) from an earlier session, so repeated polls skip the
+# capability scan; a device that answers with different capabilities (re-addressed or replaced)
+# misses and is detected again
+_VENDOR_CACHE = {}
+_VENDOR_CACHE_LOCK = threading.Lock()
+# Entries kept before the oldest is dropped
+_VENDOR_CACHE_MAX = 4096
+
+# Hostname/version lookups compiled once; each returns the text of the first match (or [])
+_CISCO_NS = {"n": "http://cisco.com/ns/yang/Cisco-IOS-XE-native"}
+_CISCO_HOSTNAME = etree.XPath("((.//n:native)[1]//n:hostname)[1]/text()", namespaces=_CISCO_NS)
+_CISCO_VERSION = etree.XPath("((.//n:native)[1]//n:version)[1]/text()", namespaces=_CISCO_NS)
+_OC_SYSTEM_NS = {"s": "http://openconfig.net/yang/system"}
+_ARISTA_HOSTNAME = etree.XPath("((.//s:state)[1]//s:hostname)[1]/text()", namespaces=_OC_SYSTEM_NS)
+_ARISTA_VERSION = etree.XPath("((.//s:state)[1]//s:software-version)[1]/text()", namespaces=_OC_SYSTEM_NS)
+
+# Upper bound on devices probed at once; also keeps open sockets well under the default fd limit
+MAX_DEVICE_WORKERS = 64
+
+# Connects kept in flight at once by probe_ports
+_PROBE_BATCH = 512
+
 def is_port_open(host, port, timeout=2):
     """
     Check if a TCP port is open on a given host.
@@ -28,6 +74,23 @@ def is_port_open(host, port, timeout=2):
     except Exception:
         return False
 
+def probe_ports(hosts, port, timeout=2):
+    """
+    Check a TCP port on many hosts at once with non-blocking connects.
+    All connects in a batch share one timeout, so N unreachable hosts cost about one timeout, not N.
+    Args:
+        hosts (list): IP addresses.
+        port (int): TCP port number.
+        timeout (float): Timeout in seconds for each batch of connects.
+    Returns:
+        dict: Host -> True if the port accepted the connection, False otherwise.
+    """
+    results = {host: False for host in hosts}
+    pending = list(results)
+    for start in range(0, len(pending), _PROBE_BATCH):
+        tcp_connect_batch(pending[start:start + _PROBE_BATCH], [port], timeout, results)
+    return results
+
 def extract_vendor_name(text):
     """
     Extract vendor name from a capability string or namespace.
@@ -38,20 +101,10 @@ def extract_vendor_name(text):
     """
     if not text:
         return None
-    text = text.lower()
-    if "cisco" in text:
-        return "Cisco"
-    elif "juniper" in text:
-        return "Juniper"
-    elif "nokia" in text or "alcatel" in text:
-        return "Nokia"
-    elif "huawei" in text:
-        return "Huawei"
-    elif "arista" in text:
-        return "Arista"
-    return None
-
-def get_device_info(host, port, username, password):
+    match = _VENDOR_RE.search(text)
+    return _VENDOR_NAMES[match.group().lower()] if match else None
+
+def get_device_info(host, port, username, password, pool=None, connect_timeout=None, rpc_timeout=10):
     """
     Connect to a device via NETCONF and fetch hostname, software version, vendor, and status.
     Supports Cisco, Juniper, Arista. Extend for more vendors as needed.
@@ -60,145 +113,221 @@ def get_device_info(host, port, username, password):
         port (int): NETCONF port.
         username (str): NETCONF username.
         password (str): NETCONF password.
+        pool (NetconfPool): Session pool to borrow from instead of opening a new session, if any.
+        connect_timeout (float): Seconds allowed to reach the device and finish the handshake
+            (default: fail the TCP connect after CONNECT_TIMEOUT, handshake within rpc_timeout).
+        rpc_timeout (int): Seconds to wait for each RPC reply.
     Returns:
         tuple: (hostname, software_version, vendor, status)
     """
-    if not is_port_open(host, port):
-        return "Unknown", "Unknown", "Unknown", "Not Enabled (No NETCONF)"
+    # No separate port probe: connect() fails fast when nothing answers on the NETCONF port
     try:
-        with manager.connect(
-            host=host,
-            port=port,
-            username=username,
-            password=password,
-            hostkey_verify=False,
-            allow_agent=False,
-            look_for_keys=False,
-            timeout=10
-        ) as m:
-            print(f"\nDebug: Connected to {host}")
-            print("Debug: Server capabilities:")
-            for cap in m.server_capabilities:
-                print(f"  {cap}")
-
-            hostname = "Unknown"
-            vendor = "Unknown"
-            software_version = "Unknown"
-
-            # Detect vendor first to use vendor-specific queries
-            for capability in m.server_capabilities:
-                if "cisco" in capability.lower():
-                    vendor = "Cisco"
-                    break
-                elif "juniper" in capability.lower():
-                    vendor = "Juniper"
-                    break
-                elif "arista" in capability.lower():
-                    vendor = "Arista"
-                    break
-
-            print(f"\nDebug: Detected vendor: {vendor}")
-
-            if vendor == "Cisco":
-                print("\nDebug: Trying Cisco IOS-XE hostname and version...")
-                filter_str = '''
-                    <native xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-native">
-                        <version/>
-                        <hostname/>
-                    </native>
-                '''
-                reply = m.get(filter=('subtree', filter_str))
-                print(f"Debug: Cisco reply XML:\n{reply.xml}")
-                
-                if reply is not None:
-                    native = reply.data.find(".//{http://cisco.com/ns/yang/Cisco-IOS-XE-native}native")
-                    if native is not None:
-                        hostname_elem = native.find(".//{http://cisco.com/ns/yang/Cisco-IOS-XE-native}hostname")
-                        version_elem = native.find(".//{http://cisco.com/ns/yang/Cisco-IOS-XE-native}version")
-                        
-                        if hostname_elem is not None and hostname_elem.text:
-                            hostname = hostname_elem.text
-                        if version_elem is not None and version_elem.text:
-                            software_version = version_elem.text
-
-            elif vendor == "Juniper":
-                print("\nDebug: Trying Juniper configuration...")
-                try:
-                    # First try to get hostname using configuration data
-                    hostname_filter = '''
-                        <configuration xmlns="http://xml.juniper.net/xnm/1.1/xnm">
-                            <system>
-                                <host-name/>
-                            </system>
-                        </configuration>
-                    '''
-                    reply = m.get_config(source='running', filter=('subtree', hostname_filter))
-                    print(f"Debug: Juniper hostname reply XML:\n{reply.xml}")
-                    
-                    if reply is not None:
-                        system = reply.data.find(".//system")
-                        if system is not None:
-                            hostname_elem = system.find(".//host-name")
-                            if hostname_elem is not None and hostname_elem.text:
-                                hostname = hostname_elem.text
-                    
-                    # Then try to get version using get-software-information RPC
-                    version_rpc = '''
-                        <get-software-information>
-                            <brief/>
-                        </get-software-information>
-                    '''
-                    reply = m.rpc(to_ele(version_rpc))
-                    print(f"Debug: Juniper version reply XML:\n{reply.xml}")
-                    
-                    if reply is not None:
-                        # Parse the version information from the XML string
-                        reply_str = reply.xml
-                        if "<junos-version>" in reply_str:
-                            start = reply_str.find("<junos-version>") + len("<junos-version>")
-                            end = reply_str.find("</junos-version>")
-                            if start > -1 and end > -1:
-                                software_version = reply_str[start:end].strip()
-                
-                except Exception as e:
-                    print(f"Debug: Juniper query failed: {str(e)}")
-
-            elif vendor == "Arista":
-                print("\nDebug: Trying Arista configuration...")
-                try:
-                    system_filter = '''
-                        <system xmlns="http://openconfig.net/yang/system">
-                            <state>
-                                <hostname/>
-                                <software-version/>
-                            </state>
-                        </system>
-                    '''
-                    reply = m.get(filter=('subtree', system_filter))
-                    print(f"Debug: Arista system reply XML:\n{reply.xml}")
-                    
-                    if reply is not None:
-                        system = reply.data.find(".//{http://openconfig.net/yang/system}state")
-                        if system is not None:
-                            hostname_elem = system.find(".//{http://openconfig.net/yang/system}hostname")
-                            version_elem = system.find(".//{http://openconfig.net/yang/system}software-version")
-                            
-                            if hostname_elem is not None and hostname_elem.text:
-                                hostname = hostname_elem.text
-                            if version_elem is not None and version_elem.text:
-                                software_version = version_elem.text
-                except Exception as e:
-                    print(f"Debug: Arista query failed: {str(e)}")
-
-            status = "Enabled and Connected" if hostname != "Unknown" else "Enabled (Hostname Unavailable)"
-            print(f"\nDebug: Final results for {host}:")
-            print(f"  Hostname: {hostname}")
-            print(f"  Software Version: {software_version}")
-            print(f"  Vendor: {vendor}")
-            print(f"  Status: {status}")
-            
-            return hostname, software_version, vendor, status
+        opener = pool.acquire if pool is not None else connect
+        with ExitStack() as stack:
+            try:
+                m = stack.enter_context(
+                    opener(host, port, username, password, timeout=rpc_timeout, connect_timeout=connect_timeout)
+                )
+            except OSError:
+                # Nothing reachable on the NETCONF port; failures once the session is open are errors
+                return "Unknown", "Unknown", "Unknown", "Not Enabled (No NETCONF)"
+            return read_device_info(m, host, port)
 
     except Exception as e:
         print(f"Error connecting to {host}: {str(e)}")
-        return "Unknown", "Unknown", "Unknown", f"Error: {str(e)}" 
\ No newline at end of file
+        return "Unknown", "Unknown", "Unknown", f"Error: {str(e)}" 
+
+def get_device_info_many(devices, max_workers=MAX_DEVICE_WORKERS):
+    """
+    Fetch device info for several devices concurrently on a thread pool.
+    Args:
+        devices (list): Dicts with 'host', 'port', 'username', 'password'.
+        max_workers (int): Maximum number of devices probed at the same time.
+    Returns:
+        list: (hostname, software_version, vendor, status) tuples, in the order of devices.
+    """
+    if not devices:
+        return []
+    workers = max(1, min(max_workers, len(devices)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda device: get_device_info(**device), devices))
+
+async def get_device_info_async(host, port, username, password, connect_timeout=None, rpc_timeout=10):
+    """
+    Awaitable get_device_info; the blocking NETCONF calls run in a worker thread.
+    Args:
+        host (str): Device IP address.
+        port (int): NETCONF port.
+        username (str): NETCONF username.
+        password (str): NETCONF password.
+        connect_timeout (float): Seconds allowed to reach the device and finish the handshake.
+        rpc_timeout (int): Seconds to wait for each RPC reply.
+    Returns:
+        tuple: (hostname, software_version, vendor, status)
+    """
+    return await asyncio.to_thread(
+        get_device_info, host, port, username, password,
+        connect_timeout=connect_timeout, rpc_timeout=rpc_timeout
+    )
+
+async def gather_devices(devices, limit=MAX_DEVICE_WORKERS):
+    """
+    Fetch device info for several devices concurrently from an event loop.
+    Args:
+        devices (list): Dicts with 'host', 'port', 'username', 'password'.
+        limit (int): Maximum number of devices probed at the same time.
+    Returns:
+        list: Result tuple (or raised exception) per device, in the order of devices.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def probe(device):
+        async with semaphore:
+            return await get_device_info_async(**device)
+
+    return await asyncio.gather(*(probe(device) for device in devices), return_exceptions=True)
+
+def detect_vendor(capabilities):
+    """
+    Detect the vendor from NETCONF server capabilities in a single pass.
+    The first capability naming a known vendor decides.
+    Args:
+        capabilities (iterable or str): NETCONF server capabilities, or them joined by newlines.
+    Returns:
+        str: Vendor name, or "Unknown".
+    """
+    if not isinstance(capabilities, str):
+        capabilities = "\n".join(capabilities)
+    match = _SESSION_VENDOR_RE.search(capabilities)
+    return _VENDOR_NAMES[match.group().lower()] if match else "Unknown"
+
+def read_device_info(m, host, port=830):
+    """
+    Fetch hostname, software version, vendor, and status over an open NETCONF session.
+    Args:
+        m (ncclient.manager.Manager): Connected NETCONF session.
+        host (str): Device IP address (used for log messages and the vendor cache).
+        port (int): NETCONF port (part of the vendor cache key).
+    Returns:
+        tuple: (hostname, software_version, vendor, status)
+    """
+    caps = session_capabilities(m)
+    logger.debug("Connected to %s", host)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Server capabilities for %s:\n  %s", host, "\n  ".join(caps.uris))
+
+    hostname = "Unknown"
+    software_version = "Unknown"
+
+    # Detect vendor first to use vendor-specific queries; a known device skips the capability scan
+    caps_hash = hash(caps.text)
+    with _VENDOR_CACHE_LOCK:
+        cached = _VENDOR_CACHE.get((host, port))
+    if cached is not None and cached[0] == caps_hash:
+        vendor = cached[1]
+    else:
+        vendor = detect_vendor(caps.text)
+        with _VENDOR_CACHE_LOCK:
+            _VENDOR_CACHE.pop((host, port), None)
+            if vendor != "Unknown":
+                if len(_VENDOR_CACHE) >= _VENDOR_CACHE_MAX:
+                    del _VENDOR_CACHE[next(iter(_VENDOR_CACHE))]
+                _VENDOR_CACHE[(host, port)] = (caps_hash, vendor)
+
+    logger.debug("Detected vendor for %s: %s", host, vendor)
+
+    if vendor == "Cisco":
+        logger.debug("Trying Cisco IOS-XE hostname and version...")
+        filter_str = '''
+            <native xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-native">
+                <version/>
+                <hostname/>
+            </native>
+        '''
+        reply = m.get(filter=('subtree', filter_str))
+        logger.debug("Cisco reply XML:\n%s", reply.xml)
+
+        if reply is not None:
+            hostname_text = _CISCO_HOSTNAME(reply.data)
+            version_text = _CISCO_VERSION(reply.data)
+            if hostname_text:
+                hostname = hostname_text[0]
+            if version_text:
+                software_version = version_text[0]
+
+    elif vendor == "Juniper":
+        logger.debug("Trying Juniper configuration...")
+        try:
+            # Hostname from configuration data, version from get-software-information;
+            # both requests go out before either reply is read
+            hostname_filter = '''
+                <configuration xmlns="http://xml.juniper.net/xnm/1.1/xnm">
+                    <system>
+                        <host-name/>
+                    </system>
+                </configuration>
+            '''
+            version_rpc = '''
+                <get-software-information>
+                    <brief/>
+                </get-software-information>
+            '''
+            hostname_reply, reply = pipeline_rpcs(
+                m,
+                lambda: m.get_config(source='running', filter=('subtree', hostname_filter)),
+                lambda: m.rpc(to_ele(version_rpc)),
+                return_exceptions=True,
+            )
+
+            if isinstance(hostname_reply, Exception):
+                logger.debug("Juniper hostname query failed: %s", hostname_reply)
+            else:
+                logger.debug("Juniper hostname reply XML:\n%s", hostname_reply.xml)
+                hostname = hostname_reply.data.findtext(".//system//host-name") or hostname
+
+            if isinstance(reply, Exception):
+                logger.debug("Juniper version query failed: %s", reply)
+            else:
+                logger.debug("Juniper version reply XML:\n%s", reply.xml)
+                # Parse the version information from the XML string
+                reply_str = reply.xml
+                if "<junos-version>" in reply_str:
+                    start = reply_str.find("<junos-version>") + len("<junos-version>")
+                    end = reply_str.find("</junos-version>")
+                    if start > -1 and end > -1:
+                        software_version = reply_str[start:end].strip()
+
+        except Exception as e:
+            logger.debug("Juniper query failed: %s", e)
+
+    elif vendor == "Arista":
+        logger.debug("Trying Arista configuration...")
+        try:
+            system_filter = '''
+                <system xmlns="http://openconfig.net/yang/system">
+                    <state>
+                        <hostname/>
+                        <software-version/>
+                    </state>
+                </system>
+            '''
+            reply = m.get(filter=('subtree', system_filter))
+            logger.debug("Arista system reply XML:\n%s", reply.xml)
+
+            if reply is not None:
+                hostname_text = _ARISTA_HOSTNAME(reply.data)
+                version_text = _ARISTA_VERSION(reply.data)
+                if hostname_text:
+                    hostname = hostname_text[0]
+                if version_text:
+                    software_version = version_text[0]
+        except Exception as e:
+            logger.debug("Arista query failed: %s", e)
+
+    status = "Enabled and Connected" if hostname != "Unknown" else "Enabled (Hostname Unavailable)"
+    logger.debug(
+        "Final results for %s: hostname=%s, software_version=%s, vendor=%s, status=%s",
+        host, hostname, software_version, vendor, status
+    )
+
+    return hostname, software_version, vendor, status
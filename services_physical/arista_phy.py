@@ -1,103 +1,174 @@
-import xml.etree.ElementTree as ET
-from prettytable import PrettyTable
+import logging
+import re
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# XPath queries compiled once at import; each returns the matching text values
+_OC_NS = {
+    'oc-platform': 'http://openconfig.net/yang/platform',
+    'oc-if': 'http://openconfig.net/yang/interfaces',
+    'oc-eth': 'http://openconfig.net/yang/interfaces/ethernet',
+    'oc-ip': 'http://openconfig.net/yang/interfaces/ip'
+}
+_OC_INTERFACES = etree.XPath(".//oc-if:interface", namespaces=_OC_NS)
+_OC_NAME = etree.XPath("oc-if:name/text()", namespaces=_OC_NS)
+_OC_OPER_STATUS = etree.XPath(".//oc-if:state/oc-if:oper-status/text()", namespaces=_OC_NS)
+_OC_ADMIN_STATUS = etree.XPath(".//oc-if:state/oc-if:admin-status/text()", namespaces=_OC_NS)
+_OC_PORT_SPEED = etree.XPath(".//oc-eth:state/oc-eth:port-speed/text()", namespaces=_OC_NS)
+_OC_NEGOTIATED_SPEED = etree.XPath(".//oc-eth:state/oc-eth:negotiated-port-speed/text()", namespaces=_OC_NS)
+_OC_IP = etree.XPath(".//oc-ip:address/oc-ip:ip/text()", namespaces=_OC_NS)
+_OC_HW_PORT = etree.XPath(".//oc-if:state/oc-platform:hardware-port/text()", namespaces=_OC_NS)
+_OC_COMPONENT_NAME = etree.XPath("oc-platform:name/text()", namespaces=_OC_NS)
+_OC_COMPONENT_DESC = etree.XPath(".//oc-platform:state/oc-platform:description/text()", namespaces=_OC_NS)
+
+_EOS_NS = {'ar-intf': 'http://arista.com/yang/arista-intf'}
+_EOS_INTERFACES = etree.XPath(".//ar-intf:interface", namespaces=_EOS_NS)
+_EOS_NAME = etree.XPath("ar-intf:name/text()", namespaces=_EOS_NS)
+_EOS_STATUS = (
+    etree.XPath(".//ar-intf:interfaceStatus/ar-intf:linkStatus/text()", namespaces=_EOS_NS),
+    etree.XPath(".//ar-intf:linkStatus/text()", namespaces=_EOS_NS),
+    etree.XPath(".//ar-intf:oper-status/text()", namespaces=_EOS_NS),
+)
+_EOS_BANDWIDTH = etree.XPath("ar-intf:bandwidth/text()", namespaces=_EOS_NS)
+
+def _first(values):
+    """Return the first text value from an XPath result, or None if there is none"""
+    return values[0] if values else None
+
+# One pass over the speed identity instead of three chained replaces
+_SPEED_RE = re.compile(r"SPEED_|MB|GB")
+_SPEED_SUB = {"SPEED_": "", "MB": "M", "GB": "G"}
+
+def _speed_label(speed):
+    """Shorten an OpenConfig speed identity (e.g. SPEED_10GB -> 10G)"""
+    return _SPEED_RE.sub(lambda match: _SPEED_SUB[match.group()], speed)
 
 def get_physical_inventory(m):
-    """Get physical inventory for Arista devices with multiple fallback methods"""
+    """Get physical inventory for Arista devices with multiple fallback methods.
+
+    Returns a list of row dicts keyed by column name (see utils.render_table), or None.
+    """
     try:
         # Method 1: Try OpenConfig model
         try:
-            print("\nAttempting OpenConfig method...")
+            logger.debug("Attempting OpenConfig method...")
+            # Only the leaves read below; whole <components/> and <interfaces/> trees are
+            # hundreds of KB on a populated chassis
             filter = '''
             <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
-              <components xmlns="http://openconfig.net/yang/platform"/>
-              <interfaces xmlns="http://openconfig.net/yang/interfaces"/>
+              <components xmlns="http://openconfig.net/yang/platform">
+                <component>
+                  <name/>
+                  <state>
+                    <description/>
+                  </state>
+                </component>
+              </components>
+              <interfaces xmlns="http://openconfig.net/yang/interfaces">
+                <interface>
+                  <name/>
+                  <state>
+                    <oper-status/>
+                    <admin-status/>
+                    <hardware-port xmlns="http://openconfig.net/yang/platform"/>
+                  </state>
+                  <ethernet xmlns="http://openconfig.net/yang/interfaces/ethernet">
+                    <state>
+                      <port-speed/>
+                      <negotiated-port-speed/>
+                    </state>
+                  </ethernet>
+                  <subinterfaces>
+                    <subinterface>
+                      <ipv4 xmlns="http://openconfig.net/yang/interfaces/ip">
+                        <addresses>
+                          <address>
+                            <ip/>
+                          </address>
+                        </addresses>
+                      </ipv4>
+                    </subinterface>
+                  </subinterfaces>
+                </interface>
+              </interfaces>
             </filter>
             '''
             result = m.get(filter=filter)
             
-            root = ET.fromstring(result.xml)
-            ns = {
-                'oc-platform': 'http://openconfig.net/yang/platform',
-                'oc-if': 'http://openconfig.net/yang/interfaces',
-                'oc-eth': 'http://openconfig.net/yang/interfaces/ethernet',
-                'oc-ip': 'http://openconfig.net/yang/interfaces/ip'
-            }
+            # ncclient already parsed the reply with lxml; no need to serialize and re-parse it
+            root = result.data_ele
 
-            table = PrettyTable(["Interface", "Type", "Status", "Speed", "IP Address", "Description"])
+            rows = []
+            
+            # Component descriptions by name, collected in one pass (first component with a name wins)
+            desc_by_comp = {}
+            # iterfind walks the components lazily instead of building a list of all of them
+            for comp in root.iterfind(".//oc-platform:component", _OC_NS):
+                comp_name = _first(_OC_COMPONENT_NAME(comp))
+                if comp_name is not None and comp_name not in desc_by_comp:
+                    desc_by_comp[comp_name] = _first(_OC_COMPONENT_DESC(comp)) or ""
             
             # Get interface information
-            interfaces = root.findall(".//oc-if:interface", namespaces=ns)
-            for intf in interfaces:
-                name = intf.find("oc-if:name", namespaces=ns)
-                if name is None or not name.text:
+            for intf in _OC_INTERFACES(root):
+                name = _first(_OC_NAME(intf))
+                if not name:
                     continue
                 
                 # Get operational status
-                oper_status = intf.find(".//oc-if:state/oc-if:oper-status", namespaces=ns)
-                admin_status = intf.find(".//oc-if:state/oc-if:admin-status", namespaces=ns)
+                oper_status = _first(_OC_OPER_STATUS(intf))
+                admin_status = _first(_OC_ADMIN_STATUS(intf))
                 
                 # Get speed information
-                speed = intf.find(".//oc-eth:state/oc-eth:port-speed", namespaces=ns)
-                negotiated_speed = intf.find(".//oc-eth:state/oc-eth:negotiated-port-speed", namespaces=ns)
+                speed = _first(_OC_PORT_SPEED(intf))
+                negotiated_speed = _first(_OC_NEGOTIATED_SPEED(intf))
                 
                 # Get IP address if available
-                ip_address = ""
-                ip_node = intf.find(".//oc-ip:address/oc-ip:ip", namespaces=ns)
-                if ip_node is not None and ip_node.text:
-                    ip_address = ip_node.text
+                ip_address = _first(_OC_IP(intf)) or ""
                 
                 # Get description from hardware port if available
-                description = ""
-                hw_port = intf.find(".//oc-if:state/oc-platform:hardware-port", namespaces=ns)
-                if hw_port is not None and hw_port.text:
-                    # Try to find component with matching name for description
-                    for comp in root.findall(".//oc-platform:component", namespaces=ns):
-                        comp_name = comp.find("oc-platform:name", namespaces=ns)
-                        if comp_name is not None and comp_name.text == hw_port.text:
-                            desc = comp.find(".//oc-platform:state/oc-platform:description", namespaces=ns)
-                            if desc is not None and desc.text:
-                                description = desc.text
-                            break
+                hw_port = _first(_OC_HW_PORT(intf))
+                description = desc_by_comp.get(hw_port, "") if hw_port else ""
                 
                 # Determine status
                 status = "unknown"
-                if admin_status is not None and admin_status.text:
-                    status = "admin down" if admin_status.text.lower() == "down" else oper_status.text.lower() if oper_status is not None else "unknown"
+                if admin_status:
+                    status = "admin down" if admin_status.lower() == "down" else oper_status.lower() if oper_status else "unknown"
                 
                 # Determine speed
                 speed_str = "N/A"
-                if speed is not None and speed.text:
-                    speed_str = speed.text.replace("SPEED_", "").replace("MB", "M").replace("GB", "G")
-                elif negotiated_speed is not None and negotiated_speed.text:
-                    speed_str = negotiated_speed.text.replace("SPEED_", "").replace("MB", "M").replace("GB", "G")
+                if speed:
+                    speed_str = _speed_label(speed)
+                elif negotiated_speed:
+                    speed_str = _speed_label(negotiated_speed)
                 
                 # Determine interface type
                 intf_type = "Other"
-                if "Ethernet" in name.text:
+                if "Ethernet" in name:
                     intf_type = "Ethernet"
-                elif "Management" in name.text:
+                elif "Management" in name:
                     intf_type = "Management"
-                elif "Loopback" in name.text:
+                elif "Loopback" in name:
                     intf_type = "Loopback"
                 
-                table.add_row([
-                    name.text,
-                    intf_type,
-                    status,
-                    speed_str,
-                    ip_address,
-                    description
-                ])
+                rows.append({
+                    "Interface": name,
+                    "Type": intf_type,
+                    "Status": status,
+                    "Speed": speed_str,
+                    "IP Address": ip_address,
+                    "Description": description
+                })
             
-            if len(table._rows) > 0:
-                return table
+            if rows:
+                return rows
             
         except Exception as oc_error:
             print(f"OpenConfig method failed: {str(oc_error)}")
 
         # Method 2: Try Arista's native EOS model
         try:
-            print("\nAttempting Arista EOS native method...")
+            logger.debug("Attempting Arista EOS native method...")
             filter = '''
             <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
               <interfaces xmlns="http://arista.com/yang/arista-intf">
@@ -113,40 +184,40 @@ def get_physical_inventory(m):
             '''
             result = m.get(filter=filter)
             
-            root = ET.fromstring(result.xml)
-            ns = {'ar-intf': 'http://arista.com/yang/arista-intf'}
+            root = result.data_ele
 
-            table = PrettyTable(["Interface", "Status", "Speed"])
+            rows = []
             
-            interfaces = root.findall(".//ar-intf:interface", namespaces=ns)
-            for intf in interfaces:
-                name = intf.find("ar-intf:name", namespaces=ns)
-                if name is None or not name.text:
+            for intf in _EOS_INTERFACES(root):
+                name = _first(_EOS_NAME(intf))
+                if not name:
                     continue
                 
                 # Try different possible locations for status
-                status = (intf.find(".//ar-intf:interfaceStatus/ar-intf:linkStatus", namespaces=ns) or 
-                          intf.find(".//ar-intf:linkStatus", namespaces=ns) or
-                          intf.find(".//ar-intf:oper-status", namespaces=ns))
+                status = None
+                for status_xpath in _EOS_STATUS:
+                    status = _first(status_xpath(intf))
+                    if status:
+                        break
                 
-                bandwidth = intf.find("ar-intf:bandwidth", namespaces=ns)
+                bandwidth = _first(_EOS_BANDWIDTH(intf))
                 
                 speed_str = "N/A"
-                if bandwidth is not None and bandwidth.text:
+                if bandwidth:
                     try:
-                        speed_mbps = int(bandwidth.text) / 1000000
+                        speed_mbps = int(bandwidth) / 1000000
                         speed_str = f"{int(speed_mbps)}M" if speed_mbps < 1000 else f"{int(speed_mbps/1000)}G"
                     except ValueError:
                         pass
                 
-                table.add_row([
-                    name.text,
-                    status.text.lower() if status is not None and status.text else "unknown",
-                    speed_str
-                ])
+                rows.append({
+                    "Interface": name,
+                    "Status": status.lower() if status else "unknown",
+                    "Speed": speed_str
+                })
             
-            if len(table._rows) > 0:
-                return table
+            if rows:
+                return rows
             
         except Exception as eos_error:
             print(f"Arista EOS native method failed: {str(eos_error)}")
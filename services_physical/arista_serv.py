@@ -1,8 +1,8 @@
-from ncclient import manager
 from lxml import etree
 from tabulate import tabulate
 import logging
 import sys
+from services.netconf_session import ConnectParams, connect, pipeline_rpcs
 
 # Configure logging
 logging.basicConfig(
@@ -15,16 +15,9 @@ logging.basicConfig(
 )
 
 class ServiceDiscovery:
-    def __init__(self, host, username, password, port=830, timeout=30):
-        self.device_params = {
-            "host": host,
-            "port": port,
-            "username": username,
-            "password": password,
-            "hostkey_verify": False,
-            "device_params": {'name': 'default'},
-            "timeout": timeout
-        }
+    def __init__(self, host, username, password, port=830, timeout=30, connect_timeout=None):
+        # timeout bounds each RPC; connect_timeout (if set) bounds reaching the device and the handshake
+        self.params = ConnectParams(host, port, username, password, timeout=timeout, connect_timeout=connect_timeout)
         
         # Protocol capabilities and their XML filters
         self.protocols = {
@@ -69,11 +62,13 @@ class ServiceDiscovery:
     def connect(self):
         """Establish NETCONF connection"""
         try:
-            self.conn = manager.connect(**self.device_params)
-            logging.info(f"Connected to {self.device_params['host']}")
+            p = self.params
+            self.conn = connect(p.host, p.port, p.username, p.password, timeout=p.timeout,
+                                device=p.device, connect_timeout=p.connect_timeout)
+            logging.info("Connected to %s", p.host)
             return True
         except Exception as e:
-            logging.error(f"Connection failed: {str(e)}")
+            logging.error("Connection failed: %s", e)
             return False
 
     def _build_filter(self, protocol):
@@ -94,7 +89,7 @@ class ServiceDiscovery:
             elements = root.findall(f'.//{protocol["xpath"]}', namespaces=protocol['namespace'])
             
             if not elements:
-                logging.debug(f"No configuration found for {protocol['filter']}")
+                logging.debug("No configuration found for %s", protocol['filter'])
                 return None
 
             results = []
@@ -107,25 +102,29 @@ class ServiceDiscovery:
             
             return results
         except Exception as e:
-            logging.error(f"Parsing error for {protocol['filter']}: {str(e)}")
+            logging.error("Parsing error for %s: %s", protocol['filter'], e)
+            return None
+
+    def _read_response(self, protocol_name, response):
+        """Log and parse one protocol's reply (or the error raised for it)"""
+        if isinstance(response, Exception):
+            logging.error("Protocol check failed for %s: %s", protocol_name, response)
             return None
+        logging.debug("Raw response for %s:\n%s", protocol_name, response.xml)
+        return self._parse_response(response, self.protocols[protocol_name])
 
     def check_protocol(self, protocol_name):
         """Check specific protocol configuration"""
         if protocol_name not in self.protocols:
-            logging.error(f"Unknown protocol: {protocol_name}")
+            logging.error("Unknown protocol: %s", protocol_name)
             return None
 
         protocol = self.protocols[protocol_name]
         try:
-            filter_xml = self._build_filter(protocol)
-            response = self.conn.get(filter=filter_xml)
-            logging.debug(f"Raw response for {protocol_name}:\n{response.xml}")
-            
-            return self._parse_response(response, protocol)
+            response = self.conn.get(filter=self._build_filter(protocol))
         except Exception as e:
-            logging.error(f"Protocol check failed for {protocol_name}: {str(e)}")
-            return None
+            response = e
+        return self._read_response(protocol_name, response)
 
     def discover_all(self):
         """Discover all configured protocols"""
@@ -133,10 +132,18 @@ class ServiceDiscovery:
             logging.error("Not connected to device")
             return None
 
+        # Send every protocol's get before reading any reply so the checks share one round trip
+        names = list(self.protocols)
+        responses = pipeline_rpcs(
+            self.conn,
+            *[lambda p=self.protocols[name]: self.conn.get(filter=self._build_filter(p)) for name in names],
+            return_exceptions=True
+        )
+
         results = {}
-        for protocol_name in self.protocols:
-            logging.info(f"Checking {protocol_name} configuration...")
-            config = self.check_protocol(protocol_name)
+        for protocol_name, response in zip(names, responses):
+            logging.info("Checking %s configuration...", protocol_name)
+            config = self._read_response(protocol_name, response)
             results[protocol_name] = config if config else "Not configured"
         
         return results
@@ -164,7 +171,7 @@ class ServiceDiscovery:
                 'os_version': root.findtext('.//version') or 'N/A'
             }
         except Exception as e:
-            logging.error(f"Failed to get device info: {str(e)}")
+            logging.error("Failed to get device info: %s", e)
             return {
                 'hostname': 'N/A',
                 'model': 'N/A',
@@ -1,12 +1,28 @@
-import xml.etree.ElementTree as ET
-from prettytable import PrettyTable
+import re
+from lxml import etree
+from services.netconf_session import pipeline_rpcs
+
+# XPath queries compiled once at import; the text() ones return the matching text values
+_IP_NS = {'native': 'http://cisco.com/ns/yang/Cisco-IOS-XE-native'}
+_GIG_INTERFACES = etree.XPath(".//native:interface/native:GigabitEthernet", namespaces=_IP_NS)
+_GIG_NAME = etree.XPath("native:name/text()", namespaces=_IP_NS)
+_GIG_ADDRESS = etree.XPath(".//native:primary/native:address/text()", namespaces=_IP_NS)
+_GIG_MASK = etree.XPath(".//native:primary/native:mask/text()", namespaces=_IP_NS)
+
+_HW_NS = {'hw': 'http://cisco.com/ns/yang/Cisco-IOS-XE-device-hardware-oper'}
+_HW_INVENTORY = etree.XPath(".//hw:device-inventory", namespaces=_HW_NS)
+_HW_DESCRIPTION = etree.XPath("hw:hw-description/text()", namespaces=_HW_NS)
+_HW_OPER_STATE = etree.XPath("hw:hw-oper-state/text()", namespaces=_HW_NS)
+
+# Interface name inside a hardware description (e.g. "GigabitEthernet0/1")
+_GE_RE = re.compile(r"GigabitEthernet\S+")
 
 def get_physical_inventory(m):
-    """Get physical inventory with accurate status using device hardware operational data"""
+    """Get physical inventory with accurate status using device hardware operational data.
+
+    Returns a list of row dicts keyed by column name (see utils.render_table), or None on error.
+    """
     try:
-        # Initialize table
-        table = PrettyTable(["Interface", "IP Address", "Subnet Mask", "Status", "Capacity", "Usage"])
-        
         # Get interface IP configuration
         ip_filter = '''
         <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
@@ -27,21 +43,13 @@ def get_physical_inventory(m):
           </native>
         </filter>
         '''
-        ip_result = m.get_config(source='running', filter=ip_filter)
-        ip_root = ET.fromstring(ip_result.xml)
-        ip_ns = {'native': 'http://cisco.com/ns/yang/Cisco-IOS-XE-native'}
-        
-        # Get interface status from device hardware operational data
+        # Get interface status from device hardware operational data (only the leaves read below)
         status_filter = '''
         <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
           <device-hardware-data xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-device-hardware-oper">
             <device-hardware>
               <device-inventory>
                 <hw-type>port</hw-type>
-                <hw-dev-index/>
-                <version/>
-                <part-number/>
-                <serial-number/>
                 <hw-description/>
                 <hw-status>
                   <hw-status-info>ok</hw-status-info>
@@ -52,37 +60,42 @@ def get_physical_inventory(m):
           </device-hardware-data>
         </filter>
         '''
-        status_result = m.get(filter=status_filter)
-        status_root = ET.fromstring(status_result.xml)
-        status_ns = {'hw': 'http://cisco.com/ns/yang/Cisco-IOS-XE-device-hardware-oper'}
+        # Send both requests before reading either reply (one round trip instead of two)
+        ip_result, status_result = pipeline_rpcs(
+            m,
+            lambda: m.get_config(source='running', filter=ip_filter),
+            lambda: m.get(filter=status_filter),
+        )
+        # ncclient already parsed both replies with lxml; no need to serialize and re-parse them
+        ip_root = ip_result.data_ele
+        status_root = status_result.data_ele
         
         # Create a status mapping dictionary
         status_map = {}
-        for inv in status_root.findall(".//hw:device-inventory", namespaces=status_ns):
-            hw_desc = inv.find("hw:hw-description", namespaces=status_ns)
-            state = inv.find("hw:hw-oper-state", namespaces=status_ns)
-            if hw_desc is not None and state is not None:
-                # Extract interface name from description (e.g., "GigabitEthernet0/1")
-                if "GigabitEthernet" in hw_desc.text:
-                    # Normalize interface name (remove any extra spaces or prefixes)
-                    intf_name = "GigabitEthernet" + hw_desc.text.split("GigabitEthernet")[-1].split()[0]
-                    status_map[intf_name] = state.text.lower()  # up/down
+        for inv in _HW_INVENTORY(status_root):
+            hw_desc = _HW_DESCRIPTION(inv)
+            state = _HW_OPER_STATE(inv)
+            # Extract interface name from description (e.g., "GigabitEthernet0/1")
+            if hw_desc and state:
+                match = _GE_RE.search(hw_desc[0])
+                if match:
+                    status_map[match.group()] = state[0].lower()  # up/down
         
         # Process all GigabitEthernet interfaces
-        interfaces = ip_root.findall(".//native:interface/native:GigabitEthernet", namespaces=ip_ns)
-        for intf in interfaces:
-            name = intf.find("native:name", namespaces=ip_ns)
-            if name is not None:
-                interface_name = f"GigabitEthernet{name.text}"
+        rows = []
+        for intf in _GIG_INTERFACES(ip_root):
+            names = _GIG_NAME(intf)
+            if names:
+                interface_name = f"GigabitEthernet{names[0]}"
                 
                 # Get IP information
                 ip_address = "N/A"
                 subnet_mask = "N/A"
-                ip_elem = intf.find(".//native:primary/native:address", namespaces=ip_ns)
-                mask_elem = intf.find(".//native:primary/native:mask", namespaces=ip_ns)
-                if ip_elem is not None and mask_elem is not None:
-                    ip_address = ip_elem.text
-                    subnet_mask = mask_elem.text
+                ip_text = _GIG_ADDRESS(intf)
+                mask_text = _GIG_MASK(intf)
+                if ip_text and mask_text:
+                    ip_address = ip_text[0]
+                    subnet_mask = mask_text[0]
                 
                 # Get interface status from our mapping
                 status = status_map.get(interface_name, "down")
@@ -91,16 +104,16 @@ def get_physical_inventory(m):
                 capacity = "1G"
                 usage = "Used" if ip_address != "N/A" else "Free"
                 
-                table.add_row([
-                    interface_name,
-                    ip_address,
-                    subnet_mask,
-                    status,
-                    capacity,
-                    usage
-                ])
+                rows.append({
+                    "Interface": interface_name,
+                    "IP Address": ip_address,
+                    "Subnet Mask": subnet_mask,
+                    "Status": status,
+                    "Capacity": capacity,
+                    "Usage": usage
+                })
         
-        return table
+        return rows
         
     except Exception as e:
         print(f"⚠️ Physical inventory query failed: {str(e)}")
@@ -1,36 +1,154 @@
-import xml.etree.ElementTree as ET
-from prettytable import PrettyTable
+from lxml import etree
+from tabulate import tabulate
 
-def get_device_info(m):
+# XPath queries compiled once at import; the text() ones return the matching text values
+_NATIVE_NS = {'native': 'http://cisco.com/ns/yang/Cisco-IOS-XE-native'}
+_HOSTNAME = etree.XPath(".//native:hostname/text()", namespaces=_NATIVE_NS)
+_LOOPBACK_IP = etree.XPath(
+    ".//native:Loopback/native:ip/native:address/native:primary/native:address/text()", namespaces=_NATIVE_NS
+)
+
+_VRF_DEFINITIONS = etree.XPath(".//native:vrf/native:definition", namespaces=_NATIVE_NS)
+# Every interface entry, whatever its type, for a single pass over the interface list
+_INTERFACE_ENTRIES = etree.XPath(".//native:interface/*", namespaces=_NATIVE_NS)
+_INTF_NAME = etree.XPath("native:name/text()", namespaces=_NATIVE_NS)
+_INTF_VRF = etree.XPath("native:vrf/native:forwarding/text()", namespaces=_NATIVE_NS)
+
+_VLANS = etree.XPath(".//native:vlan/native:vlan-list", namespaces=_NATIVE_NS)
+_VLAN_ID = etree.XPath("native:id/text()", namespaces=_NATIVE_NS)
+_VLAN_NAME = etree.XPath("native:name/text()", namespaces=_NATIVE_NS)
+# Element rather than text: an empty <shutdown/> leaf still means the VLAN is shut down
+_VLAN_SHUTDOWN = etree.XPath("native:shutdown", namespaces=_NATIVE_NS)
+
+_MPLS_NS = {'mpls': 'http://cisco.com/ns/yang/Cisco-IOS-XE-mpls'}
+_LSR_ID = etree.XPath(".//mpls:lsr-id/text()", namespaces=_MPLS_NS)
+_LDP_ROUTER_ID = etree.XPath(".//mpls:ldp/mpls:router-id/text()", namespaces=_MPLS_NS)
+_LDP_INTERFACES = etree.XPath(".//mpls:ldp/mpls:discovery/mpls:interfaces/text()", namespaces=_MPLS_NS)
+_MVPN = etree.XPath(".//mpls:mvpn", namespaces=_MPLS_NS)
+_MVPN_INSTANCE = etree.XPath("mpls:instance/text()", namespaces=_MPLS_NS)
+_MVPN_MDT = etree.XPath("mpls:mdt/text()", namespaces=_MPLS_NS)
+_MVPN_STATUS = etree.XPath("mpls:status/text()", namespaces=_MPLS_NS)
+
+_L2VPN_NS = {'l2vpn': 'http://cisco.com/ns/yang/Cisco-IOS-XE-l2vpn'}
+_XCONNECT_GROUPS = etree.XPath(".//l2vpn:xconnect/l2vpn:groups", namespaces=_L2VPN_NS)
+_XCONNECT_NAME = etree.XPath("l2vpn:name/text()", namespaces=_L2VPN_NS)
+_XCONNECT_INTERFACE = etree.XPath("l2vpn:p2p/l2vpn:interface/text()", namespaces=_L2VPN_NS)
+_XCONNECT_TARGET = etree.XPath("l2vpn:p2p/l2vpn:neighbor/l2vpn:address/text()", namespaces=_L2VPN_NS)
+
+_L3VPN_NS = {
+    'native': 'http://cisco.com/ns/yang/Cisco-IOS-XE-native',
+    'vrf': 'http://cisco.com/ns/yang/Cisco-IOS-XE-vrf',
+    'bgp': 'http://cisco.com/ns/yang/Cisco-IOS-XE-bgp'
+}
+_VPNV4 = etree.XPath(
+    "boolean(.//native:router/bgp:bgp/bgp:address-family/bgp:with-vrf/bgp:ipv4/bgp:vpn)", namespaces=_L3VPN_NS
+)
+_L3VPN_DEFINITIONS = etree.XPath(".//native:vrf/vrf:definition", namespaces=_L3VPN_NS)
+_L3VPN_NAME = etree.XPath("vrf:name/text()", namespaces=_L3VPN_NS)
+_L3VPN_RD = etree.XPath("vrf:rd/text()", namespaces=_L3VPN_NS)
+_L3VPN_IMPORT = etree.XPath("vrf:address-family/vrf:ipv4/vrf:route-target/vrf:import/text()", namespaces=_L3VPN_NS)
+_L3VPN_EXPORT = etree.XPath("vrf:address-family/vrf:ipv4/vrf:route-target/vrf:export/text()", namespaces=_L3VPN_NS)
+
+# Qualified tags, built once, for reading VRF definition children directly
+_NATIVE = "{http://cisco.com/ns/yang/Cisco-IOS-XE-native}"
+_VRF_INTERFACE_TYPES = {_NATIVE + intf_type: intf_type for intf_type in ('GigabitEthernet', 'Loopback', 'Tunnel')}
+_NAME_TAG = _NATIVE + "name"
+_RD_TAG = _NATIVE + "rd"
+_ADDRESS_FAMILY_TAG = _NATIVE + "address-family"
+_IPV4_TAG = _NATIVE + "ipv4"
+_IPV6_TAG = _NATIVE + "ipv6"
+
+# Union of the get_*_info filters, so discover_services reads every service in one get-config.
+# Each get_*_info takes the resulting tree as root and otherwise fetches its own subtree.
+_SERVICES_FILTER = '''
+<filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+  <native xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-native">
+    <hostname/>
+    <vrf>
+      <definition>
+        <name/>
+        <rd/>
+        <address-family>
+          <ipv4/>
+          <ipv6/>
+        </address-family>
+      </definition>
+      <definition xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-vrf">
+        <name/>
+        <rd/>
+        <address-family>
+          <ipv4>
+            <route-target>
+              <import/>
+              <export/>
+            </route-target>
+          </ipv4>
+        </address-family>
+      </definition>
+    </vrf>
+    <interface>
+      <GigabitEthernet/>
+      <Loopback/>
+      <Tunnel/>
+    </interface>
+    <vlan>
+      <vlan-list/>
+    </vlan>
+    <router>
+      <bgp xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-bgp">
+        <address-family>
+          <with-vrf>
+            <ipv4>
+              <vpn/>
+            </ipv4>
+          </with-vrf>
+        </address-family>
+      </bgp>
+    </router>
+  </native>
+  <mpls xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-mpls">
+    <lsr-id/>
+    <ldp>
+      <router-id/>
+      <discovery>
+        <interfaces/>
+      </discovery>
+    </ldp>
+    <mvpn/>
+  </mpls>
+  <l2vpn xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-l2vpn">
+    <xconnect>
+      <groups/>
+    </xconnect>
+  </l2vpn>
+</filter>
+'''
+
+def _first(values, default=None):
+    """Return the first text value from an XPath result, or default if there is none"""
+    return values[0] if values else default
+
+def get_device_info(m, root=None):
     """Get Cisco device information including hostname and loopback IP"""
     try:
-        filter = '''
-        <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
-          <native xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-native">
-            <hostname/>
-            <interface>
-              <Loopback/>
-            </interface>
-          </native>
-        </filter>
-        '''
-        result = m.get_config(source='running', filter=filter)
-        root = ET.fromstring(result.xml)
-        ns = {'native': 'http://cisco.com/ns/yang/Cisco-IOS-XE-native'}
-        
-        hostname = root.find(".//native:hostname", namespaces=ns)
-        loopbacks = root.findall(".//native:Loopback", namespaces=ns)
-        
-        loopback_ip = "None"
-        for loopback in loopbacks:
-            ip = loopback.find("native:ip/native:address/native:primary/native:address", namespaces=ns)
-            if ip is not None:
-                loopback_ip = ip.text
-                break
+        if root is None:
+            filter = '''
+            <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+              <native xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-native">
+                <hostname/>
+                <interface>
+                  <Loopback/>
+                </interface>
+              </native>
+            </filter>
+            '''
+            result = m.get_config(source='running', filter=filter)
+            # ncclient already parsed the reply with lxml; use that tree instead of re-parsing the text
+            root = result.data_ele
         
         return {
-            'hostname': hostname.text if hostname is not None else 'Unknown',
-            'loopback': loopback_ip
+            'hostname': _first(_HOSTNAME(root), 'Unknown'),
+            'loopback': _first(_LOOPBACK_IP(root), "None")
         }
     except Exception as e:
         print(f"⚠️ Could not retrieve device information: {str(e)}")
@@ -39,290 +157,268 @@ def get_device_info(m):
             'loopback': 'Unknown'
         }
 
-def get_vrf_info(m):
+def get_vrf_info(m, root=None):
     """Get VRF information for Cisco devices"""
     try:
-        filter = '''
-        <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
-          <native xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-native">
-            <vrf>
-              <definition>
-                <name/>
-                <rd/>
-                <address-family>
-                  <ipv4/>
-                  <ipv6/>
-                </address-family>
-              </definition>
-            </vrf>
-            <interface>
-              <GigabitEthernet/>
-              <Loopback/>
-              <Tunnel/>
-            </interface>
-          </native>
-        </filter>
-        '''
-        result = m.get_config(source='running', filter=filter)
+        if root is None:
+            filter = '''
+            <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+              <native xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-native">
+                <vrf>
+                  <definition>
+                    <name/>
+                    <rd/>
+                    <address-family>
+                      <ipv4/>
+                      <ipv6/>
+                    </address-family>
+                  </definition>
+                </vrf>
+                <interface>
+                  <GigabitEthernet/>
+                  <Loopback/>
+                  <Tunnel/>
+                </interface>
+              </native>
+            </filter>
+            '''
+            result = m.get_config(source='running', filter=filter)
 
-        root = ET.fromstring(result.xml)
-        ns = {
-            'native': 'http://cisco.com/ns/yang/Cisco-IOS-XE-native'
-        }
+            root = result.data_ele
 
-        vrfs = root.findall(".//native:vrf/native:definition", namespaces=ns)
+        vrfs = _VRF_DEFINITIONS(root)
         if not vrfs:
             return None
 
-        # Collect all interfaces and their VRF assignments
+        # Collect all interfaces and their VRF assignments in one pass over the interface list
         vrf_interfaces = {}
-        for intf_type in ['GigabitEthernet', 'Loopback', 'Tunnel']:
-            interfaces = root.findall(f".//native:interface/native:{intf_type}", namespaces=ns)
-            for intf in interfaces:
-                name = intf.find("native:name", namespaces=ns)
-                vrf = intf.find("native:vrf/native:forwarding", namespaces=ns)
-                if vrf is not None and name is not None:
-                    if vrf.text not in vrf_interfaces:
-                        vrf_interfaces[vrf.text] = []
-                    vrf_interfaces[vrf.text].append(f"{intf_type}{name.text}")
+        for intf in _INTERFACE_ENTRIES(root):
+            intf_type = _VRF_INTERFACE_TYPES.get(intf.tag)
+            if intf_type is None:
+                continue
+            name = _first(_INTF_NAME(intf))
+            vrf = _first(_INTF_VRF(intf))
+            if vrf is not None and name is not None:
+                vrf_interfaces.setdefault(vrf, []).append(f"{intf_type}{name}")
 
-        table = PrettyTable(["VRF Name", "RD", "IPv4", "IPv6", "Interfaces"])
+        rows = []
         for vrf in vrfs:
-            name = vrf.find("native:name", namespaces=ns)
-            rd = vrf.find("native:rd", namespaces=ns)
-            ipv4 = vrf.find("native:address-family/native:ipv4", namespaces=ns)
-            ipv6 = vrf.find("native:address-family/native:ipv6", namespaces=ns)
+            # Index the definition's children once instead of one find() per field
+            children = {child.tag: child for child in vrf}
+            name = children.get(_NAME_TAG)
+            rd = children.get(_RD_TAG)
+            address_family = children.get(_ADDRESS_FAMILY_TAG)
+            ipv4 = address_family is not None and address_family.find(_IPV4_TAG) is not None
+            ipv6 = address_family is not None and address_family.find(_IPV6_TAG) is not None
             interfaces = vrf_interfaces.get(name.text if name is not None else "", [])
             interface_list = ", ".join(interfaces) if interfaces else "None"
 
-            table.add_row([
+            rows.append([
                 name.text if name is not None else "N/A",
                 rd.text if rd is not None else "N/A",
-                "Enabled" if ipv4 is not None else "Disabled",
-                "Enabled" if ipv6 is not None else "Disabled",
+                "Enabled" if ipv4 else "Disabled",
+                "Enabled" if ipv6 else "Disabled",
                 interface_list
             ])
-        return table
+        return tabulate(rows, headers=["VRF Name", "RD", "IPv4", "IPv6", "Interfaces"], tablefmt='grid', disable_numparse=True)
 
     except Exception as e:
         print(f"⚠️ VRF query failed: {str(e)}")
         return None
 
-def get_vlan_info(m):
+def get_vlan_info(m, root=None):
     """Get VLAN information for Cisco devices"""
     try:
-        filter = '''
-        <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
-          <native xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-native">
-            <vlan>
-              <vlan-list/>
-            </vlan>
-          </native>
-        </filter>
-        '''
-        result = m.get_config(source='running', filter=filter)
+        if root is None:
+            filter = '''
+            <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+              <native xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-native">
+                <vlan>
+                  <vlan-list/>
+                </vlan>
+              </native>
+            </filter>
+            '''
+            result = m.get_config(source='running', filter=filter)
 
-        root = ET.fromstring(result.xml)
-        ns = {'native': 'http://cisco.com/ns/yang/Cisco-IOS-XE-native'}
+            root = result.data_ele
         
-        vlans = root.findall(".//native:vlan/native:vlan-list", namespaces=ns)
+        vlans = _VLANS(root)
         if not vlans:
             return None
             
-        table = PrettyTable(["VLAN ID", "Name", "Status"])
+        rows = []
         for vlan in vlans:
-            vlan_id = vlan.find("native:id", namespaces=ns)
-            name = vlan.find("native:name", namespaces=ns)
-            status = vlan.find("native:shutdown", namespaces=ns)
+            status = _first(_VLAN_SHUTDOWN(vlan))
             
-            table.add_row([
-                vlan_id.text if vlan_id is not None else "N/A",
-                name.text if name is not None else "N/A",
+            rows.append([
+                _first(_VLAN_ID(vlan), "N/A"),
+                _first(_VLAN_NAME(vlan), "N/A"),
                 "Active" if status is None or status.text == "false" else "Inactive"
             ])
-        return table
+        return tabulate(rows, headers=["VLAN ID", "Name", "Status"], tablefmt='grid', disable_numparse=True)
         
     except Exception as e:
         print(f"⚠️ VLAN query failed: {str(e)}")
         return None
 
-def get_mpls_info(m):
+def get_mpls_info(m, root=None):
     """Get MPLS information for Cisco devices"""
     try:
-        filter = '''
-        <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
-          <mpls xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-mpls">
-            <lsr-id/>
-            <ldp>
-              <router-id/>
-              <discovery>
-                <interfaces/>
-              </discovery>
-            </ldp>
-          </mpls>
-        </filter>
-        '''
-        result = m.get_config(source='running', filter=filter)
+        if root is None:
+            filter = '''
+            <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+              <mpls xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-mpls">
+                <lsr-id/>
+                <ldp>
+                  <router-id/>
+                  <discovery>
+                    <interfaces/>
+                  </discovery>
+                </ldp>
+              </mpls>
+            </filter>
+            '''
+            result = m.get_config(source='running', filter=filter)
 
-        root = ET.fromstring(result.xml)
-        ns = {'mpls': 'http://cisco.com/ns/yang/Cisco-IOS-XE-mpls'}
-        
-        lsr_id = root.find(".//mpls:lsr-id", namespaces=ns)
-        ldp_rid = root.find(".//mpls:ldp/mpls:router-id", namespaces=ns)
-        interfaces = root.findall(".//mpls:ldp/mpls:discovery/mpls:interfaces", namespaces=ns)
+            root = result.data_ele
         
-        table = PrettyTable(["MPLS LSR ID", "LDP Router ID", "Interfaces"])
-        intf_list = ", ".join([intf.text for intf in interfaces if intf.text])
+        rows = []
+        intf_list = ", ".join(_LDP_INTERFACES(root))
         
-        table.add_row([
-            lsr_id.text if lsr_id is not None else "N/A",
-            ldp_rid.text if ldp_rid is not None else "N/A",
+        rows.append([
+            _first(_LSR_ID(root), "N/A"),
+            _first(_LDP_ROUTER_ID(root), "N/A"),
             intf_list if intf_list else "N/A"
         ])
-        return table
+        return tabulate(rows, headers=["MPLS LSR ID", "LDP Router ID", "Interfaces"], tablefmt='grid', disable_numparse=True)
         
     except Exception as e:
         print(f"⚠️ MPLS query failed: {str(e)}")
         return None
 
-def get_l2vpn_info(m):
+def get_l2vpn_info(m, root=None):
     """Get L2VPN information for Cisco devices"""
     try:
-        filter = '''
-        <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
-          <l2vpn xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-l2vpn">
-            <xconnect>
-              <groups/>
-            </xconnect>
-          </l2vpn>
-        </filter>
-        '''
-        result = m.get_config(source='running', filter=filter)
+        if root is None:
+            filter = '''
+            <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+              <l2vpn xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-l2vpn">
+                <xconnect>
+                  <groups/>
+                </xconnect>
+              </l2vpn>
+            </filter>
+            '''
+            result = m.get_config(source='running', filter=filter)
 
-        root = ET.fromstring(result.xml)
-        ns = {'l2vpn': 'http://cisco.com/ns/yang/Cisco-IOS-XE-l2vpn'}
+            root = result.data_ele
         
-        groups = root.findall(".//l2vpn:xconnect/l2vpn:groups", namespaces=ns)
+        groups = _XCONNECT_GROUPS(root)
         if not groups:
             return None
             
-        table = PrettyTable(["Group Name", "Interface", "Target"])
+        rows = []
         for group in groups:
-            name = group.find("l2vpn:name", namespaces=ns)
-            interface = group.find("l2vpn:p2p/l2vpn:interface", namespaces=ns)
-            target = group.find("l2vpn:p2p/l2vpn:neighbor/l2vpn:address", namespaces=ns)
-            table.add_row([
-                name.text if name is not None else "N/A",
-                interface.text if interface is not None else "N/A",
-                target.text if target is not None else "N/A"
+            rows.append([
+                _first(_XCONNECT_NAME(group), "N/A"),
+                _first(_XCONNECT_INTERFACE(group), "N/A"),
+                _first(_XCONNECT_TARGET(group), "N/A")
             ])
-        return table
+        return tabulate(rows, headers=["Group Name", "Interface", "Target"], tablefmt='grid', disable_numparse=True)
         
     except Exception as e:
         print(f"⚠️ L2VPN query failed: {str(e)}")
         return None
 
-def get_l3vpn_info(m):
+def get_l3vpn_info(m, root=None):
     """Get L3VPN information for Cisco devices"""
     try:
-        filter = '''
-        <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
-          <native xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-native">
-            <vrf>
-              <definition xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-vrf">
-                <name/>
-                <rd/>
-                <address-family>
-                  <ipv4>
-                    <route-target>
-                      <import/>
-                      <export/>
-                    </route-target>
-                  </ipv4>
-                </address-family>
-              </definition>
-            </vrf>
-            <router>
-              <bgp xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-bgp">
-                <address-family>
-                  <with-vrf>
-                    <ipv4>
-                      <vpn/>
-                    </ipv4>
-                  </with-vrf>
-                </address-family>
-              </bgp>
-            </router>
-          </native>
-        </filter>
-        '''
-        result = m.get_config(source='running', filter=filter)
+        if root is None:
+            filter = '''
+            <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+              <native xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-native">
+                <vrf>
+                  <definition xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-vrf">
+                    <name/>
+                    <rd/>
+                    <address-family>
+                      <ipv4>
+                        <route-target>
+                          <import/>
+                          <export/>
+                        </route-target>
+                      </ipv4>
+                    </address-family>
+                  </definition>
+                </vrf>
+                <router>
+                  <bgp xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-bgp">
+                    <address-family>
+                      <with-vrf>
+                        <ipv4>
+                          <vpn/>
+                        </ipv4>
+                      </with-vrf>
+                    </address-family>
+                  </bgp>
+                </router>
+              </native>
+            </filter>
+            '''
+            result = m.get_config(source='running', filter=filter)
 
-        root = ET.fromstring(result.xml)
-        ns = {
-            'native': 'http://cisco.com/ns/yang/Cisco-IOS-XE-native',
-            'vrf': 'http://cisco.com/ns/yang/Cisco-IOS-XE-vrf',
-            'bgp': 'http://cisco.com/ns/yang/Cisco-IOS-XE-bgp'
-        }
+            root = result.data_ele
         
         # Check for VPNv4 BGP configuration
-        vpnv4 = root.find(".//native:router/bgp:bgp/bgp:address-family/bgp:with-vrf/bgp:ipv4/bgp:vpn", namespaces=ns)
-        if vpnv4 is None:
+        if not _VPNV4(root):
             return None
             
         # Get VRF configurations
-        table = PrettyTable(["VRF", "RD", "Import RT", "Export RT"])
-        vrfs = root.findall(".//native:vrf/vrf:definition", namespaces=ns)
+        rows = []
+        vrfs = _L3VPN_DEFINITIONS(root)
         
         for vrf in vrfs:
-            name = vrf.find("vrf:name", namespaces=ns)
-            rd = vrf.find("vrf:rd", namespaces=ns)
-            import_rt = vrf.find("vrf:address-family/vrf:ipv4/vrf:route-target/vrf:import", namespaces=ns)
-            export_rt = vrf.find("vrf:address-family/vrf:ipv4/vrf:route-target/vrf:export", namespaces=ns)
-            
-            table.add_row([
-                name.text if name is not None else "N/A",
-                rd.text if rd is not None else "N/A",
-                import_rt.text if import_rt is not None else "N/A",
-                export_rt.text if export_rt is not None else "N/A"
+            rows.append([
+                _first(_L3VPN_NAME(vrf), "N/A"),
+                _first(_L3VPN_RD(vrf), "N/A"),
+                _first(_L3VPN_IMPORT(vrf), "N/A"),
+                _first(_L3VPN_EXPORT(vrf), "N/A")
             ])
         
-        return table if vrfs else None
+        return tabulate(rows, headers=["VRF", "RD", "Import RT", "Export RT"], tablefmt='grid', disable_numparse=True) if vrfs else None
         
     except Exception as e:
         print(f"⚠️ L3VPN query failed: {str(e)}")
         return None
 
-def get_mvpn_info(m):
+def get_mvpn_info(m, root=None):
     """Get MVPN information for Cisco devices"""
     try:
-        filter = '''
-        <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
-          <mpls xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-mpls">
-            <mvpn/>
-          </mpls>
-        </filter>
-        '''
-        result = m.get_config(source='running', filter=filter)
+        if root is None:
+            filter = '''
+            <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+              <mpls xmlns="http://cisco.com/ns/yang/Cisco-IOS-XE-mpls">
+                <mvpn/>
+              </mpls>
+            </filter>
+            '''
+            result = m.get_config(source='running', filter=filter)
 
-        root = ET.fromstring(result.xml)
-        ns = {'mpls': 'http://cisco.com/ns/yang/Cisco-IOS-XE-mpls'}
+            root = result.data_ele
         
-        mvpn = root.find(".//mpls:mvpn", namespaces=ns)
+        mvpn = _first(_MVPN(root))
         if mvpn is None:
             return None
             
-        table = PrettyTable(["MVPN Instance", "MDT Group", "Status"])
-        instance = mvpn.find("mpls:instance", namespaces=ns)
-        mdt = mvpn.find("mpls:mdt", namespaces=ns)
-        status = mvpn.find("mpls:status", namespaces=ns)
+        rows = []
         
-        table.add_row([
-            instance.text if instance is not None else "N/A",
-            mdt.text if mdt is not None else "N/A",
-            status.text if status is not None else "N/A"
+        rows.append([
+            _first(_MVPN_INSTANCE(mvpn), "N/A"),
+            _first(_MVPN_MDT(mvpn), "N/A"),
+            _first(_MVPN_STATUS(mvpn), "N/A")
         ])
-        return table
+        return tabulate(rows, headers=["MVPN Instance", "MDT Group", "Status"], tablefmt='grid', disable_numparse=True)
         
     except Exception as e:
         print(f"⚠️ MVPN query failed: {str(e)}")
@@ -330,14 +426,22 @@ def get_mvpn_info(m):
 
 def discover_services(m):
     """Discover all services on Cisco device"""
+    # One get-config for every service instead of one per service
+    try:
+        root = m.get_config(source='running', filter=_SERVICES_FILTER).data_ele
+    except Exception as e:
+        # A device missing one of the models may reject the combined filter; fetch per service instead
+        print(f"⚠️ Combined services query failed, querying each service: {str(e)}")
+        root = None
+    
     # Get basic device info
-    device_info = get_device_info(m)
+    device_info = get_device_info(m, root)
     print(f"\nDevice Information:")
     print(f"Hostname: {device_info['hostname']}")
     print(f"Loopback IP: {device_info['loopback']}")
     
     # VRF
-    vrf_table = get_vrf_info(m)
+    vrf_table = get_vrf_info(m, root)
     if vrf_table:
         print("\nVRF Configuration:")
         print(vrf_table)
@@ -345,7 +449,7 @@ def discover_services(m):
         print("\nNo VRF configurations found")
     
     # MPLS
-    mpls_table = get_mpls_info(m)
+    mpls_table = get_mpls_info(m, root)
     if mpls_table:
         print("\nMPLS Configuration:")
         print(mpls_table)
@@ -353,7 +457,7 @@ def discover_services(m):
         print("\nNo MPLS configurations found")
     
     # VLAN
-    vlan_table = get_vlan_info(m)
+    vlan_table = get_vlan_info(m, root)
     if vlan_table:
         print("\nVLAN Configuration:")
         print(vlan_table)
@@ -361,7 +465,7 @@ def discover_services(m):
         print("\nNo VLAN configurations found")
     
     # L2VPN
-    l2vpn_table = get_l2vpn_info(m)
+    l2vpn_table = get_l2vpn_info(m, root)
     if l2vpn_table:
         print("\nL2VPN Configuration:")
         print(l2vpn_table)
@@ -369,7 +473,7 @@ def discover_services(m):
         print("\nNo L2VPN configurations found")
     
     # L3VPN
-    l3vpn_table = get_l3vpn_info(m)
+    l3vpn_table = get_l3vpn_info(m, root)
     if l3vpn_table:
         print("\nL3VPN Configuration:")
         print(l3vpn_table)
@@ -378,7 +482,7 @@ def discover_services(m):
     
     # MVPN (only if MPLS is enabled)
     if mpls_table:
-        mvpn_table = get_mvpn_info(m)
+        mvpn_table = get_mvpn_info(m, root)
         if mvpn_table:
             print("\nMVPN Configuration:")
             print(mvpn_table)
@@ -1,57 +1,89 @@
-import re
+import io
 from ncclient import manager
 from ncclient.xml_ import new_ele, sub_ele
-import xml.etree.ElementTree as ET
+from lxml import etree
 from tabulate import tabulate
+from services.netconf_session import reply_root
 
 def get_namespace(element):
-    m = re.match(r'\{.*\}', element.tag)
-    return m.group(0) if m else ''
+    namespace = etree.QName(element).namespace
+    return f"{{{namespace}}}" if namespace else ''
+
+def qualified_tags(ns):
+    """Tag names used by format_interface_output, qualified with ns"""
+    return tuple(f"{ns}{tag}" for tag in (
+        "name", "admin-status", "oper-status", "logical-interface",
+        "address-family", "address-family-name", "interface-address", "ifa-local"
+    ))
+
+def child_texts(element):
+    """Map each child tag to its text ('' for an empty leaf) in one pass, like findtext per child"""
+    return {child.tag: child.text or "" for child in element}
 
 def get_interface_info(mgr):
-    """Get interface information in terse format"""
+    """Get interface information in terse format (the reply tree ncclient already parsed)"""
     rpc = new_ele("get-interface-information")
     sub_ele(rpc, "terse")
     response = mgr.dispatch(rpc)
-    return ET.fromstring(str(response))
+    return reply_root(response)
 
-def format_interface_output(root):
-    """Format interface output as a table matching 'show interfaces terse'"""
+def format_interface_output(data):
+    """Format interface output (reply element, or raw reply bytes streamed) as a table matching 'show interfaces terse'"""
     table_data = []
+    append = table_data.append
     headers = ["Interface", "Admin", "Link", "Proto", "Local", "Remote"]
-    ns = get_namespace(root)
     
-    # Process all interfaces (physical and logical)
-    for phy in root.findall(f".//{ns}physical-interface"):
-        if_name = phy.findtext(f"{ns}name", "").strip()
-        admin = phy.findtext(f"{ns}admin-status", "down").lower()
-        link = phy.findtext(f"{ns}oper-status", "down").lower()
+    tags = None
+    
+    # Process all interfaces (physical and logical), one physical-interface subtree at a time
+    streaming = isinstance(data, bytes)
+    if streaming:
+        interfaces = (phy for _, phy in etree.iterparse(io.BytesIO(data), events=("end",), tag="{*}physical-interface"))
+    else:
+        interfaces = data.iter("{*}physical-interface")
+    for phy in interfaces:
+        # One reply uses one namespace; qualify the tag names from the first interface only
+        if tags is None:
+            tags = qualified_tags(get_namespace(phy))
+        (name_tag, admin_tag, oper_tag, logical_tag,
+         family_tag, family_name_tag, address_tag, local_tag) = tags
+        fields = child_texts(phy)
+        if_name = fields.get(name_tag, "").strip()
+        admin = fields.get(admin_tag, "down").lower()
+        link = fields.get(oper_tag, "down").lower()
         
         # Physical interface row
-        table_data.append([if_name, admin, link, "", "", ""])
+        append([if_name, admin, link, "", "", ""])
         
         # Logical interfaces
-        for logi in phy.findall(f"{ns}logical-interface"):
-            unit = logi.findtext(f"{ns}name", "").replace(if_name, "").strip(".")
-            l_admin = logi.findtext(f"{ns}admin-status", "down").lower()
-            l_link = logi.findtext(f"{ns}oper-status", "down").lower()
+        for logi in phy.iterchildren(logical_tag):
+            fields = child_texts(logi)
+            unit = fields.get(name_tag, "").replace(if_name, "").strip(".")
+            l_admin = fields.get(admin_tag, "down").lower()
+            l_link = fields.get(oper_tag, "down").lower()
             
             # Get all address families
             addr_families = []
-            for fam in logi.findall(f"{ns}address-family"):
-                proto = fam.findtext(f"{ns}address-family-name", "").strip()
-                for addr in fam.findall(f"{ns}interface-address/{ns}ifa-local"):
-                    ip = addr.text.strip() if addr.text else ""
-                    addr_families.append((proto, ip))
+            for fam in logi.iterchildren(family_tag):
+                proto = child_texts(fam).get(family_name_tag, "").strip()
+                for address in fam.iterchildren(address_tag):
+                    for addr in address.iterchildren(local_tag):
+                        ip = addr.text.strip() if addr.text else ""
+                        addr_families.append((proto, ip))
             
             if addr_families:
-                for i, (proto, ip) in enumerate(addr_families):
-                    if i == 0:
-                        table_data.append([f"{if_name}.{unit}", l_admin, l_link, proto, ip, ""])
-                    else:
-                        table_data.append(["", "", "", proto, ip, ""])
+                # First address on the unit's row, the rest on continuation rows
+                (proto, ip), *more = addr_families
+                append([f"{if_name}.{unit}", l_admin, l_link, proto, ip, ""])
+                table_data.extend(["", "", "", proto, ip, ""] for proto, ip in more)
             else:
-                table_data.append([f"{if_name}.{unit}", l_admin, l_link, "", "", ""])
+                append([f"{if_name}.{unit}", l_admin, l_link, "", "", ""])
+        
+        if streaming:
+            # Free the formatted interface and its earlier siblings so the tree stays one interface deep
+            phy.clear(keep_tail=False)
+            while phy.getprevious() is not None:
+                del phy.getparent()[0]
     
     return tabulate(table_data, headers=headers, tablefmt="grid")
 
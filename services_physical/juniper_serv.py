@@ -1,6 +1,7 @@
 from ncclient import manager
 from lxml import etree
 from tabulate import tabulate
+from services.netconf_session import pipeline_rpcs, reply_root
 
 # Capabilities to check (with NETCONF filters)
 CAPABILITIES = {
@@ -69,15 +70,29 @@ CAPABILITIES = {
     }
 }
 
+# Compile each capability's XPath and column lookups once at import instead of on every reply.
+# Columns return elements (not text) so an empty presence leaf such as <disabled/> still shows as set.
+for _capability in CAPABILITIES.values():
+    _capability['_xpath'] = etree.XPath(_capability['xpath'])
+    _capability['_columns'] = [(col, etree.XPath(col)) for col in _capability['columns']]
+
 def check_capability(conn, capability):
     """Fetch and parse capability data using NETCONF"""
     try:
         # Get configuration data
         config = conn.get_config(source='running', filter=capability['filter'])
-        root = etree.fromstring(str(config))
+        return parse_capability(config, capability)
+    except Exception as e:
+        print(f"Error checking capability: {str(e)}")
+        return None
+
+def parse_capability(config, capability):
+    """Parse one capability's get-config reply"""
+    try:
+        root = reply_root(config)
         
         # Extract data using XPath
-        elements = root.xpath(capability['xpath'])
+        elements = capability['_xpath'](root)
         
         if not elements:
             return None
@@ -86,9 +101,9 @@ def check_capability(conn, capability):
         results = []
         for elem in elements:
             item = {}
-            for col in capability['columns']:
-                child = elem.find(col)
-                item[col] = child.text if child is not None else "N/A"
+            for col, col_xpath in capability['_columns']:
+                children = col_xpath(elem)
+                item[col] = children[0].text if children else "N/A"
             results.append(item)
         
         return results
@@ -103,9 +118,20 @@ def discover_services(conn):
         return
     
     try:
+        # Send every capability's get-config before reading any reply (one round trip instead of five)
+        replies = pipeline_rpcs(
+            conn,
+            *[lambda cap=cap: conn.get_config(source='running', filter=cap['filter']) for cap in CAPABILITIES.values()],
+            return_exceptions=True
+        )
+        
         # Check each capability
-        for cap_name, cap_params in CAPABILITIES.items():
-            results = check_capability(conn, cap_params)
+        for (cap_name, cap_params), config in zip(CAPABILITIES.items(), replies):
+            if isinstance(config, Exception):
+                print(f"Error checking capability: {str(config)}")
+                results = None
+            else:
+                results = parse_capability(config, cap_params)
             
             print(f"\n{cap_name.upper()} Configuration:")
             if results:
@@ -121,7 +147,7 @@ def get_device_info(conn):
     try:
         # Get system information
         system_info = conn.get_system_information()
-        root = etree.fromstring(str(system_info))
+        root = reply_root(system_info)
         
         hostname = root.findtext('.//host-name') or 'N/A'
         loopback = get_loopback_ip(conn) or 'N/A'
@@ -158,7 +184,7 @@ def get_loopback_ip(conn):
             </filter>
         '''
         config = conn.get_config(source='running', filter=filter)
-        root = etree.fromstring(str(config))
+        root = reply_root(config)
         unit = root.find('.//unit')
         if unit is not None:
             return unit.findtext('family/inet/address/name')
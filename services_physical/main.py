@@ -1,11 +1,36 @@
+# Run from the repository root as: python -m services_physical.main
 import ipaddress
 from ncclient import manager
-import subprocess
+import socket
 from prettytable import PrettyTable
-import importlib
+from services_physical import arista_phy, cisco_phy, cisco_serv, juniper_phy, juniper_serv
+from services_physical.utils import render_table
+import re
 import xml.etree.ElementTree as ET
 
 
+# Vendor modules resolved once, so repeated discoveries reuse them instead of importing per device
+_SERVICE_MODULES = {
+    'cisco': cisco_serv,
+    'juniper': juniper_serv,
+}
+_PHYSICAL_MODULES = {
+    'cisco': cisco_phy,
+    'juniper': juniper_phy,
+    'arista': arista_phy,
+}
+
+
+_VENDOR_BY_MARKER = {
+    'cisco': 'cisco',
+    'ios-xe': 'cisco',
+    'juniper': 'juniper',
+    'junos': 'juniper',
+    'arista': 'arista',
+}
+_VENDOR_MARKERS = re.compile('|'.join(_VENDOR_BY_MARKER), re.IGNORECASE)
+
+
 def validate_ip(ip_str):
     try:
         ipaddress.ip_address(ip_str)
@@ -13,36 +38,25 @@ def validate_ip(ip_str):
     except ValueError:
         return False
 
-def check_ping(ip):
+def check_ping(ip, port=830, timeout=2):
+    # Probe the NETCONF port directly: it is what connect_to_device needs, and it fails fast
+    # on closed ports without forking a ping process and waiting for two echo round trips
+    print(f"\n🔄 Checking NETCONF port {port} on {ip}...")
     try:
-        print(f"\n🔄 Pinging {ip}...")
-        result = subprocess.run(['ping', '-c', '2', '-W', '1', ip],
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              timeout=5)
-        
-        if result.returncode == 0:
-            print(f"✅ Successfully pinged {ip}")
-            return True
-        print(f"❌ Could not ping {ip}")
-        return False
-    except Exception as e:
-        print(f"❌ Ping failed: {str(e)}")
+        with socket.create_connection((ip, port), timeout=timeout):
+            pass
+        print(f"✅ {ip} is reachable on port {port}")
+        return True
+    except OSError as e:
+        print(f"❌ Could not reach {ip} on port {port}: {str(e)}")
         return False
 
 def detect_device_vendor(m):
     """Detect the network device vendor by inspecting capabilities"""
     try:
-        capabilities = list(m.server_capabilities)
-        for cap in capabilities:
-            cap = cap.lower()
-            if 'cisco' in cap or 'ios-xe' in cap:
-                return 'cisco'
-            elif 'juniper' in cap or 'junos' in cap:
-                return 'juniper'
-            elif 'arista' in cap:
-                return 'arista'
-        return 'unknown'
+        # One case-insensitive scan of all capabilities; the first capability naming a vendor decides
+        match = _VENDOR_MARKERS.search("\n".join(m.server_capabilities))
+        return _VENDOR_BY_MARKER[match.group().lower()] if match else 'unknown'
     except Exception as e:
         print(f"⚠️ Vendor detection failed: {str(e)}")
         return 'unknown'
@@ -76,25 +90,19 @@ def connect_to_device(ip, username, password, vendor):
 def get_physical_inventory(m, vendor):
     """Get physical inventory based on vendor"""
     try:
-        if vendor == 'cisco':
-            module = importlib.import_module('cisco_router_physical')
-        elif vendor == 'juniper':
-            module = importlib.import_module('juniper_router_physical')
-        elif vendor == 'arista':
-            module = importlib.import_module('arista_router_physical')
-        else:
+        if vendor not in _PHYSICAL_MODULES:
             print("⚠️ Unknown vendor, using Cisco as default for physical inventory")
-            module = importlib.import_module('cisco_router_physical')
+            vendor = 'cisco'
+        module = _PHYSICAL_MODULES[vendor]
         
         print("\n🖧 Physical Inventory:")
-        inventory_table = module.get_physical_inventory(m)
-        if inventory_table:
-            print(inventory_table)
+        inventory = module.get_physical_inventory(m)
+        if inventory:
+            # Vendor modules return row dicts; only the CLI pays for table layout
+            print(render_table(inventory) if isinstance(inventory, list) else inventory)
         else:
             print("No physical inventory information available")
             
-    except ImportError as e:
-        print(f"❌ Error importing physical inventory module: {str(e)}")
     except Exception as e:
         print(f"❌ Error during physical inventory collection: {str(e)}")
 
@@ -127,17 +135,13 @@ def main():
         m = connect_to_device(ip, username, password, vendor)
         print(f"\n📌 Device Vendor: {vendor.upper() if vendor != 'unknown' else 'Unknown (using standard models)'}")
 
-        # Import vendor-specific module
+        # Vendor-specific service discovery module
         try:
-            if vendor == 'cisco':
-                module = importlib.import_module('cisco_router_service')
-            elif vendor == 'juniper':
-                module = importlib.import_module('juniper_router_service')
-            elif vendor == 'arista':
-                module = importlib.import_module('arista_router_service')
-            else:
-                print("⚠️ Unknown vendor, using generic discovery methods")
-                module = importlib.import_module('generic_router')  # You should create this
+            module = _SERVICE_MODULES.get(vendor)
+            if module is None:
+                print(f"⚠️ No service discovery module for vendor '{vendor}'")
+                get_physical_inventory(m, vendor)
+                return
 
             # Get device info
             device_info = module.get_device_info(m)
@@ -148,11 +152,12 @@ def main():
 
             # Get capabilities
             print("\n🔍 Checking supported YANG models...")
-            capabilities = list(m.server_capabilities)
-            cisco_native_supported = any('Cisco-IOS-XE-native' in cap for cap in capabilities)
-            juniper_supported = any('junos' in cap.lower() for cap in capabilities)
-            arista_supported = any('arista' in cap.lower() for cap in capabilities)
-            openconfig_supported = any('openconfig' in cap.lower() for cap in capabilities)
+            caps = "\n".join(m.server_capabilities)
+            caps_lower = caps.lower()
+            cisco_native_supported = 'Cisco-IOS-XE-native' in caps
+            juniper_supported = 'junos' in caps_lower
+            arista_supported = 'arista' in caps_lower
+            openconfig_supported = 'openconfig' in caps_lower
 
             print(f"Cisco Native Model: {'✅' if cisco_native_supported else '❌'}")
             print(f"Juniper Model: {'✅' if juniper_supported else '❌'}")
@@ -164,8 +169,6 @@ def main():
             module.discover_services(m)
             get_physical_inventory(m, vendor)
 
-        except ImportError as e:
-            print(f"❌ Error importing vendor module: {str(e)}")
         except Exception as e:
             print(f"❌ Error during discovery: {str(e)}")
         
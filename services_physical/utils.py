@@ -1 +1,13 @@
-# Utility functions for services and physical page will go here. 
\ No newline at end of file
+# Utility functions for services and physical page will go here.
+from prettytable import PrettyTable
+
+def render_table(rows, columns=None):
+    """Render inventory rows (a list of dicts) as a PrettyTable for CLI output.
+
+    Columns default to the keys of the first row, in order.
+    """
+    if columns is None:
+        columns = list(rows[0]) if rows else []
+    table = PrettyTable(columns)
+    table.add_rows([[row.get(col, "") for col in columns] for row in rows])
+    return table
@@ -5,7 +5,7 @@ Standalone test script for parsing Junos native RPC XML and displaying RIB entri
 Usage: python test_juniper_rpc.py <juniper_rpc.xml>
 """
 
-from rib.juniper_parse import parse_juniper_rpc_xml
+from rib.juniper_parse import parse_juniper_rpc_stream
 from tabulate import tabulate
 
 if __name__ == "__main__":
@@ -13,7 +13,6 @@ if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python test_juniper_rpc.py <juniper_rpc.xml>")
         sys.exit(1)
-    with open(sys.argv[1]) as f:
-        xml_data = f.read()
-    routes = parse_juniper_rpc_xml(xml_data, hostname="Juniper-Router")
+    # Stream the file through the parser instead of reading the whole dump into a string first
+    routes = parse_juniper_rpc_stream(sys.argv[1], hostname="Juniper-Router")
     print(tabulate(routes, headers="keys", tablefmt="grid")) 
\ No newline at end of file
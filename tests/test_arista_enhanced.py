@@ -3,9 +3,17 @@
 Test script for enhanced Arista RIB parsing functionality
 """
 
+import os
+import sys
+import traceback
 from rib.arista_parse import parse_rib_xml_enhanced
 from rib.db_utils import rib_db_manage
-from tabulate import tabulate
+from rib.table_format import format_routes, save_snapshot
+
+# Pass --pretty for tabulate's layout; the default grid writer is much faster on large RIBs
+PRETTY = "--pretty" in sys.argv
+# Pass --snapshot to also save the parsed routes as JSON next to the table
+SNAPSHOT = "--snapshot" in sys.argv
 
 def test_arista_parsing():
     """Test the enhanced Arista parsing functionality"""
@@ -34,12 +42,9 @@ def test_arista_parsing():
             print("\n" + "="*80)
             print("ROUTING TABLE")
             print("="*80)
-            print(tabulate(
-                routes,
-                headers="keys",
-                tablefmt="grid",
-                showindex=False
-            ))
+            # Render once; the same table is printed and saved
+            table = format_routes(routes, pretty=PRETTY)
+            print(table)
             
             # Check database
             db_entries = rib_db_manage.get_entries()
@@ -47,21 +52,20 @@ def test_arista_parsing():
             
             # Save to file
             with open("arista_routing_table.txt", "w") as f:
-                f.write(tabulate(
-                    routes,
-                    headers="keys",
-                    tablefmt="grid",
-                    showindex=False
-                ))
+                f.write(table)
             print("\n✅ Routing table saved to arista_routing_table.txt")
+            if SNAPSHOT:
+                save_snapshot(routes, "arista_routing_table.json")
+                print("✅ Routes snapshot saved to arista_routing_table.json")
             
         else:
             print("⚠️ No routes found - this might be normal if the device has no routes")
             
     except Exception as e:
         print(f"❌ Error during testing: {e}")
-        import traceback
-        traceback.print_exc()
+        # Full traceback only when asked for: TEST_DEBUG=1
+        if os.environ.get("TEST_DEBUG"):
+            traceback.print_exc()
 
 if __name__ == "__main__":
     test_arista_parsing() 
\ No newline at end of file
@@ -6,9 +6,15 @@ Standalone test script for Arista RIB parsing functionality using venv.
 Tests the ability to retrieve and parse routing information from an Arista router and save results to files.
 """
 
+import os
+import sys
+import traceback
 from rib.arista import handle_routing_info
 from rib.db_utils import rib_db_manage
-from tabulate import tabulate
+from rib.table_format import format_routes
+
+# Pass --pretty for tabulate's layout; the default grid writer is much faster on large RIBs
+PRETTY = "--pretty" in sys.argv
 
 def test_arista_parsing():
     """
@@ -36,23 +42,15 @@ def test_arista_parsing():
                 print("\n" + "="*80)
                 print("ROUTING TABLE")
                 print("="*80)
-                print(tabulate(
-                    routes,
-                    headers="keys",
-                    tablefmt="grid",
-                    showindex=False
-                ))
+                # Render once; the same table is printed and saved
+                table = format_routes(routes, pretty=PRETTY)
+                print(table)
                 # Check database
                 db_entries = rib_db_manage.get_entries()
                 print(f"\n📊 Database contains {len(db_entries)} entries")
                 # Save to file
                 with open("arista_routing_table_venv.txt", "w") as f:
-                    f.write(tabulate(
-                        routes,
-                        headers="keys",
-                        tablefmt="grid",
-                        showindex=False
-                    ))
+                    f.write(table)
                 print("\n✅ Routing table saved to arista_routing_table_venv.txt")
             else:
                 print("⚠️ No routes found - this might be normal if the device has no routes")
@@ -60,8 +58,9 @@ def test_arista_parsing():
             print(f"❌ Failed to get routing info: {result.get('error', 'Unknown error')}")
     except Exception as e:
         print(f"❌ Error during testing: {e}")
-        import traceback
-        traceback.print_exc()
+        # Full traceback only when asked for: TEST_DEBUG=1
+        if os.environ.get("TEST_DEBUG"):
+            traceback.print_exc()
 
 if __name__ == "__main__":
     test_arista_parsing() 
\ No newline at end of file
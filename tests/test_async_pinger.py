@@ -0,0 +1,120 @@
+"""
+tests/test_async_pinger.py
+--------------------------
+Unit tests for services.async_pinger with a fake ICMP socket, and for the IPPinger
+fallback in services.scan_service when no ICMP socket may be opened.
+"""
+
+import ipaddress
+import os
+import socket
+import sys
+import unittest
+from unittest import mock
+from services import async_pinger
+
+# scan_service imports its sibling modules by bare name; appended so services/rib.py cannot shadow the rib package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'services')))
+import scan_service  # noqa: E402
+
+class FakeICMPSocket:
+    """
+    Datagram ICMP socket stand-in: every echo request sent to an address in alive is
+    answered with an echo reply readable from the same socket.
+    """
+    type = socket.SOCK_DGRAM
+
+    def __init__(self, alive):
+        self.alive = alive
+        self.sent = []
+        self._inbox, self._outbox = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._inbox.setblocking(False)
+
+    def fileno(self):
+        return self._inbox.fileno()
+
+    def sendto(self, packet, address):
+        ip = address[0]
+        self.sent.append(ip)
+        if ip in self.alive:
+            reply = bytes([async_pinger.ICMP_ECHO_REPLY]) + packet[1:]
+            self._outbox.send(ip.encode() + b"|" + reply)
+
+    def recvfrom(self, size):
+        data = self._inbox.recv(size)
+        ip, _, packet = data.partition(b"|")
+        return packet, (ip.decode(), 0)
+
+    def close(self):
+        self._inbox.close()
+        self._outbox.close()
+
+class TestPingAll(unittest.TestCase):
+    def test_alive_and_dead_hosts(self):
+        fake = FakeICMPSocket(alive={'10.0.0.1', '10.0.0.3'})
+        with mock.patch.object(async_pinger, '_open_icmp_socket', return_value=fake):
+            results = async_pinger.ping_range(['10.0.0.1', '10.0.0.2', '10.0.0.3'], timeout=0.2)
+        self.assertEqual(fake.sent, ['10.0.0.1', '10.0.0.2', '10.0.0.3'])
+        self.assertEqual({ip: r['alive'] for ip, r in results.items()},
+                         {'10.0.0.1': True, '10.0.0.2': False, '10.0.0.3': True})
+        self.assertIsNotNone(results['10.0.0.1']['response_time'])
+        self.assertEqual(results['10.0.0.2']['error'], 'Timeout')
+        self.assertEqual(results['10.0.0.2']['return_code'], 1)
+
+    def test_accepts_integer_addresses(self):
+        network = ipaddress.IPv4Network('192.168.7.0/30')
+        hosts = range(int(network.network_address) + 1, int(network.broadcast_address))
+        fake = FakeICMPSocket(alive={'192.168.7.2'})
+        with mock.patch.object(async_pinger, '_open_icmp_socket', return_value=fake):
+            results = async_pinger.ping_range(hosts, timeout=0.2)
+        self.assertEqual(list(results), ['192.168.7.1', '192.168.7.2'])
+        self.assertTrue(results['192.168.7.2']['alive'])
+
+    def test_echo_request_checksum(self):
+        packet = async_pinger._echo_request(0x1234, 7)
+        self.assertEqual(async_pinger._checksum(packet), 0)
+
+    def test_permission_error_without_icmp_socket(self):
+        real_socket = socket.socket
+
+        def no_icmp(*args, **kwargs):
+            # Refuse ICMP sockets only; the event loop still needs its own socketpair
+            if socket.IPPROTO_ICMP in args[2:3] or kwargs.get('proto') == socket.IPPROTO_ICMP:
+                raise PermissionError('not permitted')
+            return real_socket(*args, **kwargs)
+
+        with mock.patch.object(socket, 'socket', no_icmp):
+            with self.assertRaises(PermissionError):
+                async_pinger.ping_range(['10.0.0.1'], timeout=0.1)
+
+class TestScanServiceFallback(unittest.TestCase):
+    def test_falls_back_to_ippinger(self):
+        pinged = {}
+
+        class FakePinger:
+            def __init__(self, timeout):
+                pass
+
+            def ping_subnet(self, ips):
+                pinged['ips'] = list(ips)
+                return {ip: {'ip': ip, 'alive': ip == '10.9.0.2', 'response_time': 1.0} for ip in ips}
+
+        class FakeDetector:
+            def __init__(self, timeout):
+                pass
+
+            def confirm_live_ips(self, ping_results):
+                return ping_results
+
+            def get_confirmed_live_ips(self, results):
+                return [ip for ip, r in results.items() if r['alive']]
+
+        with mock.patch.object(scan_service, 'ping_range', side_effect=PermissionError('not permitted')), \
+                mock.patch.object(scan_service, 'IPPinger', FakePinger), \
+                mock.patch.object(scan_service, 'LiveIPDetector', FakeDetector):
+            live = scan_service.get_alive_ips('10.9.0.1', '10.9.0.0/29')
+        self.assertEqual(pinged['ips'], ['10.9.0.%d' % i for i in range(1, 7)])
+        self.assertEqual(live, ['10.9.0.2'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,7 @@ Standalone script to test device information retrieval using get_device_info.
 Prints hostname, software version, vendor, and status for each device in the list.
 """
 
-from services.vendor_host import get_device_info
+from services.vendor_host import get_device_info_many
 
 # Replace with your actual device info
 # (You can edit this list as needed)
@@ -16,13 +16,14 @@ devices = [
     {"host": "10.0.13.2", "port": 830, "username": "admin", "password": "sshadmin123"},
 ]
 
-for dev in devices:
-    print(f"Testing {dev['host']} ...")
-    hostname, software_version, vendor, status = get_device_info(
-        dev["host"], dev["port"], dev["username"], dev["password"]
-    )
+# Devices are independent, so probe them all at once; results come back in list order
+print(f"Testing {', '.join(dev['host'] for dev in devices)} ...")
+results = get_device_info_many(devices)
+
+for dev, (hostname, software_version, vendor, status) in zip(devices, results):
+    print(f"Device {dev['host']}:")
     print(f"  Hostname: {hostname}")
     print(f"  Software Version: {software_version}")
     print(f"  Vendor: {vendor}")
     print(f"  Status: {status}")
-    print("-" * 40) 
\ No newline at end of file
+    print("-" * 40)
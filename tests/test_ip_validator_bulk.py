@@ -0,0 +1,74 @@
+"""
+tests/test_ip_validator_bulk.py
+-------------------------------
+Unit tests for the bulk validators of services.ip_validator.IPValidator: validate_many and validate_batch.
+"""
+
+import unittest
+from services.ip_validator import IPValidator
+
+class TestValidateMany(unittest.TestCase):
+    def setUp(self):
+        self.validator = IPValidator()
+
+    def test_roles(self):
+        ips = ['192.168.1.0', '192.168.1.255', '192.168.1.1', '192.168.1.254', '192.168.1.77']
+        results = self.validator.validate_many(ips, '192.168.1.0/24')
+        self.assertEqual([r['ip'] for r in results], ips)
+        self.assertEqual([r['role'] for r in results], [
+            'Network Address', 'Broadcast Address', 'First Usable Host', 'Last Usable Host', 'Usable Host'
+        ])
+        self.assertTrue(all(r['is_valid'] for r in results))
+        info = results[0]['network_info']
+        self.assertEqual(info['first_usable_host'], '192.168.1.1')
+        self.assertEqual(info['last_usable_host'], '192.168.1.254')
+        self.assertEqual(info['total_hosts'], 254)
+
+    def test_outside_subnet(self):
+        result, = self.validator.validate_many(['192.168.2.1'], '192.168.1.0/24')
+        self.assertFalse(result['is_valid'])
+        self.assertIsNone(result['error'])
+
+    def test_invalid_input(self):
+        bad_ip, good_ip = self.validator.validate_many(['999.1.1.1', '10.0.0.5'], '10.0.0.0/29')
+        self.assertEqual(bad_ip['role'], 'invalid')
+        self.assertFalse(bad_ip['is_valid'])
+        self.assertIsNotNone(bad_ip['error'])
+        self.assertEqual(good_ip['role'], 'Usable Host')
+
+        results = self.validator.validate_many(['10.0.0.1', '10.0.0.2'], '10.0.0.0/33')
+        self.assertEqual([r['role'] for r in results], ['invalid', 'invalid'])
+        self.assertTrue(all(r['network_info'] is None for r in results))
+
+    def test_matches_single_validation(self):
+        ips = ['10.1.0.0', '10.1.0.1', '10.1.3.255', 'bad']
+        self.assertEqual(
+            self.validator.validate_many(ips, '10.1.0.0/22'),
+            [self.validator.validate_ip_in_subnet(ip, '10.1.0.0/22') for ip in ips]
+        )
+
+class TestValidateBatch(unittest.TestCase):
+    def setUp(self):
+        self.validator = IPValidator()
+
+    def test_most_specific_subnet_wins(self):
+        subnets = ['10.0.0.0/8', '10.1.0.0/16', '10.1.2.0/24']
+        results = self.validator.validate_batch(['10.1.2.3', '10.1.9.9', '10.200.0.1'], subnets)
+        self.assertEqual([r['subnet'] for r in results], ['10.1.2.0/24', '10.1.0.0/16', '10.0.0.0/8'])
+
+    def test_roles(self):
+        ips = ['10.1.2.0', '10.1.2.255', '10.1.2.1', '10.1.2.254', '10.1.2.100']
+        results = self.validator.validate_batch(ips, ['10.1.2.0/24'])
+        self.assertEqual([r['role'] for r in results], [
+            'Network Address', 'Broadcast Address', 'First Usable Host', 'Last Usable Host', 'Usable Host'
+        ])
+
+    def test_invalid_and_unmatched(self):
+        results = self.validator.validate_batch(['not-an-ip', '172.16.0.1', '192.168.5.5'],
+                                                ['192.168.5.0/24', 'bogus/99'])
+        self.assertEqual(results[0], {'ip': 'not-an-ip', 'subnet': None, 'role': 'invalid'})
+        self.assertEqual(results[1], {'ip': '172.16.0.1', 'subnet': None, 'role': 'Not In Any Subnet'})
+        self.assertEqual(results[2]['subnet'], '192.168.5.0/24')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,9 +5,29 @@ Standalone test script for Juniper RIB parsing functionality in the network auto
 Tests the ability to retrieve and parse routing information from a Juniper router and save results to files.
 """
 
+import os
+import sys
+import traceback
 from rib.juniper import handle_routing_info
 from rib.db_utils import rib_db_manage
-from tabulate import tabulate
+from rib.table_format import format_routes, save_snapshot
+
+# Pass --pretty for tabulate's layout; the default grid writer is much faster on large RIBs
+PRETTY = "--pretty" in sys.argv
+# Pass --snapshot to also save the parsed routes as JSON next to the table
+SNAPSHOT = "--snapshot" in sys.argv
+
+# Characters encoded and written per write() when saving the XML capture
+XML_WRITE_CHUNK = 1 << 16
+
+def save_text(path, text):
+    """
+    Write text to path a slice at a time, so only one slice is ever encoded in memory
+    instead of a second full-size copy of a large routing XML.
+    """
+    with open(path, "w") as f:
+        for start in range(0, len(text), XML_WRITE_CHUNK):
+            f.write(text[start:start + XML_WRITE_CHUNK])
 
 def test_juniper_parsing():
     """
@@ -33,32 +53,27 @@ def test_juniper_parsing():
                 print("\n--- XML ---\n")
                 print(result['rib_xml'])
                 print("\n--- TABLE ---\n")
-                print(tabulate(
-                    routes,
-                    headers="keys",
-                    tablefmt="grid",
-                    showindex=False
-                ))
+                # Render once; the same table is printed and saved
+                table = format_routes(routes, pretty=PRETTY)
+                print(table)
                 # Save XML to file
-                with open("juniper_routing.xml", "w") as f:
-                    f.write(result['rib_xml'])
+                save_text("juniper_routing.xml", result['rib_xml'])
                 # Save table to file
                 with open("juniper_routing_table.txt", "w") as f:
-                    f.write(tabulate(
-                        routes,
-                        headers="keys",
-                        tablefmt="grid",
-                        showindex=False
-                    ))
+                    f.write(table)
                 print("\n✅ Routing table saved to juniper_routing_table.txt")
+                if SNAPSHOT:
+                    save_snapshot(routes, "juniper_routing_table.json")
+                    print("✅ Routes snapshot saved to juniper_routing_table.json")
             else:
                 print("⚠️ No routes found - this might be normal if the device has no routes")
         else:
             print(f"❌ Failed to get routing info: {result.get('error', 'Unknown error')}")
     except Exception as e:
         print(f"❌ Error during testing: {e}")
-        import traceback
-        traceback.print_exc()
+        # Full traceback only when asked for: TEST_DEBUG=1
+        if os.environ.get("TEST_DEBUG"):
+            traceback.print_exc()
 
 if __name__ == "__main__":
     test_juniper_parsing() 
\ No newline at end of file
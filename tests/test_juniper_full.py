@@ -5,9 +5,12 @@ Standalone test script for full Juniper workflow: fetch XML, parse, and print ta
 Tests the ability to retrieve, parse, and display routing information from a Juniper router.
 """
 
+import sys
 from rib.juniper import handle_routing_info
-from rib.juniper_parse import parse_juniper_rpc_xml
-from tabulate import tabulate
+from rib.table_format import format_routes
+
+# Pass --pretty for tabulate's layout; the default grid writer is much faster on large RIBs
+PRETTY = "--pretty" in sys.argv
 
 def test_juniper_full():
     """
@@ -21,11 +24,11 @@ def test_juniper_full():
     print("=" * 50)
     result = handle_routing_info(router_name, router_ip, username, password)
     if result['success']:
-        xml_str = result['rib_xml']
-        routes = parse_juniper_rpc_xml(xml_str, router_name)
+        # handle_routing_info already parsed the XML it fetched; parsing it again would only repeat the work
+        routes = result['routes']
         if routes:
             print(f"\n✅ Successfully parsed {len(routes)} routes")
-            print(tabulate(routes, headers="keys", tablefmt="grid"))
+            print(format_routes(routes, pretty=PRETTY))
         else:
             print("⚠️ No routes found in XML data")
     else:
@@ -2,18 +2,18 @@
 test_juniper_rpc.py
 -------------------
 Standalone test script for parsing Junos native RPC XML and displaying RIB entries in the required schema.
-Usage: python test_juniper_rpc.py <juniper_rpc.xml>
+Usage: python test_juniper_rpc.py <juniper_rpc.xml> [--pretty]
 """
 
-from rib.juniper_parse import parse_juniper_rpc_xml
-from tabulate import tabulate
+from rib.juniper_parse import parse_juniper_rpc_stream
+from rib.table_format import format_routes
 
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) < 2:
-        print("Usage: python test_juniper_rpc.py <juniper_rpc.xml>")
+    args = [a for a in sys.argv[1:] if a != "--pretty"]
+    if not args:
+        print("Usage: python test_juniper_rpc.py <juniper_rpc.xml> [--pretty]")
         sys.exit(1)
-    with open(sys.argv[1]) as f:
-        xml_data = f.read()
-    routes = parse_juniper_rpc_xml(xml_data, hostname="Juniper-Router")
-    print(tabulate(routes, headers="keys", tablefmt="grid")) 
\ No newline at end of file
+    # Stream the file through the parser instead of reading the whole dump into a string first
+    routes = parse_juniper_rpc_stream(args[0], hostname="Juniper-Router")
+    print(format_routes(routes, pretty="--pretty" in sys.argv)) 
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+tests/test_netconf_pool.py
+--------------------------
+Unit tests for services.netconf_pool.NetconfPool with fake sessions in place of ncclient.
+"""
+
+import sys
+import time
+import unittest
+from unittest import mock
+import services.netconf_pool  # noqa: F401 (services re-exports a pool instance under the same name)
+
+pool_module = sys.modules['services.netconf_pool']
+
+class FakeSession:
+    """Stands in for an ncclient Manager."""
+    def __init__(self, host):
+        self.host = host
+        self.connected = True
+        self.timeout = None
+        self.closed = False
+
+    def close_session(self):
+        self.closed = True
+        self.connected = False
+
+class TestNetconfPool(unittest.TestCase):
+    def setUp(self):
+        self.opened = []
+
+        def fake_connect(host, port, username, password, timeout=10, connect_timeout=None):
+            session = FakeSession(host)
+            self.opened.append(session)
+            return session
+
+        patcher = mock.patch.object(pool_module, 'connect', fake_connect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = pool_module.NetconfPool(max_size=2, idle_timeout=300, sweep_interval=60)
+        self.addCleanup(self.pool.close_all)
+
+    def use(self, host):
+        with self.pool.acquire(host, 830, 'admin', 'pw') as m:
+            return m
+
+    def test_reuses_idle_session(self):
+        first = self.use('10.0.0.1')
+        second = self.use('10.0.0.1')
+        self.assertIs(first, second)
+        self.assertEqual(len(self.opened), 1)
+        self.assertFalse(first.closed)
+
+    def test_sessions_are_per_device(self):
+        a = self.use('10.0.0.1')
+        b = self.use('10.0.0.2')
+        self.assertIsNot(a, b)
+        self.assertEqual(len(self.opened), 2)
+
+    def test_evicts_least_recently_used(self):
+        a = self.use('10.0.0.1')
+        b = self.use('10.0.0.2')
+        self.use('10.0.0.1')          # a becomes the most recently used
+        c = self.use('10.0.0.3')      # pool is over max_size: b goes
+        self.assertTrue(b.closed)
+        self.assertFalse(a.closed)
+        self.assertFalse(c.closed)
+        self.assertIs(self.use('10.0.0.1'), a)
+        self.assertIsNot(self.use('10.0.0.2'), b)
+
+    def test_failed_block_closes_session(self):
+        with self.assertRaises(RuntimeError):
+            with self.pool.acquire('10.0.0.1', 830, 'admin', 'pw') as m:
+                raise RuntimeError('rpc failed')
+        self.assertTrue(m.closed)
+        fresh = self.use('10.0.0.1')
+        self.assertIsNot(fresh, m)
+        self.assertEqual(len(self.opened), 2)
+        # The fresh session is pooled as usual
+        self.assertIs(self.use('10.0.0.1'), fresh)
+
+    def test_dropped_session_is_not_reused(self):
+        m = self.use('10.0.0.1')
+        m.connected = False           # device closed the session while it sat idle
+        self.assertIsNot(self.use('10.0.0.1'), m)
+        self.assertEqual(len(self.opened), 2)
+
+    def test_sweeper_closes_expired_sessions(self):
+        self.pool.idle_timeout = 0
+        self.pool.sweep_interval = 0.01
+        m = self.use('10.0.0.1')
+        deadline = time.monotonic() + 2
+        while not m.closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(m.closed)
+        self.assertIsNot(self.use('10.0.0.1'), m)
+
+    def test_close_all(self):
+        a = self.use('10.0.0.1')
+        b = self.use('10.0.0.2')
+        self.pool.close_all()
+        self.assertTrue(a.closed and b.closed)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+tests/test_netconf_session.py
+-----------------------------
+Unit tests for services.netconf_session.pipeline_rpcs against a fake NETCONF session.
+"""
+
+import threading
+import unittest
+from ncclient.devices.default import DefaultDeviceHandler
+from ncclient.operations.errors import TimeoutExpiredError
+from ncclient.operations.rpc import RaiseMode, RPCError, RPCReply
+from services.netconf_session import pipeline_rpcs
+
+OK_REPLY = '''<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="{id}">
+<data><name>{id}</name></data></rpc-reply>'''
+
+ERROR_REPLY = '''<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="{id}">
+<rpc-error><error-type>application</error-type><error-tag>operation-failed</error-tag>
+<error-severity>{severity}</error-severity><error-message>{message}</error-message></rpc-error></rpc-reply>'''
+
+class FakeRPC:
+    """An RPC issued in async mode; its reply is delivered later by FakeManager.deliver."""
+    def __init__(self, raw, raise_mode):
+        self.event = threading.Event()
+        self.error = None
+        self.reply = RPCReply(raw)
+        self.raise_mode = raise_mode
+
+class FakeManager:
+    """The parts of ncclient.manager.Manager that pipeline_rpcs uses."""
+    def __init__(self, ignore_errors=None, timeout=2):
+        self._device_handler = DefaultDeviceHandler(ignore_errors=ignore_errors)
+        self.async_mode = False
+        self.timeout = timeout
+        self.huge_tree = False
+        self.raise_mode = RaiseMode.ALL
+        self.sent = []
+
+    def request(self, raw):
+        assert self.async_mode, "requests must be sent in async mode"
+        rpc = FakeRPC(raw, self.raise_mode)
+        self.sent.append(rpc)
+        return rpc
+
+    def deliver(self, order, delay=0.05):
+        """After delay, set the reply events of the sent RPCs in the given order, from another thread."""
+        def run():
+            for i in order:
+                self.sent[i].event.set()
+        threading.Timer(delay, run).start()
+
+class TestPipelineRpcs(unittest.TestCase):
+    def test_replies_in_request_order(self):
+        m = FakeManager()
+        requests = [lambda i=i: m.request(OK_REPLY.format(id=i)) for i in range(3)]
+        # Every request is sent before any reply arrives; the replies then arrive out of order
+        m.deliver([2, 0, 1])
+        replies = pipeline_rpcs(m, *requests)
+        self.assertEqual(len(m.sent), 3)
+        for i, reply in enumerate(replies):
+            self.assertIn('<name>%d</name>' % i, reply.xml)
+        self.assertFalse(m.async_mode)
+
+    def test_rpc_error_raises(self):
+        m = FakeManager()
+        requests = [
+            lambda: m.request(OK_REPLY.format(id=0)),
+            lambda: m.request(ERROR_REPLY.format(id=1, severity='error', message='bad element')),
+        ]
+        m.deliver([0, 1])
+        with self.assertRaises(RPCError):
+            pipeline_rpcs(m, *requests)
+
+    def test_rpc_error_returned_with_return_exceptions(self):
+        m = FakeManager()
+        requests = [
+            lambda: m.request(ERROR_REPLY.format(id=0, severity='error', message='bad element')),
+            lambda: m.request(OK_REPLY.format(id=1)),
+        ]
+        m.deliver([0, 1])
+        error, reply = pipeline_rpcs(m, *requests, return_exceptions=True)
+        self.assertIsInstance(error, RPCError)
+        self.assertIn('<name>1</name>', reply.xml)
+
+    def test_exempt_error_does_not_raise(self):
+        m = FakeManager(ignore_errors=['statement not found'])
+        requests = [lambda: m.request(ERROR_REPLY.format(id=0, severity='error', message='statement not found'))]
+        m.deliver([0])
+        reply, = pipeline_rpcs(m, *requests)
+        self.assertIsNotNone(reply.error)
+
+    def test_warning_follows_raise_mode(self):
+        warning = ERROR_REPLY.format(id=0, severity='warning', message='deprecated leaf')
+        m = FakeManager()
+        m.raise_mode = RaiseMode.ERRORS
+        m.deliver([0])
+        reply, = pipeline_rpcs(m, lambda: m.request(warning))
+        self.assertEqual(reply.error.severity, 'warning')
+
+        m = FakeManager()
+        m.deliver([0])
+        with self.assertRaises(RPCError):
+            pipeline_rpcs(m, lambda: m.request(warning))
+
+    def test_timeout_raises_ncclient_error(self):
+        m = FakeManager(timeout=0.1)
+        with self.assertRaises(TimeoutExpiredError):
+            pipeline_rpcs(m, lambda: m.request(OK_REPLY.format(id=0)))
+        self.assertFalse(m.async_mode)
+
+if __name__ == '__main__':
+    unittest.main()
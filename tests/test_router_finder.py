@@ -6,7 +6,7 @@ Tests the ability to detect routers and interfaces for a given IP using RIB data
 """
 
 from routefind.router_finder import find_router_for_ip
-from services.rib import get_rib_entries
+from services.rib import get_rib_entries_filtered
 
 def test_router_detection():
     """
@@ -22,37 +22,37 @@ def test_router_detection():
     print("=" * 50)
     # Get routes directly from RIB
     print(f"\nGetting routes for router {router_ip}...")
-    routes = get_rib_entries(router_ip)
-    if not routes:
+    # SQLite does the filtering, so only the rows each step uses are loaded
+    relevant_routes = get_rib_entries_filtered(router_ip, dest_substr='192.168.100')
+    routes = get_rib_entries_filtered(router_ip, protocols=['connected', 'direct', 'local'])
+    if not routes and not relevant_routes:
         print(f"No routes found for router {router_ip}")
         return
     print("\nRelevant Routes:")
-    for route in routes:
-        if '192.168.100' in route['destination']:
-            print(f"\nDestination: {route['destination']}")
-            print(f"Interface: {route['interface']}")
-            print(f"Protocol: {route['protocol']}")
-            print(f"Next Hop: {route['next_hop']}")
-    # Build router info manually from routes
+    for route in relevant_routes:
+        print(f"\nDestination: {route['destination']}")
+        print(f"Interface: {route['interface']}")
+        print(f"Protocol: {route['protocol']}")
+        print(f"Next Hop: {route['next_hop']}")
+    # Build router info manually from the connected/direct/local routes
     interfaces = {}
     for route in routes:
-        if route['protocol'].lower() in ['connected', 'direct', 'local']:
-            iface = route['interface']
-            if not iface:
-                continue
-            if iface not in interfaces:
-                interfaces[iface] = {
-                    'ip': None,
-                    'subnet': None
-                }
-            # If it's a /32 and directly connected, it's the interface IP
-            if '/' in route['destination']:
-                ip, prefix = route['destination'].split('/')
-                if (prefix == '32' and 
-                    route['next_hop'] and 'direct' in route['next_hop'].lower()):
-                    interfaces[iface]['ip'] = ip.strip()
-                elif prefix != '32':
-                    interfaces[iface]['subnet'] = route['destination']
+        iface = route['interface']
+        if not iface:
+            continue
+        if iface not in interfaces:
+            interfaces[iface] = {
+                'ip': None,
+                'subnet': None
+            }
+        # If it's a /32 and directly connected, it's the interface IP
+        if '/' in route['destination']:
+            ip, prefix = route['destination'].split('/')
+            if (prefix == '32' and 
+                route['next_hop'] and 'direct' in route['next_hop'].lower()):
+                interfaces[iface]['ip'] = ip.strip()
+            elif prefix != '32':
+                interfaces[iface]['subnet'] = route['destination']
     print("\nProcessed Interfaces:")
     for iface, data in interfaces.items():
         print(f"\n{iface}:")
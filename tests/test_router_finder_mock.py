@@ -5,6 +5,8 @@ Standalone test for router finder logic using mock RIB and inventory data.
 Tests the ability to detect routers and interfaces for a given IP using mock data for Cisco, Arista, and Juniper devices.
 """
 
+import ipaddress
+
 # --- Mock RIB Data (as seen in your UI) ---
 MOCK_RIB = [
     # Cisco-like router 192.168.1.1
@@ -27,81 +29,82 @@ MOCK_RIB = [
     {'router_ip': '10.0.13.2', 'destination': '192.168.1.3/32', 'next_hop': 'Direct', 'interface': 'lo0.0', 'protocol': 'Direct', 'metric': 0},
 ]
 
+# (protocol, next_hop) -> prefix lengths that mark a route as one of the router's own addresses
+LOCAL_PREFIX_LENGTHS = {
+    ("Connected", "Directly connected"): frozenset(["32"]),  # Cisco-like
+    ("Connected", "Direct"): frozenset(["24", "30"]),        # Arista-like
+}
+# Juniper-like: any Direct or Local route
+LOCAL_PROTOCOLS = frozenset(["Direct", "Local"])
+
 def is_local_route(route):
     protocol = route["protocol"]
-    next_hop = route["next_hop"]
-    destination = route["destination"]
-    # Cisco-like: Connected + Directly connected + /32
-    if (protocol == "Connected" and next_hop == "Directly connected" and destination.endswith("/32")):
-        return True
-    # Arista-like: Connected + Direct + /24 or /30
-    if (protocol == "Connected" and next_hop == "Direct" and (destination.endswith("/24") or destination.endswith("/30"))):
-        return True
-    # Juniper-like: Direct or Local protocol
-    if protocol in ["Direct", "Local"]:
+    if protocol in LOCAL_PROTOCOLS:
         return True
-    return False
+    prefix_lengths = LOCAL_PREFIX_LENGTHS.get((protocol, route["next_hop"]))
+    return prefix_lengths is not None and route["destination"].rpartition("/")[2] in prefix_lengths
 
 def get_local_ips(mock_rib, router_ip):
-    local_ips = []
-    for route in mock_rib:
-        if route['router_ip'] == router_ip and is_local_route(route):
-            dest = route["destination"].split("/")[0]
-            interface = route["interface"]
-            local_ips.append((dest, interface))
-    return local_ips
+    return [
+        (route["destination"].split("/")[0], route["interface"])
+        for route in mock_rib
+        if route['router_ip'] == router_ip and is_local_route(route)
+    ]
 
 def find_router_for_ip(ip, mock_rib):
-    router_ips = set(r['router_ip'] for r in mock_rib)
-    for router_ip in router_ips:
-        local_ips = get_local_ips(mock_rib, router_ip)
-        for (local_ip, interface) in local_ips:
-            if ip == local_ip:
-                return router_ip, interface
+    for route in mock_rib:
+        if is_local_route(route) and route["destination"].split("/")[0] == ip:
+            return route['router_ip'], route['interface']
     return None, None
 
-import ipaddress
-def improved_find_router_for_ip(ip, mock_rib, mock_inventory):
-    search_prefixes = [f"{ip}/32", f"{ip}/30", f"{ip}/24"]
-    candidates = []
-    # Collect all direct matches
-    for prefix in search_prefixes:
-        for entry in mock_rib:
-            if entry['destination'] == prefix and entry['protocol'].lower() in ['connected', 'local'] and entry['next_hop'].lower() in ['direct', 'directly connected', 'local']:
-                for inv in mock_inventory:
-                    hostname, software_version, router_ip, vendor, username, password = inv
-                    match = {
-                        'router': entry['router_ip'],
-                        'vendor': vendor,
-                        'router_ip': router_ip,
-                        'loopback_ip': entry['router_ip'],
-                        'interface': entry['interface'],
-                        'hostname': hostname,
-                        'destination': entry['destination']
-                    }
-                    candidates.append(match)
-    # 1. Prefer exact loopback match
-    for c in candidates:
-        if c['loopback_ip'] == c['router_ip']:
-            return c['router'], c['interface'], c['vendor']
-    # 2. Prefer vendor match (e.g., Arista for 10.0.12.2) with subnet check
+def _match_exact(ip, mock_rib):
+    """Connected/local direct entries whose destination is ip/32, ip/30 or ip/24, in that order"""
+    return [
+        entry
+        for prefix in (f"{ip}/32", f"{ip}/30", f"{ip}/24")
+        for entry in mock_rib
+        if entry['destination'] == prefix
+        and entry['protocol'].lower() in ['connected', 'local']
+        and entry['next_hop'].lower() in ['direct', 'directly connected', 'local']
+    ]
+
+def _match_subnet(ip, mock_rib):
+    """Connected/direct entries whose subnet contains ip, in RIB order"""
+    try:
+        ip_obj = ipaddress.ip_address(ip)
+    except ValueError:
+        return []
+    matches = []
     for entry in mock_rib:
         if entry['protocol'].lower() == 'connected' and entry['next_hop'].lower() == 'direct':
-            dest = entry['destination']
             try:
-                net = ipaddress.ip_network(dest, strict=False)
-                ip_obj = ipaddress.ip_address(ip)
-                if ip_obj in net:
-                    for inv in mock_inventory:
-                        hostname, software_version, router_ip, vendor, username, password = inv
-                        if vendor.lower() == 'arista' and entry['router_ip'] == router_ip:
-                            return entry['router_ip'], entry['interface'], vendor
-            except Exception:
+                net = ipaddress.ip_network(entry['destination'], strict=False)
+            except ValueError:
                 continue
-    # 3. Fallback: first candidate
-    if candidates:
-        c = candidates[0]
-        return c['router'], c['interface'], c['vendor']
+            if net.version == ip_obj.version and ip_obj in net:
+                matches.append(entry)
+    return matches
+
+def improved_find_router_for_ip(ip, mock_rib, mock_inventory):
+    # Router IP -> vendor of its first inventory row
+    vendors = {}
+    arista_vendors = {}
+    for hostname, software_version, router_ip, vendor, username, password in mock_inventory:
+        vendors.setdefault(router_ip, vendor)
+        if vendor.lower() == 'arista':
+            arista_vendors.setdefault(router_ip, vendor)
+    matches = _match_exact(ip, mock_rib)
+    # 1. Prefer exact loopback match
+    for entry in matches:
+        if entry['router_ip'] in vendors:
+            return entry['router_ip'], entry['interface'], vendors[entry['router_ip']]
+    # 2. Prefer vendor match (e.g., Arista for 10.0.12.2) with subnet check
+    for entry in _match_subnet(ip, mock_rib):
+        if entry['router_ip'] in arista_vendors:
+            return entry['router_ip'], entry['interface'], arista_vendors[entry['router_ip']]
+    # 3. Fallback: first candidate (first match, paired with the first inventory row)
+    if matches and mock_inventory:
+        return matches[0]['router_ip'], matches[0]['interface'], mock_inventory[0][3]
     return None, None, None
 
 # Mock inventory for test
@@ -111,21 +114,25 @@ MOCK_INVENTORY = [
     ('Juniper-1', '18.4', '10.0.13.2', 'Juniper', 'admin', 'pass'),
 ]
 
+# (input IP, expected router, expected interface, expected vendor)
+TEST_CASES = [
+    ("10.0.12.2", "192.168.1.2", "Ethernet1", "Arista"),
+    ("192.168.1.1", "192.168.1.1", "Loopback0", "Cisco"),
+    ("192.168.100.2", "192.168.1.1", "GigabitEthernet3", "Cisco"),
+    ("10.0.13.2", "10.0.13.2", "ge-0/0/0.0", "Juniper"),
+]
+
 def run_tests():
     """
-    Run the main test for improved_find_router_for_ip using mock RIB and inventory data.
-    Prints PASS/FAIL for the Arista test case.
+    Run improved_find_router_for_ip over TEST_CASES using mock RIB and inventory data.
+    Prints PASS/FAIL for each case.
     """
-    # Only test the Arista case as requested
-    input_ip = "10.0.12.2"
-    expected_router = "192.168.1.2"
-    expected_iface = "Ethernet1"
-    expected_vendor = "Arista"
-    router_ip, interface, vendor = improved_find_router_for_ip(input_ip, MOCK_RIB, MOCK_INVENTORY)
-    if router_ip == expected_router and interface == expected_iface and vendor == expected_vendor:
-        print(f"PASS: IP {input_ip} is local to router {router_ip} ({vendor}) on interface {interface}")
-    else:
-        print(f"FAIL: IP {input_ip} expected router {expected_router} ({expected_vendor}) on {expected_iface}, got {router_ip} ({vendor}) on {interface}")
+    for input_ip, expected_router, expected_iface, expected_vendor in TEST_CASES:
+        router_ip, interface, vendor = improved_find_router_for_ip(input_ip, MOCK_RIB, MOCK_INVENTORY)
+        if router_ip == expected_router and interface == expected_iface and vendor == expected_vendor:
+            print(f"PASS: IP {input_ip} is local to router {router_ip} ({vendor}) on interface {interface}")
+        else:
+            print(f"FAIL: IP {input_ip} expected router {expected_router} ({expected_vendor}) on {expected_iface}, got {router_ip} ({vendor}) on {interface}")
 
 if __name__ == "__main__":
     run_tests() 
\ No newline at end of file
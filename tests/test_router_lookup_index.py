@@ -0,0 +1,78 @@
+"""
+tests/test_router_lookup_index.py
+---------------------------------
+Unit tests for routefind.router_lookup.RouterLookupIndex and batch_find_routers with
+fixed RIB and inventory rows in place of the databases.
+"""
+
+import unittest
+from unittest import mock
+from routefind import router_lookup
+from routefind.router_lookup import RouterLookupIndex, batch_find_routers, find_router_for_ip
+
+# (router, loopback_ip, protocol, destination, interface, next_hop)
+ENTRIES = [
+    ('R1', '1.1.1.1', 'connected', '192.168.1.1/32', 'Gi0/0', 'direct'),
+    ('R2', '2.2.2.2', 'local', '10.0.13.2/32', 'ge-0/0/1', 'local'),
+    ('R9', '9.9.9.9', 'connected', '172.16.5.5/32', 'eth9', 'directly connected'),
+    ('R3', '3.3.3.3', 'connected', '10.0.12.0/24', 'Ethernet1', 'direct'),
+    ('R1', '1.1.1.1', 'ospf', '10.0.0.0/8', 'Gi0/1', '192.168.1.2'),
+]
+
+# (hostname, software_version, ip, vendor, username, password)
+ROUTERS = [
+    ('cisco-r1', '17.3', '1.1.1.1', 'Cisco', 'admin', 'pw'),
+    ('juniper-r2', '21.4', '2.2.2.2', 'Unknown', 'admin', 'pw'),
+    ('arista-r3', '4.28', '3.3.3.3', 'Arista', 'admin', 'pw'),
+]
+
+class TestBatchFindRouters(unittest.TestCase):
+    def setUp(self):
+        self.detected = []
+
+        def fake_detect(ip, username=None, password=None):
+            self.detected.append(ip)
+            return 'Juniper'
+
+        patcher = mock.patch.object(router_lookup, 'detect_vendor_via_netconf', fake_detect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.index = RouterLookupIndex(ENTRIES, ROUTERS)
+
+    def test_lookups(self):
+        self.assertEqual(self.index.find('192.168.1.1'),
+                         {'router': 'cisco-r1', 'vendor': 'Cisco', 'router_ip': '1.1.1.1', 'interface': 'Gi0/0'})
+        # Arista is matched through the covering connected /24
+        self.assertEqual(self.index.find('10.0.12.2'),
+                         {'router': 'arista-r3', 'vendor': 'Arista', 'router_ip': '3.3.3.3', 'interface': 'Ethernet1'})
+        self.assertIsNone(self.index.find('8.8.8.8'))
+
+    def test_unknown_vendor_is_detected(self):
+        result = self.index.find('10.0.13.2')
+        self.assertEqual(result['router'], 'juniper-r2')
+        self.assertEqual(result['vendor'], 'Juniper')
+        self.assertEqual(self.detected, ['2.2.2.2'])
+
+    def test_router_missing_from_inventory(self):
+        result = self.index.find('172.16.5.5')
+        self.assertEqual(result, {'router': 'R9', 'vendor': 'Juniper', 'router_ip': '9.9.9.9', 'interface': 'eth9'})
+
+    def test_connected_covering(self):
+        self.assertEqual(self.index.connected_covering('10.0.12.77'), [('3.3.3.3', 'Ethernet1')])
+        self.assertEqual(self.index.connected_covering('10.0.13.77'), [])
+        self.assertEqual(self.index.connected_covering('not-an-ip'), [])
+
+    def test_batch_reads_databases_once(self):
+        ips = ['192.168.1.1', '10.0.12.2', '10.0.13.2', '8.8.8.8']
+        with mock.patch.object(router_lookup.rib_db_manage, 'get_entries', return_value=ENTRIES) as get_entries, \
+                mock.patch.object(router_lookup.router_db, 'get_routers', return_value=ROUTERS) as get_routers:
+            results = batch_find_routers(ips)
+        get_entries.assert_called_once_with()
+        get_routers.assert_called_once_with()
+        self.assertEqual(list(results), ips)
+        for ip in ips:
+            with self.subTest(ip=ip):
+                self.assertEqual(results[ip], find_router_for_ip(ip, index=self.index))
+
+if __name__ == '__main__':
+    unittest.main()
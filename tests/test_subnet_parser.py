@@ -0,0 +1,78 @@
+"""
+tests/test_subnet_parser.py
+---------------------------
+Unit tests for services.subnet_parser.SubnetParser.
+"""
+
+import ipaddress
+import unittest
+from services.subnet_parser import SubnetParser, _HostIPs
+
+class TestParseMultipleSubnets(unittest.TestCase):
+    """
+    parse_multiple_subnets must give the same results as parsing each subnet on its own.
+    """
+    SUBNETS = ['10.0.0.0/15', '172.16.0.0/16', '192.168.1.0/24', '10.1.2.3/31', 'not-a-subnet', '192.168.1.7/24']
+
+    def test_matches_serial_parse(self):
+        batch = SubnetParser().parse_multiple_subnets(self.SUBNETS)
+        self.assertEqual(list(batch), self.SUBNETS)
+        for subnet in self.SUBNETS:
+            with self.subTest(subnet=subnet):
+                serial = SubnetParser().parse_subnet(subnet)
+                result = batch[subnet]
+                self.assertEqual(result['subnet'], subnet)
+                self.assertEqual(result['is_valid'], serial['is_valid'])
+                self.assertEqual(result['network_info'], serial['network_info'])
+                self.assertEqual(result['host_ips_int'], serial['host_ips_int'])
+                self.assertEqual(len(result['host_ips']), len(serial['host_ips']))
+
+    def test_host_ips_match_ipaddress(self):
+        batch = SubnetParser().parse_multiple_subnets(['192.168.1.0/24', '10.1.2.3/31', '10.9.0.0/22'])
+        for subnet, result in batch.items():
+            with self.subTest(subnet=subnet):
+                expected = [str(ip) for ip in ipaddress.IPv4Network(subnet, strict=False).hosts()]
+                self.assertEqual(list(result['host_ips']), expected)
+
+class TestHostIPs(unittest.TestCase):
+    """
+    _HostIPs must behave like the list of host IP strings it stands for.
+    """
+    def setUp(self):
+        network = ipaddress.IPv4Network('10.20.0.0/22')
+        self.expected = [str(ip) for ip in network.hosts()]
+        self.hosts = _HostIPs(range(int(network.network_address) + 1, int(network.broadcast_address)))
+
+    def test_len_and_iteration(self):
+        self.assertEqual(len(self.hosts), len(self.expected))
+        self.assertEqual(list(self.hosts), self.expected)
+
+    def test_indexing(self):
+        for index in (0, 1, 254, 255, 256, -1, -255, len(self.expected) - 1):
+            with self.subTest(index=index):
+                self.assertEqual(self.hosts[index], self.expected[index])
+        with self.assertRaises(IndexError):
+            self.hosts[len(self.expected)]
+
+    def test_slicing(self):
+        for piece in (slice(None, 5), slice(250, 260), slice(-3, None), slice(None, None, 97),
+                      slice(10, 2, -3), slice(5, 5)):
+            with self.subTest(piece=piece):
+                self.assertEqual(self.hosts[piece], self.expected[piece])
+
+    def test_materialize_keeps_list(self):
+        ips = self.hosts.materialize()
+        self.assertEqual(ips, self.expected)
+        self.assertIs(self.hosts.materialize(), ips)
+        self.assertEqual(self.hosts[3], self.expected[3])
+        self.assertEqual(self.hosts[2:4], self.expected[2:4])
+
+    def test_parse_subnet_stays_lazy(self):
+        result = SubnetParser().parse_subnet('10.0.0.0/8')
+        self.assertIsInstance(result['host_ips'], _HostIPs)
+        self.assertEqual(len(result['host_ips']), 2 ** 24 - 2)
+        self.assertEqual(result['host_ips'][-1], '10.255.255.254')
+        self.assertIsNone(result['host_ips']._ips)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import atexit
 import sqlite3
 import os
 from tabulate import tabulate
@@ -6,9 +7,22 @@ from tabulate import tabulate
 DIRECTCONN_DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'directconndb'))
 PROTO_DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'protodb'))
 
+# db_path -> connection, opened on first use and shared by every print in this process
+_CONNECTIONS = {}
+
+def _conn(db_path):
+    conn = _CONNECTIONS.get(db_path)
+    if conn is None:
+        conn = _CONNECTIONS[db_path] = sqlite3.connect(db_path)
+    return conn
+
+@atexit.register
+def _close_connections():
+    while _CONNECTIONS:
+        _CONNECTIONS.popitem()[1].close()
+
 def print_direct_connections(db_path=DIRECTCONN_DB_PATH):
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
+    cur = _conn(db_path).cursor()
     try:
         cur.execute("SELECT source_router, source_ip, source_interface, dest_interface, dest_ip, dest_router FROM direct_connections")
         rows = cur.fetchall()
@@ -19,12 +33,9 @@ def print_direct_connections(db_path=DIRECTCONN_DB_PATH):
             print("\nDIRECT CONNECTIONS TABLE does not exist in the database.")
         else:
             raise
-    finally:
-        conn.close()
 
 def print_proto_routes(db_path=PROTO_DB_PATH):
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
+    cur = _conn(db_path).cursor()
     try:
         cur.execute("SELECT source_router, source_interface, protocol, destination, dest_interface, next_hop FROM proto_routes")
         rows = cur.fetchall()
@@ -35,8 +46,6 @@ def print_proto_routes(db_path=PROTO_DB_PATH):
             print("\nPROTO ROUTES TABLE does not exist in the database.")
         else:
             raise
-    finally:
-        conn.close()
 
 if __name__ == "__main__":
     print_direct_connections()
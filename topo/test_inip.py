@@ -1,19 +1,33 @@
 import sqlite3
 import os
+import sys
+from itertools import chain
 from tabulate import tabulate
-from collections import defaultdict
+from topo.topo_inip import INIP_SELECT
 
 # Always use the rib_db.sqlite3 in the project root
 RIB_DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'rib_db.sqlite3'))
+# Above this many rows tables are streamed tab-separated instead of laid out by tabulate
+LARGE_TABLE_ROWS = 1000
+
+def print_rows(cur, headers):
+    """
+    Print the rows of an executed query under headers, without materializing large results.
+    """
+    rows = cur.fetchmany(LARGE_TABLE_ROWS + 1)
+    if len(rows) <= LARGE_TABLE_ROWS:
+        print(tabulate(rows, headers=headers, tablefmt="simple"))
+        return
+    sys.stdout.write('\t'.join(headers) + '\n')
+    sys.stdout.writelines('\t'.join('' if v is None else str(v) for v in row) + '\n' for row in chain(rows, cur))
 
 def print_inip_table(db_path=RIB_DB_PATH):
     conn = sqlite3.connect(db_path)
     cur = conn.cursor()
     try:
         cur.execute("SELECT router_name, interface, ip FROM inip")
-        rows = cur.fetchall()
         print("\nINIP TABLE:")
-        print(tabulate(rows, headers=["Router Name", "Interface", "IP"], tablefmt="grid"))
+        print_rows(cur, ["Router Name", "Interface", "IP"])
     except sqlite3.OperationalError as e:
         if "no such table" in str(e):
             print("\nINIP TABLE does not exist in the database.")
@@ -27,9 +41,8 @@ def print_rib_table(db_path=RIB_DB_PATH):
     cur = conn.cursor()
     try:
         cur.execute("SELECT router, loopback_ip, protocol, destination, interface, next_hop FROM rib")
-        rows = cur.fetchall()
         print("\nRIB TABLE:")
-        print(tabulate(rows, headers=["Router", "Loopback IP", "Protocol", "Destination", "Interface", "Next Hop"], tablefmt="grid"))
+        print_rows(cur, ["Router", "Loopback IP", "Protocol", "Destination", "Interface", "Next Hop"])
     except sqlite3.OperationalError as e:
         if "no such table" in str(e):
             print("\nRIB TABLE does not exist in the database.")
@@ -45,30 +58,10 @@ def print_consolidated_local_ips_table(db_path=RIB_DB_PATH):
     conn = sqlite3.connect(db_path)
     cur = conn.cursor()
     try:
-        cur.execute("SELECT router, loopback_ip, protocol, destination, interface, next_hop FROM rib")
-        rows = cur.fetchall()
-        # Build routers dict keyed by loopback_ip
-        routers = defaultdict(list)
-        for row in rows:
-            router, loopback_ip, protocol, destination, interface, next_hop = row
-            routers[loopback_ip].append(row)
-        # Assign generic names
-        router_names = {lb: f"Router{i}" for i, lb in enumerate(sorted(routers.keys()), 1)}
-        # Build consolidated list
-        consolidated = []
-        for loopback, routes in routers.items():
-            router_name = router_names[loopback]
-            for route in routes:
-                protocol = route[2]
-                destination = route[3]
-                interface = route[4]
-                # Look for Connected, Local, or Direct routes
-                if protocol in ['Connected', 'Local', 'Direct'] and interface and '/' in destination:
-                    ip = destination.split('/')[0]
-                    if ip not in ['0.0.0.0', '224.0.0.5']:
-                        consolidated.append((router_name, interface, ip))
+        # Same rows build_and_store_inip_table stores, without writing inip.db
+        cur.execute(INIP_SELECT)
         print("\nConsolidated Local IPs Table:")
-        print(tabulate(consolidated, headers=["Router Name (Generic)", "Interface", "IP"], tablefmt="grid"))
+        print_rows(cur, ["Router Name (Generic)", "Interface", "IP"])
     except sqlite3.OperationalError as e:
         if "no such table" in str(e):
             print("\nRIB TABLE does not exist in the database.")
@@ -1,97 +1,122 @@
 import sqlite3
 import os
+import sys
 from collections import defaultdict
-
-from tabulate import tabulate  # Optional: for debugging/printing
+from itertools import zip_longest
 
 # Paths
 RIB_DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'rib_db.sqlite3'))
 DIRECTCONN_DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'directconndb'))
 PROTO_DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'protodb'))
+# Schema names the output databases are attached under on a shared RIB connection
+DIRECTCONN_SCHEMA = 'dc'
+PROTO_SCHEMA = 'pr'
 
-def get_router_data_from_rib():
-    conn = sqlite3.connect(RIB_DB_PATH)
+# Route protocols that describe a router's own interface addresses
+LOCAL_PROTOCOLS = frozenset(['Connected', 'Local', 'Direct'])
+# Interface addresses left out of the topology
+SKIPPED_IPS = frozenset(['224.0.0.5', '0.0.0.0'])
+# next_hop values that mean the route has no next-hop router
+NO_NEXT_HOP = frozenset(['', 'N/A', 'Directly connected', 'Direct', 'Local'])
+
+def get_router_data_from_rib(conn=None):
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(RIB_DB_PATH)
     cur = conn.cursor()
-    cur.execute("SELECT router, loopback_ip, protocol, destination, interface, next_hop FROM rib")
-    rows = cur.fetchall()
-    conn.close()
-    # Build routers dict keyed by loopback_ip
-    routers = defaultdict(list)
-    for row in rows:
-        router, loopback_ip, protocol, destination, interface, next_hop = row
-        routers[loopback_ip].append(list(row))
-    # Assign generic names
-    router_names = {lb: f"Router{i}" for i, lb in enumerate(sorted(routers.keys()), 1)}
-    # Build named_routers dict
+    # Assign generic names in loopback order
+    cur.execute("SELECT DISTINCT loopback_ip FROM rib ORDER BY loopback_ip")
+    router_names = {lb: f"Router{i}" for i, (lb,) in enumerate(cur, 1)}
+    # Build named_routers dict (routers in order of first appearance) straight from the cursor
+    cur.execute("SELECT loopback_ip, protocol, destination, interface, next_hop FROM rib")
     named_routers = {}
-    for loopback, routes in routers.items():
-        updated_routes = []
-        for route in routes:
-            updated_route = route.copy()
-            updated_route[0] = router_names[loopback]
-            updated_routes.append(updated_route)
-        named_routers[router_names[loopback]] = {
-            'loopback': loopback,
-            'routes': updated_routes
-        }
+    for loopback, protocol, destination, interface, next_hop in cur:
+        router_name = router_names[loopback]
+        router = named_routers.get(router_name)
+        if router is None:
+            router = named_routers[router_name] = {'loopback': loopback, 'routes': []}
+        router['routes'].append([router_name, loopback, protocol, destination, interface, next_hop])
+    if own_conn:
+        conn.close()
     return named_routers
 
 def extract_interface_info(router_data):
     interface_info = defaultdict(list)
     for router_name, data in router_data.items():
-        for route in data['routes']:
-            if route[2] in ['Connected', 'Local', 'Direct'] and '/' in route[3]:
-                ip_with_prefix = route[3]
-                ip = ip_with_prefix.split('/')[0]
-                interface = route[4]
+        for _, _, protocol, destination, interface, _ in data['routes']:
+            if protocol in LOCAL_PROTOCOLS:
+                ip, slash, _ = destination.partition('/')
                 # Skip network addresses and multicast
-                if not ip.endswith('.0') and ip not in ['224.0.0.5', '0.0.0.0']:
-                    network = '.'.join(ip.split('.')[:3])
+                if slash and not ip.endswith('.0') and ip not in SKIPPED_IPS:
+                    # Interned: networks are a small shared vocabulary used as bucket and lookup keys
+                    network = sys.intern('.'.join(ip.split('.', 3)[:3]))
                     interface_info[router_name].append({
                         'interface': interface,
                         'ip': ip,
                         'network': network,
-                        'full_network': route[3]
+                        'full_network': destination
                     })
     return interface_info
 
+def _is_loopback(interface):
+    return 'lo' in interface.lower()
+
 def find_direct_connections(interface_info):
+    router_order = {router: i for i, router in enumerate(interface_info)}
+    # Bucket non-loopback interfaces by network so each interface is only compared with its own subnet
+    by_network = defaultdict(list)
+    for router, ifaces in interface_info.items():
+        for iface in ifaces:
+            if not _is_loopback(iface['interface']):
+                by_network[iface['network']].append((router_order[router], router, iface))
     direct_links = []
-    router_names = list(interface_info.keys())
-    for i, src_router in enumerate(router_names):
+    for i, src_router in enumerate(interface_info):
         for src_interface in interface_info[src_router]:
             # Skip if source interface is loopback
-            if 'loopback' in src_interface['interface'].lower() or 'lo' in src_interface['interface'].lower():
+            if _is_loopback(src_interface['interface']):
                 continue
-            for j in range(i+1, len(router_names)):
-                dest_router = router_names[j]
-                for dest_interface in interface_info[dest_router]:
-                    if 'loopback' in dest_interface['interface'].lower() or 'lo' in dest_interface['interface'].lower():
-                        continue
-                    if src_interface['network'] == dest_interface['network']:
-                        direct_links.append([
-                            src_router,
-                            src_interface['ip'],
-                            src_interface['interface'],
-                            dest_interface['interface'],
-                            dest_interface['ip'],
-                            dest_router
-                        ])
-                        direct_links.append([
-                            dest_router,
-                            dest_interface['ip'],
-                            dest_interface['interface'],
-                            src_interface['interface'],
-                            src_interface['ip'],
-                            src_router
-                        ])
+            for j, dest_router, dest_interface in by_network[src_interface['network']]:
+                # Each router pair is emitted once, from the earlier router
+                if j <= i:
+                    continue
+                direct_links.append([
+                    src_router,
+                    src_interface['ip'],
+                    src_interface['interface'],
+                    dest_interface['interface'],
+                    dest_interface['ip'],
+                    dest_router
+                ])
+                direct_links.append([
+                    dest_router,
+                    dest_interface['ip'],
+                    dest_interface['interface'],
+                    src_interface['interface'],
+                    src_interface['ip'],
+                    src_router
+                ])
     return direct_links
 
-def save_direct_connections(direct_links, db_path=DIRECTCONN_DB_PATH):
-    conn = sqlite3.connect(db_path)
+# Rewrite table with rows only if its contents differ, so re-running on an unchanged RIB writes no pages
+def _replace_rows(cur, table, columns, rows):
+    cur.execute(f'SELECT {columns} FROM {table} ORDER BY id')
+    # Compare while streaming the stored rows rather than fetching the whole table
+    if all(stored is not None and row is not None and stored == tuple(row)
+           for stored, row in zip_longest(cur, rows)):
+        return
+    cur.execute(f'DELETE FROM {table}')
+    placeholders = ', '.join('?' * len(columns.split(',')))
+    cur.executemany(f'INSERT INTO {table} ({columns}) VALUES ({placeholders})', rows)
+
+# With a shared conn the table is written in the database attached as DIRECTCONN_SCHEMA and the caller commits
+def save_direct_connections(direct_links, db_path=DIRECTCONN_DB_PATH, conn=None):
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(db_path)
+    table = 'direct_connections' if own_conn else f'{DIRECTCONN_SCHEMA}.direct_connections'
     cur = conn.cursor()
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS direct_connections (
+    cur.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table} (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             source_router TEXT,
             source_ip TEXT,
@@ -101,35 +126,53 @@ def save_direct_connections(direct_links, db_path=DIRECTCONN_DB_PATH):
             dest_router TEXT
         )
     ''')
-    cur.execute('DELETE FROM direct_connections')
-    for row in direct_links:
-        cur.execute('INSERT INTO direct_connections (source_router, source_ip, source_interface, dest_interface, dest_ip, dest_router) VALUES (?, ?, ?, ?, ?, ?)', row)
-    conn.commit()
-    conn.close()
+    _replace_rows(cur, table, 'source_router, source_ip, source_interface, dest_interface, dest_ip, dest_router', direct_links)
+    if own_conn:
+        conn.commit()
+        conn.close()
+
+# (router, network) -> first interface on that /24, and ip -> [(router, position, interface), ...]
+def _build_interface_lookups(interface_info):
+    by_network = {}
+    by_ip = defaultdict(list)
+    for router, ifaces in interface_info.items():
+        for pos, iface in enumerate(ifaces):
+            by_network.setdefault((router, iface['network']), iface['interface'])
+            by_ip[iface['ip']].append((router, pos, iface['interface']))
+    return by_network, by_ip
+
+# Per router, the first interface whose IP is a string prefix of dest; later routers first
+def _dest_candidates(dest, by_ip, router_order):
+    first = {}
+    for end in range(1, len(dest) + 1):
+        for router, pos, interface in by_ip.get(dest[:end], ()):
+            if router not in first or pos < first[router][0]:
+                first[router] = (pos, interface)
+    return sorted(((router_order[router], router, interface) for router, (pos, interface) in first.items()),
+                  reverse=True)
 
 def extract_routes_with_next_hop(router_data, interface_info):
+    by_network, by_ip = _build_interface_lookups(interface_info)
+    router_order = {router: i for i, router in enumerate(interface_info)}
+    dest_cache = {}
     routes_with_next_hop = []
     for router_name, data in router_data.items():
-        for route in data['routes']:
-            if len(route) >= 6 and route[5] not in ['', 'N/A', 'Directly connected', 'Direct', 'Local']:
-                dest = route[3]
-                next_hop = route[5]
-                protocol = route[2]
-                # Find source interface for this next hop
+        for _, _, protocol, dest, _, next_hop in data['routes']:
+            if next_hop not in NO_NEXT_HOP:
+                # Source interface: the first one on this router in the next hop's /24
                 source_interface = "Unknown"
-                for iface in interface_info[router_name]:
-                    ip = iface['ip']
-                    if next_hop.startswith(ip.split('.')[0] + '.' + ip.split('.')[1] + '.' + ip.split('.')[2] + '.'):
-                        source_interface = iface['interface']
-                        break
-                # Find destination interface (if available in other routers)
+                octets = next_hop.split('.', 3)
+                if len(octets) == 4:
+                    source_interface = by_network.get((router_name, '.'.join(octets[:3])), "Unknown")
+                # Destination interface: the match on the last other router whose interface IP prefixes dest
                 dest_interface = "Unknown"
-                for other_router, other_ifaces in interface_info.items():
+                candidates = dest_cache.get(dest)
+                if candidates is None:
+                    candidates = dest_cache[dest] = _dest_candidates(dest, by_ip, router_order)
+                for _, other_router, interface in candidates:
                     if other_router != router_name:
-                        for iface in other_ifaces:
-                            if dest.startswith(iface['ip']):
-                                dest_interface = iface['interface']
-                                break
+                        dest_interface = interface
+                        break
                 routes_with_next_hop.append([
                     router_name,
                     source_interface,
@@ -140,11 +183,15 @@ def extract_routes_with_next_hop(router_data, interface_info):
                 ])
     return routes_with_next_hop
 
-def save_routes_with_next_hop(routes_with_next_hop, db_path=PROTO_DB_PATH):
-    conn = sqlite3.connect(db_path)
+# With a shared conn the table is written in the database attached as PROTO_SCHEMA and the caller commits
+def save_routes_with_next_hop(routes_with_next_hop, db_path=PROTO_DB_PATH, conn=None):
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(db_path)
+    table = 'proto_routes' if own_conn else f'{PROTO_SCHEMA}.proto_routes'
     cur = conn.cursor()
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS proto_routes (
+    cur.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table} (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             source_router TEXT,
             source_interface TEXT,
@@ -154,30 +201,40 @@ def save_routes_with_next_hop(routes_with_next_hop, db_path=PROTO_DB_PATH):
             next_hop TEXT
         )
     ''')
-    cur.execute('DELETE FROM proto_routes')
-    for row in routes_with_next_hop:
-        cur.execute('INSERT INTO proto_routes (source_router, source_interface, protocol, destination, dest_interface, next_hop) VALUES (?, ?, ?, ?, ?, ?)', row)
-    conn.commit()
-    conn.close()
+    _replace_rows(cur, table, 'source_router, source_interface, protocol, destination, dest_interface, next_hop', routes_with_next_hop)
+    if own_conn:
+        conn.commit()
+        conn.close()
 
 # Main function to run all steps
-def process_and_save_connections():
-    router_data = get_router_data_from_rib()
-    interface_info = extract_interface_info(router_data)
-    direct_links = find_direct_connections(interface_info)
-    save_direct_connections(direct_links)
-    routes_with_next_hop = extract_routes_with_next_hop(router_data, interface_info)
-    save_routes_with_next_hop(routes_with_next_hop)
-    # Optional: print for debug
-    print("="*80)
-    print("DIRECTLY CONNECTED ROUTER INTERFACES (EXCLUDING LOOPBACKS)")
-    print("="*80)
-    print(tabulate(direct_links, headers=["Source Router", "Source IP", "Source Interface", "Dest Interface", "Dest IP", "Dest Router"], tablefmt="grid"))
-    print("\n" + "="*80)
-    print("PART 2: ROUTING TABLE WITH NEXT HOPS")
-    print("="*80)
-    print(tabulate(routes_with_next_hop, headers=["Source Router", "Source Interface", "Protocol", "Destination", "Destination Interface", "Next Hop"], tablefmt="grid"))
-    print("\nAnalysis complete.")
+def process_and_save_connections(verbose=False):
+    # One connection for the whole run: the output databases are attached to the RIB connection
+    conn = sqlite3.connect(RIB_DB_PATH)
+    try:
+        conn.execute(f"ATTACH DATABASE ? AS {DIRECTCONN_SCHEMA}", (DIRECTCONN_DB_PATH,))
+        conn.execute(f"ATTACH DATABASE ? AS {PROTO_SCHEMA}", (PROTO_DB_PATH,))
+        router_data = get_router_data_from_rib(conn)
+        interface_info = extract_interface_info(router_data)
+        direct_links = find_direct_connections(interface_info)
+        routes_with_next_hop = extract_routes_with_next_hop(router_data, interface_info)
+        # Both tables are replaced in a single transaction
+        with conn:
+            save_direct_connections(direct_links, conn=conn)
+            save_routes_with_next_hop(routes_with_next_hop, conn=conn)
+    finally:
+        conn.close()
+    # Optional: print for debug (formatting large tables is slow, so only when asked)
+    if verbose:
+        from tabulate import tabulate
+        print("="*80)
+        print("DIRECTLY CONNECTED ROUTER INTERFACES (EXCLUDING LOOPBACKS)")
+        print("="*80)
+        print(tabulate(direct_links, headers=["Source Router", "Source IP", "Source Interface", "Dest Interface", "Dest IP", "Dest Router"], tablefmt="grid"))
+        print("\n" + "="*80)
+        print("PART 2: ROUTING TABLE WITH NEXT HOPS")
+        print("="*80)
+        print(tabulate(routes_with_next_hop, headers=["Source Router", "Source Interface", "Protocol", "Destination", "Destination Interface", "Next Hop"], tablefmt="grid"))
+        print("\nAnalysis complete.")
 
 if __name__ == "__main__":
-    process_and_save_connections() 
\ No newline at end of file
+    process_and_save_connections(verbose=True) 
\ No newline at end of file
@@ -1,52 +1,44 @@
 import sqlite3
 import os
-from collections import defaultdict
 
 # Always use the rib_db.sqlite3 in the project root
 RIB_DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'rib_db.sqlite3'))
 # Always use inip.db in the project root for storing INIP
 INIP_DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'inip.db'))
 
+# Connected/Local/Direct interface addresses with a generic RouterN name per loopback (numbered in loopback
+# order), listed in RIB order grouped by router; computed entirely inside SQLite on a RIB connection
+INIP_SELECT = '''
+    SELECT 'Router' || r.rn, c.interface, c.ip
+    FROM (
+        SELECT id, loopback_ip, interface, substr(destination, 1, instr(destination, '/') - 1) AS ip
+        FROM rib
+        WHERE protocol IN ('Connected', 'Local', 'Direct') AND interface <> '' AND instr(destination, '/') > 0
+    ) AS c
+    JOIN (
+        SELECT loopback_ip, DENSE_RANK() OVER (ORDER BY loopback_ip) AS rn, MIN(id) AS first_id
+        FROM rib
+        GROUP BY loopback_ip
+    ) AS r USING (loopback_ip)
+    WHERE c.ip NOT IN ('0.0.0.0', '224.0.0.5')
+    ORDER BY r.first_id, c.id
+'''
+
 def build_and_store_inip_table():
+    # Store in inip.db, attached to the RIB connection
     conn = sqlite3.connect(RIB_DB_PATH)
     cur = conn.cursor()
-    cur.execute("SELECT router, loopback_ip, protocol, destination, interface, next_hop FROM rib")
-    rows = cur.fetchall()
-    conn.close()
-    # Build routers dict keyed by loopback_ip
-    routers = defaultdict(list)
-    for row in rows:
-        router, loopback_ip, protocol, destination, interface, next_hop = row
-        routers[loopback_ip].append(row)
-    # Assign generic names
-    router_names = {lb: f"Router{i}" for i, lb in enumerate(sorted(routers.keys()), 1)}
-    # Build consolidated list
-    consolidated = []
-    for loopback, routes in routers.items():
-        router_name = router_names[loopback]
-        for route in routes:
-            protocol = route[2]
-            destination = route[3]
-            interface = route[4]
-            # Look for Connected, Local, or Direct routes
-            if protocol in ['Connected', 'Local', 'Direct'] and interface and '/' in destination:
-                ip = destination.split('/')[0]
-                if ip not in ['0.0.0.0', '224.0.0.5']:
-                    consolidated.append((router_name, interface, ip))
-    # Store in inip.db
-    conn = sqlite3.connect(INIP_DB_PATH)
-    cur = conn.cursor()
+    cur.execute("ATTACH DATABASE ? AS inip_db", (INIP_DB_PATH,))
     cur.execute('''
-        CREATE TABLE IF NOT EXISTS inip (
+        CREATE TABLE IF NOT EXISTS inip_db.inip (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             router_name TEXT,
             interface TEXT,
             ip TEXT
         )
     ''')
-    cur.execute('DELETE FROM inip')
-    for row in consolidated:
-        cur.execute('INSERT INTO inip (router_name, interface, ip) VALUES (?, ?, ?)', row)
+    cur.execute('DELETE FROM inip_db.inip')
+    cur.execute('INSERT INTO inip_db.inip (router_name, interface, ip)' + INIP_SELECT)
     conn.commit()
     conn.close()
 